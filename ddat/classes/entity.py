@@ -0,0 +1,126 @@
+""" DDaT entity base class with schema-driven serialization. """
+
+import json
+
+
+class Field:
+
+    def __init__(self, name, serialize=None, deserialize=None):
+        """ Serialized entity attribute.
+
+        Args:
+            name (string): Attribute name, also used as the serialized key.
+            serialize (callable): Function converting the attribute value into JSON-compatible
+                values (optional, defaults to the value itself).
+            deserialize (callable): Function converting a JSON-compatible value back into the
+                attribute value (optional, defaults to the value itself).
+        """
+
+        self.name = name
+        self.serialize = serialize
+        self.deserialize = deserialize
+
+
+class Entity:
+
+    # Serialized attributes. Subclasses declare their attributes as a tuple of Field
+    # objects, and their __slots__ as the names of those attributes.
+    SCHEMA = ()
+    __slots__ = ()
+
+    def __getstate__(self):
+        """ Pickle the entity as a dictionary of its attributes. """
+
+        return {field.name: getattr(self, field.name) for field in self.SCHEMA}
+
+    def __setstate__(self, state):
+        """ Unpickle the entity from a dictionary of its attributes. Entities pickled before the
+        entity used __slots__ were pickled as their __dict__, which is also a dictionary of their
+        attributes, so they are unpickled in the same way. Missing attributes are set to None.
+        """
+
+        if isinstance(state, tuple):
+            state = {**(state[0] or {}), **(state[1] or {})}
+        for field in self.SCHEMA:
+            setattr(self, field.name, state.get(field.name))
+
+    def to_dict(self):
+        """ Serialize the entity as a dictionary of JSON-compatible values. """
+
+        return {field.name: field.serialize(getattr(self, field.name)) if field.serialize is not None
+                else getattr(self, field.name) for field in self.SCHEMA}
+
+    @classmethod
+    def from_dict(cls, entity_dict):
+        """ Deserialize an entity from a dictionary of JSON-compatible values.
+
+        Args:
+            entity_dict (dict): Dictionary as returned by to_dict.
+
+        Returns:
+            Entity object.
+
+        """
+
+        entity = cls.__new__(cls)
+        for field in cls.SCHEMA:
+            value = entity_dict.get(field.name)
+            setattr(entity, field.name, field.deserialize(value) if field.deserialize is not None else value)
+        return entity
+
+    @classmethod
+    def from_columns(cls, columns, count):
+        """ Deserialize a list of entities from columns of JSON-compatible values, one column per
+        attribute. Columns of attributes not in the schema are ignored, and attributes without a
+        column are deserialized from None.
+
+        Args:
+            columns (dict): Lists of JSON-compatible values keyed by attribute name.
+            count (int): Number of entities.
+
+        Returns:
+            List of Entity objects.
+
+        """
+
+        entities = [cls.__new__(cls) for _ in range(count)]
+        for field in cls.SCHEMA:
+            column = columns.get(field.name) or [None] * count
+            if field.deserialize is not None:
+                column = map(field.deserialize, column)
+            for entity, value in zip(entities, column):
+                setattr(entity, field.name, value)
+        return entities
+
+    def __str__(self):
+        """ Override the __str__() method to return the class name followed
+        by the string representation of the object's attributes.
+        """
+
+        return type(self).__name__ + str(self.__getstate__())
+
+    def to_json(self):
+        """ JSON serializer. """
+
+        return json.dumps(self.to_dict(), sort_keys=True, indent=4)
+
+
+def entity_list(entity_class):
+    """ Create the serializer and deserializer of an optional list of entities.
+
+    Args:
+        entity_class (type): Entity subclass.
+
+    Returns:
+        Tuple of serializer and deserializer functions.
+
+    """
+
+    def serialize(entities):
+        return [entity.to_dict() for entity in entities] if entities is not None else None
+
+    def deserialize(entity_dicts):
+        return [entity_class.from_dict(entity_dict) for entity_dict in entity_dicts] \
+            if entity_dicts is not None else None
+
+    return serialize, deserialize
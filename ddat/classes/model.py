@@ -0,0 +1,133 @@
+""" DDaT pre-defined ontology data model classes. """
+
+import dataclasses
+
+
+@dataclasses.dataclass(frozen=True)
+class ModelObject:
+    """ Immutable object of the pre-defined ontology data model, loaded from one JSON object
+    of a model file. Fields without a default are required, and fields defaulting to None
+    are optional and omitted from the serialized object when not set.
+    """
+
+    def to_dict(self):
+        """ Serialize the model object as a dictionary of JSON-compatible values. """
+
+        model_dict = {}
+        for field in dataclasses.fields(self):
+            value = getattr(self, field.name)
+            if isinstance(value, ModelObject):
+                value = value.to_dict()
+            elif isinstance(value, tuple):
+                value = list(value)
+            if value is not None:
+                model_dict[field.name] = value
+        return model_dict
+
+    @classmethod
+    def from_dict(cls, model_dict, source=None):
+        """ Deserialize and validate a model object from a dictionary of JSON-compatible values.
+
+        Args:
+            model_dict (dict): Dictionary as loaded from the model file.
+            source (string): Name of the model file, used in validation errors (optional).
+
+        Returns:
+            Model object.
+
+        Raises:
+            ValueError: If the dictionary has missing, unknown or mistyped keys.
+
+        """
+
+        description = f'{cls.__name__} in {source}' if source is not None else cls.__name__
+        if not isinstance(model_dict, dict):
+            raise ValueError(f'Invalid {description}: expected an object, got {type(model_dict).__name__}')
+        fields = {field.name: field for field in dataclasses.fields(cls)}
+        missing_keys = [name for name, field in fields.items()
+                        if field.default is dataclasses.MISSING and name not in model_dict]
+        unknown_keys = [key for key in model_dict if key not in fields]
+        if missing_keys or unknown_keys:
+            raise ValueError(f'Invalid {description} {model_dict.get("id", "")}: '
+                             f'missing keys {missing_keys}, unknown keys {unknown_keys}')
+
+        values = {}
+        for name, value in model_dict.items():
+            field_type = fields[name].type
+            if isinstance(field_type, type) and issubclass(field_type, ModelObject):
+                value = field_type.from_dict(value, source)
+            elif field_type is tuple and isinstance(value, list):
+                value = tuple(value)
+            if value is not None and not isinstance(value, field_type):
+                raise ValueError(f'Invalid {description}: key {name} expected {field_type.__name__}, '
+                                 f'got {type(value).__name__}')
+            values[name] = value
+        return cls(**values)
+
+
+@dataclasses.dataclass(frozen=True)
+class OwlMetadata(ModelObject):
+    version: str
+
+
+@dataclasses.dataclass(frozen=True)
+class OntologyMetadata(ModelObject):
+    name: str
+    iri: str
+    description: str
+    owl: OwlMetadata
+    contributors: tuple
+
+
+@dataclasses.dataclass(frozen=True)
+class AnnotationProperty(ModelObject):
+    id: str
+    name: str
+    description: str
+
+
+@dataclasses.dataclass(frozen=True)
+class ObjectProperty(ModelObject):
+    id: str
+    name: str
+
+
+@dataclasses.dataclass(frozen=True)
+class ClassThing(ModelObject):
+    id: str
+    parent_class_iri: str
+    name: str
+    description: str
+    url: str
+
+
+@dataclasses.dataclass(frozen=True)
+class ClassDiscipline(ModelObject):
+    id: str
+    thing_id: str
+    object_property_id: str
+    name: str
+    description: str
+
+
+@dataclasses.dataclass(frozen=True)
+class ClassBranch(ModelObject):
+    id: str
+    discipline_id: str
+    object_property_id: str
+    name: str
+    url: str
+    description: str = None
+    responsibilities: str = None
+
+
+@dataclasses.dataclass(frozen=True)
+class ModelRepository:
+    """ Immutable pre-defined ontology data model, holding the objects of every model file. """
+
+    ontology_metadata: OntologyMetadata
+    annotation_properties: tuple
+    object_properties: tuple
+    class_things: tuple
+    class_disciplines: tuple
+    class_branches: tuple
@@ -1,9 +1,28 @@
 """ DDaT Ontology class. """
 
-import json
-
-
-class Ontology:
+from ddat.classes.entity import Entity, Field, entity_list
+from ddat.classes.model import AnnotationProperty, ClassBranch, ClassDiscipline, ClassThing, ObjectProperty
+from ddat.classes.role import Role
+from ddat.classes.skill import Skill
+
+
+class Ontology(Entity):
+
+    SCHEMA = (
+        Field('name'),
+        Field('iri'),
+        Field('description'),
+        Field('owl_version'),
+        Field('contributors'),
+        Field('annotation_properties', *entity_list(AnnotationProperty)),
+        Field('object_properties', *entity_list(ObjectProperty)),
+        Field('class_things', *entity_list(ClassThing)),
+        Field('class_disciplines', *entity_list(ClassDiscipline)),
+        Field('class_branches', *entity_list(ClassBranch)),
+        Field('class_skills', *entity_list(Skill)),
+        Field('class_roles', *entity_list(Role))
+    )
+    __slots__ = tuple(field.name for field in SCHEMA)
 
     def __init__(self, name, iri, description, owl_version, contributors):
         """
@@ -48,15 +67,3 @@ class Ontology:
 
     def set_class_roles(self, class_roles):
         self.class_roles = class_roles
-
-    def __str__(self):
-        """ Override the __str__() method to return the class name followed
-        by the string representation of the object's namespace dictionary.
-        """
-
-        return type(self).__name__ + str(vars(self))
-
-    def to_json(self):
-        """ JSON serializer. """
-
-        return json.dumps(self, default=lambda o: o.__dict__, sort_keys=True, indent=4)
@@ -0,0 +1,186 @@
+""" DDaT OntologyIndex class. """
+
+from ddat.classes.entity import Entity, Field
+
+
+def serialize_ordered_sets(ordered_sets):
+    """ Serialize ordered sets, keyed by any key, as lists of their values in insertion order. """
+
+    return {key: list(values) for key, values in ordered_sets.items()}
+
+
+def deserialize_ordered_sets(value_lists):
+    """ Deserialize lists of values, keyed by any key, as ordered sets of their values. """
+
+    return {key: dict.fromkeys(values) for key, values in (value_lists or {}).items()}
+
+
+def serialize_skill_roles(skill_roles):
+    """ Serialize the ordered sets of roles requiring each skill, keyed by skill level, as lists. """
+
+    return {skill_iri: serialize_ordered_sets(skill_level_roles)
+            for skill_iri, skill_level_roles in skill_roles.items()}
+
+
+def deserialize_skill_roles(skill_roles):
+    """ Deserialize the lists of roles requiring each skill, keyed by skill level, as ordered sets. """
+
+    return {skill_iri: deserialize_ordered_sets(skill_level_roles)
+            for skill_iri, skill_level_roles in (skill_roles or {}).items()}
+
+
+class OntologyIndex(Entity):
+
+    SCHEMA = (
+        Field('entities'),
+        Field('names', serialize_ordered_sets, deserialize_ordered_sets),
+        Field('skill_roles', serialize_skill_roles, deserialize_skill_roles),
+        Field('role_skills'),
+        Field('branch_roles', serialize_ordered_sets, deserialize_ordered_sets),
+        Field('discipline_branches', serialize_ordered_sets, deserialize_ordered_sets)
+    )
+    __slots__ = tuple(field.name for field in SCHEMA)
+
+    def __init__(self):
+        """ Precomputed indexes over the classes of a modelled ontology, keyed by class IRI, answering
+        lookups without scanning the ontology class lists. The classes related to a class are held in
+        ordered sets, as dictionaries keyed by class IRI, so that indexing a class takes constant time,
+        and are serialized as lists so that the index can be persisted in an artifact alongside the ontology.
+        """
+
+        self.entities = {}
+        self.names = {}
+        self.skill_roles = {}
+        self.role_skills = {}
+        self.branch_roles = {}
+        self.discipline_branches = {}
+
+    def add_entity(self, iri, entity_type, name):
+        """ Index a class by IRI and by name. Classes are identified by IRI, so a class is only indexed once.
+
+        Args:
+            iri (string): Class IRI.
+            entity_type (string): Class entity type.
+            name (string): Class name.
+
+        """
+
+        if iri not in self.entities:
+            self.entities[iri] = [entity_type, name]
+            self.names.setdefault(name.casefold(), {})[iri] = None
+
+    def add_discipline_branch(self, discipline_iri, branch_iri):
+        """ Index a branch of a discipline. """
+
+        self.discipline_branches.setdefault(discipline_iri, {})[branch_iri] = None
+
+    def add_branch_role(self, branch_iri, role_iri):
+        """ Index a role of a branch. """
+
+        self.branch_roles.setdefault(branch_iri, {})[role_iri] = None
+
+    def add_role_skill(self, role_iri, skill_iri, skill_level):
+        """ Index the level of a skill required by a role, in both directions. """
+
+        self.role_skills.setdefault(role_iri, {})[skill_iri] = skill_level
+        self.skill_roles.setdefault(skill_iri, {}).setdefault(skill_level, {})[role_iri] = None
+
+    def get_entity_type(self, iri):
+        """ Get the entity type of a class, or None if there is no class with the given IRI. """
+
+        entity = self.entities.get(iri)
+        return entity[0] if entity is not None else None
+
+    def get_name(self, iri):
+        """ Get the name of a class, or None if there is no class with the given IRI. """
+
+        entity = self.entities.get(iri)
+        return entity[1] if entity is not None else None
+
+    def find(self, name, entity_type=None):
+        """ Find classes by name, ignoring case.
+
+        Args:
+            name (string): Class name.
+            entity_type (string): Entity type of the classes to find (optional, defaults to all entity types).
+
+        Returns:
+            List of the IRIs of the matching classes.
+
+        """
+
+        return [iri for iri in self.names.get(name.casefold(), {})
+                if entity_type is None or self.entities[iri][0] == entity_type]
+
+    def get_roles_with_skill(self, skill_iri, skill_level=None):
+        """ Get the roles requiring a skill.
+
+        Args:
+            skill_iri (string): Skill class IRI.
+            skill_level (string): Skill level, for example 'EXPERT' (optional, defaults to all skill levels).
+
+        Returns:
+            List of role class IRIs.
+
+        """
+
+        skill_level_roles = self.skill_roles.get(skill_iri, {})
+        if skill_level is not None:
+            return list(skill_level_roles.get(skill_level, {}))
+        return [role_iri for role_iris in skill_level_roles.values() for role_iri in role_iris]
+
+    def get_role_skills(self, role_iri):
+        """ Get the skills required by a role.
+
+        Args:
+            role_iri (string): Role class IRI.
+
+        Returns:
+            Dictionary of skill levels keyed by skill class IRI.
+
+        """
+
+        return dict(self.role_skills.get(role_iri, {}))
+
+    def get_branch_roles(self, branch_iri):
+        """ Get the roles of a branch.
+
+        Args:
+            branch_iri (string): Branch class IRI.
+
+        Returns:
+            List of role class IRIs.
+
+        """
+
+        return list(self.branch_roles.get(branch_iri, {}))
+
+    def get_branch_skills(self, branch_iri):
+        """ Get the skills required by the roles of a branch.
+
+        Args:
+            branch_iri (string): Branch class IRI.
+
+        Returns:
+            Dictionary of the lists of skill levels required by the roles of the branch, keyed by skill class IRI.
+
+        """
+
+        branch_skills = {}
+        for role_iri in self.branch_roles.get(branch_iri, {}):
+            for skill_iri, skill_level in self.role_skills.get(role_iri, {}).items():
+                branch_skills.setdefault(skill_iri, {})[skill_level] = None
+        return serialize_ordered_sets(branch_skills)
+
+    def get_discipline_branches(self, discipline_iri):
+        """ Get the branches of a discipline.
+
+        Args:
+            discipline_iri (string): Discipline class IRI.
+
+        Returns:
+            List of branch class IRIs.
+
+        """
+
+        return list(self.discipline_branches.get(discipline_iri, {}))
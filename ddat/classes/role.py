@@ -1,10 +1,23 @@
 """ DDaT Role class. """
 
 import ddat.utils.string_utils as string_utils
-import json
 
+from ddat.classes.entity import Entity, Field
 
-class Role:
+
+class Role(Entity):
+
+    SCHEMA = (
+        Field('name'),
+        Field('branch_id'),
+        Field('description'),
+        Field('url'),
+        Field('responsibilities'),
+        Field('civil_service_job_grades'),
+        Field('iri_id'),
+        Field('skills')
+    )
+    __slots__ = tuple(field.name for field in SCHEMA)
 
     def __init__(self, name, branch_id, description, url, responsibilities, civil_service_job_grades):
         """
@@ -28,15 +41,3 @@ class Role:
 
     def set_skills(self, skills):
         self.skills = skills
-
-    def __str__(self):
-        """ Override the __str__() method to return the class name followed
-        by the string representation of the object's namespace dictionary.
-        """
-
-        return type(self).__name__ + str(vars(self))
-
-    def to_json(self):
-        """ JSON serializer. """
-
-        return json.dumps(self, default=lambda o: o.__dict__, sort_keys=True, indent=4)
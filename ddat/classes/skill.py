@@ -1,11 +1,21 @@
 """ DDaT Skill class. """
 
 import ddat.utils.string_utils as string_utils
-import json
 
+from ddat.classes.entity import Entity, Field
+
+
+class Skill(Entity):
+
+    SCHEMA = (
+        Field('anchor_id'),
+        Field('name'),
+        Field('description'),
+        Field('skill_levels'),
+        Field('iri_id')
+    )
+    __slots__ = tuple(field.name for field in SCHEMA)
 
-class Skill:
-    
     def __init__(self, anchor_id, name, description, skill_levels):
         """
         Args:
@@ -20,15 +30,3 @@ class Skill:
         self.description = description
         self.skill_levels = skill_levels
         self.iri_id = string_utils.camel_case(name)
-
-    def __str__(self):
-        """ Override the __str__() method to return the class name followed
-        by the string representation of the object's namespace dictionary.
-        """
-        
-        return type(self).__name__ + str(vars(self))
-
-    def to_json(self):
-        """ JSON serializer. """
-
-        return json.dumps(self, default=lambda o: o.__dict__, sort_keys=True, indent=4)
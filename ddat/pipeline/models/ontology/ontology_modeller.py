@@ -1,38 +1,102 @@
 """ Ontology modeller pipeline module. """
 
+import ddat.utils.artifact_utils as artifact_utils
+import ddat.utils.fragment_utils as fragment_utils
+import ddat.utils.graph_utils as graph_utils
+import ddat.utils.model_utils as model_utils
+import ddat.utils.rdf_utils as rdf_utils
+import ddat.utils.skill_matrix_utils as skill_matrix_utils
 import ddat.utils.string_utils as string_utils
 import ddat.utils.visualisation_utils as visualisation_utils
-import json
-import pickle
+import itertools
+import multiprocessing
 
+from concurrent.futures import ProcessPoolExecutor
 from ddat.classes.ontology import Ontology
-from types import SimpleNamespace
+from ddat.classes.ontology_index import OntologyIndex
+from ddat.classes.role import Role
+from ddat.classes.skill import Skill
+from ddat.config.logging_config import logger
 
 # Module name.
 MODULE_NAME = 'Ontology Modeller'
 
-# Input model file names.
-INPUT_MODEL_ONTOLOGY_METADATA_FILE_NAME = 'ontology_metadata.json'
-INPUT_MODEL_ANNOTATION_PROPERTIES_FILE_NAME = 'annotation_properties.json'
-INPUT_MODEL_OBJECT_PROPERTIES_FILE_NAME = 'object_properties.json'
-INPUT_MODEL_CLASS_THINGS_FILE_NAME = 'class_things.json'
-INPUT_MODEL_CLASS_DISCIPLINES_FILE_NAME = 'class_disciplines.json'
-INPUT_MODEL_CLASS_BRANCHES_FILE_NAME = 'class_branches.json'
-
-# Input parsed objects.
-INPUT_SKILLS_FILE_PATH = 'parsed/skills.pkl'
-INPUT_ROLES_FILE_PATH = 'parsed/roles.pkl'
+# Input parsed object artifacts.
+INPUT_SKILLS_ARTIFACT_FILE_PATH = 'parsed/skills.artifact'
+INPUT_ROLES_ARTIFACT_FILE_PATH = 'parsed/roles.artifact'
 
 # Output file relative path and name.
-OUTPUT_FILE_PATH = 'models/ontology/ddat.pkl'
+OUTPUT_FILE_PATH = 'models/ontology/ddat.artifact'
+OUTPUT_INDEX_FILE_PATH = 'models/ontology/ddat-index.artifact'
+OUTPUT_SKILL_MATRIX_FILE_PATH = 'models/ontology/ddat-skill-matrix.npz'
 OUTPUT_OWL_FILE_PATH = 'models/ontology/ddat.owl'
-OUTPUT_OWL_FILTERED_FILE_PATH = 'models/ontology/ddat-visualisation.owl'
+OUTPUT_OWL_VISUALISATION_FILE_PATH = 'models/ontology/{variant}.owl'
+OUTPUT_OWL_FRAGMENT_CACHE_FILE_PATH = 'models/ontology/ddat-fragments.json'
+OUTPUT_GRAPH_FILE_PATH = 'models/ontology/ddat-graph.json'
+
+# Output RDF serialization file relative paths keyed by serialization format.
+OUTPUT_RDF_FILE_PATHS = {
+    rdf_utils.FORMAT_NTRIPLES: 'models/ontology/ddat.nt',
+    rdf_utils.FORMAT_TURTLE: 'models/ontology/ddat.ttl'
+}
+
+# Output OWL RDF/XML file write buffer size in bytes.
+OUTPUT_OWL_BUFFER_SIZE = 1024 * 1024
+
+# Number of classes per chunk rendered by each worker process when rendering in parallel.
+OUTPUT_OWL_RENDER_CHUNK_SIZE = 100
+
+# Worker process start method when rendering in parallel. Worker processes are forked so that
+# the main program, which has no __main__ guard, is not re-run by each worker process.
+OUTPUT_OWL_RENDER_START_METHOD = 'fork'
+
+# OWL RDF/XML class block template version. Increment whenever a class block template changes
+# so that the class blocks cached by previous runs are re-rendered.
+OWL_TEMPLATE_VERSION = '1'
 
 # OWL RDF/XML substrings.
 RDF_DATATYPE_STRING = 'rdf:datatype="http://www.w3.org/2001/XMLSchema#string"'
 OWL_TOP_OBJECT_PROPERTY_IRI = 'rdf:resource="http://www.w3.org/2002/07/owl#topObjectProperty"'
 OWL_SKILL_CLASS_ID = 'skill'
 
+# RDF terms used by the N-Triples and Turtle serializations.
+RDF_TYPE = rdf_utils.Iri(f'{rdf_utils.RDF_NAMESPACE}type')
+RDFS_LABEL = rdf_utils.Iri(f'{rdf_utils.RDFS_NAMESPACE}label')
+RDFS_COMMENT = rdf_utils.Iri(f'{rdf_utils.RDFS_NAMESPACE}comment')
+RDFS_SUB_CLASS_OF = rdf_utils.Iri(f'{rdf_utils.RDFS_NAMESPACE}subClassOf')
+RDFS_SUB_PROPERTY_OF = rdf_utils.Iri(f'{rdf_utils.RDFS_NAMESPACE}subPropertyOf')
+OWL_ONTOLOGY = rdf_utils.Iri(f'{rdf_utils.OWL_NAMESPACE}Ontology')
+OWL_CLASS = rdf_utils.Iri(f'{rdf_utils.OWL_NAMESPACE}Class')
+OWL_RESTRICTION = rdf_utils.Iri(f'{rdf_utils.OWL_NAMESPACE}Restriction')
+OWL_ANNOTATION_PROPERTY = rdf_utils.Iri(f'{rdf_utils.OWL_NAMESPACE}AnnotationProperty')
+OWL_OBJECT_PROPERTY = rdf_utils.Iri(f'{rdf_utils.OWL_NAMESPACE}ObjectProperty')
+OWL_TOP_OBJECT_PROPERTY = rdf_utils.Iri(f'{rdf_utils.OWL_NAMESPACE}topObjectProperty')
+OWL_ON_PROPERTY = rdf_utils.Iri(f'{rdf_utils.OWL_NAMESPACE}onProperty')
+OWL_SOME_VALUES_FROM = rdf_utils.Iri(f'{rdf_utils.OWL_NAMESPACE}someValuesFrom')
+OWL_VERSION_INFO = rdf_utils.Iri(f'{rdf_utils.OWL_NAMESPACE}versionInfo')
+XSD_STRING = rdf_utils.Iri(f'{rdf_utils.XSD_NAMESPACE}string')
+SKOS_DEFINITION = rdf_utils.Iri(f'{rdf_utils.SKOS_NAMESPACE}definition')
+DC_TITLE = rdf_utils.Iri(f'{rdf_utils.DC_NAMESPACE}title')
+DC_DESCRIPTION = rdf_utils.Iri(f'{rdf_utils.DC_NAMESPACE}description')
+DC_TERMS_CONTRIBUTOR = rdf_utils.Iri(f'{rdf_utils.DC_TERMS_NAMESPACE}contributor')
+LITERAL_LANG = 'en'
+
+# Default visualisation variant, removing the Skill parent class and relationships to it.
+VISUALISATION_DEFAULT_VARIANTS = {
+    'ddat-visualisation': [
+        {'type': visualisation_utils.FILTER_TYPE_DROP_CLASSES, 'classes': [OWL_SKILL_CLASS_ID]}
+    ]
+}
+
+# Graph node layers by entity type, from the thing classes down to the skill classes.
+GRAPH_ENTITY_TYPE_LAYERS = {
+    'Thing': 0,
+    'Discipline': 1,
+    'Branch': 2,
+    'Role': 3,
+    'Skill': 4
+}
+
 # Object property restrictions.
 OBJECT_PROPERTY_SPECIALIST_IN_ID = 'specialistIn'
 
@@ -52,7 +116,9 @@ SKILL_LEVEL_OBJECT_PROPERTY_ID = {
 }
 
 
-def run(ontology_model_dir_path, base_working_dir, ddat_base_url, ddat_skills_resource, visualisation_apply_filters):
+def run(ontology_model_dir_path, base_working_dir, ddat_base_url, ddat_skills_resource, visualisation_apply_filters,
+        fragment_cache_enabled=True, rdf_serializations=None, render_workers=1, visualisation_variants=None,
+        graph_enabled=False, graph_layout=False):
     """ Run this pipeline module.
 
     Args:
@@ -61,26 +127,22 @@ def run(ontology_model_dir_path, base_working_dir, ddat_base_url, ddat_skills_re
         ddat_base_url (string): Base URL to the DDaT profession capability framework website.
         ddat_skills_resource (string): Relative URL to the DDaT skills resource.
         visualisation_apply_filters (bool): Whether to apply visualisation filters.
+        fragment_cache_enabled (bool): Whether to reuse the class blocks rendered by the previous run
+            for unchanged classes.
+        rdf_serializations (list): Additional RDF serialization formats to write, either 'ntriples'
+            and/or 'turtle' (optional).
+        render_workers (int): Number of worker processes with which to render the skill and role classes
+            in chunks. If 1, or if worker processes cannot be forked on this platform, classes are rendered
+            one after another in this process.
+        visualisation_variants (dict): Visualisation filter chains keyed by the name of the filtered
+            OWL RDF/XML file to write (optional, defaults to the filtered ddat-visualisation.owl file).
+        graph_enabled (bool): Whether to write the ontology as a compact node/edge graph for visualisation.
+        graph_layout (bool): Whether to include precomputed layout coordinates in the graph.
 
     """
 
-    # Load the pre-defined ontology metadata and create the initial Ontology object.
-    ontology = load_ontology_metadata(ontology_model_dir_path)
-
-    # Load the pre-defined annotation properties from the ontology data model.
-    ontology = load_annotation_properties(ontology, ontology_model_dir_path)
-
-    # Load the pre-defined object properties from the ontology data model.
-    ontology = load_object_properties(ontology, ontology_model_dir_path)
-
-    # Load the pre-defined thing classes from the ontology model.
-    ontology = load_class_things(ontology, ontology_model_dir_path)
-
-    # Load the pre-defined discipline classes from the ontology model.
-    ontology = load_class_disciplines(ontology, ontology_model_dir_path)
-
-    # Load the pre-defined branch classes from the ontology model.
-    ontology = load_class_branches(ontology, ontology_model_dir_path)
+    # Load the pre-defined ontology data model and create the initial Ontology object.
+    ontology = load_ontology_model(ontology_model_dir_path, base_working_dir)
 
     # Load the parsed Skill objects from file.
     ontology = load_class_skills(ontology, base_working_dir)
@@ -88,189 +150,161 @@ def run(ontology_model_dir_path, base_working_dir, ddat_base_url, ddat_skills_re
     # Load the parsed Role objects from file.
     ontology = load_class_roles(ontology, base_working_dir)
 
-    # Model the Ontology as an OWL RDF/XML ontology.
-    modelled_ontology = model_ontology(ontology, ddat_base_url, ddat_skills_resource)
-
-    # Write the modelled ontology object to file.
+    # Write the modelled ontology object, and the indexes precomputed over it, to file.
     write_ontology_to_file(ontology, base_working_dir)
+    write_ontology_index_to_file(model_ontology_index(ontology), base_working_dir)
 
-    # Write the modelled ontology OWL RDF/XML string to file.
-    write_owl_ontology_to_file(modelled_ontology, base_working_dir)
+    # Write the matrix of the skill levels required by each role to file.
+    write_skill_matrix_to_file(model_skill_matrix(ontology), base_working_dir)
 
-    # Write a filtered ontology OWL RDF/XML string to file for visualisation purposes (optional).
-    write_filtered_owl_ontology_to_file(ontology, visualisation_apply_filters, base_working_dir)
+    # Load the class blocks rendered by the previous run (optional).
+    fragment_cache = load_fragment_cache(ontology, ddat_base_url, ddat_skills_resource, base_working_dir) \
+        if fragment_cache_enabled else None
 
+    # Model the Ontology as an OWL RDF/XML ontology and stream it to file, optionally rendering
+    # the skill and role classes across a pool of worker processes.
+    if render_workers > 1 and OUTPUT_OWL_RENDER_START_METHOD in multiprocessing.get_all_start_methods():
+        with ProcessPoolExecutor(max_workers=render_workers,
+                                 mp_context=multiprocessing.get_context(OUTPUT_OWL_RENDER_START_METHOD)) as render_pool:
+            stream_owl_ontology_to_file(
+                iter_ontology(ontology, ddat_base_url, ddat_skills_resource, fragment_cache, render_pool),
+                base_working_dir)
+    else:
+        stream_owl_ontology_to_file(
+            iter_ontology(ontology, ddat_base_url, ddat_skills_resource, fragment_cache), base_working_dir)
 
-def load_ontology_metadata(ontology_model_dir_path):
-    """ Load the pre-defined ontology metadata and create the initial Ontology object.
+    # Write the class blocks rendered by this run to file (optional).
+    if fragment_cache is not None:
+        write_fragment_cache_to_file(fragment_cache, base_working_dir)
 
-    Args:
-        ontology_model_dir_path (string): Path to the directory holding the pre-defined ontology data model.
-
-    Returns:
-        Ontology object.
+    # Stream the Ontology as triples to file in each additional RDF serialization format (optional).
+    for rdf_serialization in rdf_serializations or []:
+        stream_rdf_ontology_to_file(ontology, ddat_base_url, ddat_skills_resource, rdf_serialization, base_working_dir)
 
-    """
+    # Write filtered ontology OWL RDF/XML variants to file for visualisation purposes (optional).
+    write_filtered_owl_ontology_to_file(ontology, visualisation_apply_filters, base_working_dir, visualisation_variants)
 
-    with open(f'{ontology_model_dir_path}/{INPUT_MODEL_ONTOLOGY_METADATA_FILE_NAME}', 'r') as f:
-        ontology_metadata = json.load(f, object_hook=lambda d: SimpleNamespace(**d))
-    ontology = Ontology(
-        name=ontology_metadata.name,
-        iri=ontology_metadata.iri,
-        description=ontology_metadata.description,
-        owl_version=ontology_metadata.owl.version,
-        contributors=ontology_metadata.contributors)
-    return ontology
+    # Write the Ontology as a compact node/edge graph to file for visualisation purposes (optional).
+    if graph_enabled:
+        write_graph_to_file(model_graph(ontology), graph_layout, base_working_dir)
 
 
-def load_annotation_properties(ontology, ontology_model_dir_path):
-    """ Load the pre-defined annotation properties from the ontology data model.
+def load_ontology_model(ontology_model_dir_path, base_working_dir):
+    """ Load the pre-defined ontology data model and create the initial Ontology object holding the
+    pre-defined ontology metadata, annotation properties, object properties, and thing, discipline
+    and branch classes.
 
     Args:
-        ontology (Ontology): Ontology object
         ontology_model_dir_path (string): Path to the directory holding the pre-defined ontology data model.
+        base_working_dir (string): Path to the base working directory holding the compiled model cache.
 
     Returns:
         Ontology object.
 
     """
 
-    with open(f'{ontology_model_dir_path}/{INPUT_MODEL_ANNOTATION_PROPERTIES_FILE_NAME}', 'r') as f:
-        annotation_properties = json.load(f, object_hook=lambda d: SimpleNamespace(**d))
-    ontology.set_annotation_properties(annotation_properties)
-    return ontology
-
-
-def load_object_properties(ontology, ontology_model_dir_path):
-    """ Load the pre-defined object properties from the ontology data model.
-
-    Args:
-        ontology (Ontology): Ontology object
-        ontology_model_dir_path (string): Path to the directory holding the pre-defined ontology data model.
-
-    Returns:
-        Ontology object.
-
-    """
-
-    with open(f'{ontology_model_dir_path}/{INPUT_MODEL_OBJECT_PROPERTIES_FILE_NAME}', 'r') as f:
-        object_properties = json.load(f, object_hook=lambda d: SimpleNamespace(**d))
-    ontology.set_object_properties(object_properties)
+    model_repository = model_utils.load_model_repository(ontology_model_dir_path, base_working_dir)
+    ontology_metadata = model_repository.ontology_metadata
+    ontology = Ontology(
+        name=ontology_metadata.name,
+        iri=ontology_metadata.iri,
+        description=ontology_metadata.description,
+        owl_version=ontology_metadata.owl.version,
+        contributors=list(ontology_metadata.contributors))
+    ontology.set_annotation_properties(model_repository.annotation_properties)
+    ontology.set_object_properties(model_repository.object_properties)
+    ontology.set_class_things(model_repository.class_things)
+    ontology.set_class_disciplines(model_repository.class_disciplines)
+    ontology.set_class_branches(model_repository.class_branches)
     return ontology
 
 
-def load_class_things(ontology, ontology_model_dir_path):
-    """ Load the pre-defined thing classes from the ontology data model.
+def load_class_skills(ontology, base_working_dir):
+    """ Load the list of parsed Skill objects from the skills artifact.
 
     Args:
         ontology (Ontology): Ontology object
-        ontology_model_dir_path (string): Path to the directory holding the pre-defined ontology data model.
+        base_working_dir (string): Path to the base working directory.
 
     Returns:
         Ontology object.
 
-    """
-
-    with open(f'{ontology_model_dir_path}/{INPUT_MODEL_CLASS_THINGS_FILE_NAME}', 'r') as f:
-        class_things = json.load(f, object_hook=lambda d: SimpleNamespace(**d))
-    ontology.set_class_things(class_things)
-    return ontology
-
-
-def load_class_disciplines(ontology, ontology_model_dir_path):
-    """ Load the pre-defined discipline classes from the ontology data model.
-
-    Args:
-        ontology (Ontology): Ontology object
-        ontology_model_dir_path (string): Path to the directory holding the pre-defined ontology data model.
-
-    Returns:
-        Ontology object.
+    Raises:
+        FileNotFoundError: If there is no skills artifact, the skills parser not having been run.
+        ValueError: If the skills artifact was written with another artifact format version.
 
     """
 
-    with open(f'{ontology_model_dir_path}/{INPUT_MODEL_CLASS_DISCIPLINES_FILE_NAME}', 'r') as f:
-        class_disciplines = json.load(f, object_hook=lambda d: SimpleNamespace(**d))
-    ontology.set_class_disciplines(class_disciplines)
-    return ontology
-
-
-def load_class_branches(ontology, ontology_model_dir_path):
-    """ Load the pre-defined branch classes from the ontology data model.
-
-    Args:
-        ontology (Ontology): Ontology object
-        ontology_model_dir_path (string): Path to the directory holding the pre-defined ontology data model.
-
-    Returns:
-        Ontology object.
-
-    """
-
-    with open(f'{ontology_model_dir_path}/{INPUT_MODEL_CLASS_BRANCHES_FILE_NAME}', 'r') as f:
-        class_branches = json.load(f, object_hook=lambda d: SimpleNamespace(**d))
-    ontology.set_class_branches(class_branches)
+    skills = list(artifact_utils.iter_entities(f'{base_working_dir}/{INPUT_SKILLS_ARTIFACT_FILE_PATH}', Skill))
+    ontology.set_class_skills(skills)
     return ontology
 
 
-def load_class_skills(ontology, base_working_dir):
-    """ Load the list of parsed Skill objects from file.
+def load_class_roles(ontology, base_working_dir, branch_ids=None):
+    """ Load the list of parsed Role objects from the roles artifact, reading only the blocks of the given branches.
 
     Args:
         ontology (Ontology): Ontology object
         base_working_dir (string): Path to the base working directory.
+        branch_ids (list): IDs of the branches whose roles to load (optional, defaults to all branches).
 
     Returns:
         Ontology object.
 
+    Raises:
+        FileNotFoundError: If there is no roles artifact, the roles parser not having been run.
+        ValueError: If the roles artifact was written with another artifact format version.
+
     """
 
-    with open(f'{base_working_dir}/{INPUT_SKILLS_FILE_PATH}', 'rb') as f:
-        skills = pickle.load(f)
-    ontology.set_class_skills(skills)
+    roles = list(artifact_utils.iter_entities(
+        f'{base_working_dir}/{INPUT_ROLES_ARTIFACT_FILE_PATH}', Role, branch_ids))
+    ontology.set_class_roles(roles)
     return ontology
 
 
-def load_class_roles(ontology, base_working_dir):
-    """ Load the list of parsed Role objects from file.
+def model_ontology(ontology, ddat_base_url, ddat_skills_resource):
+    """ Model an Ontology object as an OWL RDF/XML ontology.
 
     Args:
         ontology (Ontology): Ontology object
-        base_working_dir (string): Path to the base working directory.
+        ddat_base_url (string): Base URL to the DDaT profession capability framework website.
+        ddat_skills_resource (string): Relative URL to the DDaT skills resource.
 
     Returns:
-        Ontology object.
+        Modelled ontology OWL RDF/XML string
 
     """
 
-    with open(f'{base_working_dir}/{INPUT_ROLES_FILE_PATH}', 'rb') as f:
-        roles = pickle.load(f)
-    ontology.set_class_roles(roles)
-    return ontology
+    return ''.join(iter_ontology(ontology, ddat_base_url, ddat_skills_resource))
 
 
-def model_ontology(ontology, ddat_base_url, ddat_skills_resource):
-    """ Model an Ontology object as an OWL RDF/XML ontology.
+def iter_ontology(ontology, ddat_base_url, ddat_skills_resource, fragment_cache=None, render_pool=None):
+    """ Lazily model an Ontology object as an OWL RDF/XML ontology, one block at a time,
+    so that the ontology can be streamed to file without being held in memory.
 
     Args:
         ontology (Ontology): Ontology object
         ddat_base_url (string): Base URL to the DDaT profession capability framework website.
         ddat_skills_resource (string): Relative URL to the DDaT skills resource.
+        fragment_cache (FragmentCache): Cache of previously rendered class blocks (optional).
+        render_pool (ProcessPoolExecutor): Process pool with which to render the skill and role classes
+            in chunks (optional).
 
-    Returns:
-        Modelled ontology OWL RDF/XML string
+    Yields:
+        Modelled ontology OWL RDF/XML block
 
     """
 
-    return (f'{model_ontology_metadata(ontology)}'
-            f'{model_annotation_properties(ontology)}'
-            f'{model_object_properties(ontology)}'
-            f'{model_class_things(ontology)}'
-            f'{model_class_disciplines(ontology)}'
-            f'{model_class_branches(ontology)}'
-            f'{model_class_skills(ontology, ddat_base_url, ddat_skills_resource)}'
-            f'{model_class_roles(ontology)}'
-            f'</rdf:RDF>')
+    yield model_ontology_metadata(ontology)
+    yield from iter_annotation_properties(ontology)
+    yield from iter_object_properties(ontology)
+    yield from iter_class_things(ontology, fragment_cache)
+    yield from iter_class_disciplines(ontology, fragment_cache)
+    yield from iter_class_branches(ontology, fragment_cache)
+    yield from iter_class_skills(ontology, ddat_base_url, ddat_skills_resource, fragment_cache, render_pool)
+    yield from iter_class_roles(ontology, fragment_cache, render_pool)
+    yield '</rdf:RDF>'
 
 
 def model_ontology_metadata(ontology):
@@ -285,9 +319,8 @@ def model_ontology_metadata(ontology):
     """
 
     # Generate the contributors string.
-    modelled_contributors = ''
-    for contributor in ontology.contributors:
-        modelled_contributors += f'<terms:contributor>{contributor}</terms:contributor>'
+    modelled_contributors = ''.join(
+        f'<terms:contributor>{contributor}</terms:contributor>' for contributor in ontology.contributors)
 
     return f'''<?xml version="1.0"?>
 <rdf:RDF xmlns="{ontology.iri}#"
@@ -322,19 +355,31 @@ def model_annotation_properties(ontology):
 
     """
 
-    # Generate the annotation properties OWL RDF/XML string.
-    modelled_annotation_properties = f'''
+    return ''.join(iter_annotation_properties(ontology))
+
+
+def iter_annotation_properties(ontology):
+    """ Lazily model annotation properties from an Ontology object as OWL RDF/XML blocks, one block at a time.
+
+    Args:
+        ontology (Ontology): Ontology object
+
+    Yields:
+        Modelled annotation properties OWL RDF/XML block
+
+    """
+
+    # Generate the annotation properties OWL RDF/XML blocks.
+    yield f'''
     <!-- ANNOTATION PROPERTIES -->\n\n
     <owl:AnnotationProperty rdf:about="http://www.w3.org/2004/02/skos/core#definition"/>\n\n'''
     for annotation_property in ontology.annotation_properties:
-        modelled_annotation_properties += f'''
+        yield f'''
     <owl:AnnotationProperty rdf:about="{ontology.iri}#{annotation_property.id}">
         <rdfs:label xml:lang="en" {RDF_DATATYPE_STRING}>{annotation_property.name}</rdfs:label>
         <skos:definition xml:lang="en" {RDF_DATATYPE_STRING}>{annotation_property.description}</skos:definition>
     </owl:AnnotationProperty>\n\n'''
 
-    return modelled_annotation_properties
-
 
 def model_object_properties(ontology):
     """ Model object properties from an Ontology object as an OWL RDF/XML string.
@@ -347,18 +392,30 @@ def model_object_properties(ontology):
 
     """
 
-    # Generate the object properties OWL RDF/XML string.
-    modelled_object_properties = f'''
+    return ''.join(iter_object_properties(ontology))
+
+
+def iter_object_properties(ontology):
+    """ Lazily model object properties from an Ontology object as OWL RDF/XML blocks, one block at a time.
+
+    Args:
+        ontology (Ontology): Ontology object
+
+    Yields:
+        Modelled object properties OWL RDF/XML block
+
+    """
+
+    # Generate the object properties OWL RDF/XML blocks.
+    yield f'''
     <!-- OBJECT PROPERTIES -->\n\n'''
     for object_property in ontology.object_properties:
-        modelled_object_properties += f'''
+        yield f'''
     <owl:ObjectProperty rdf:about="{ontology.iri}#{object_property.id}">
         <rdfs:subPropertyOf {OWL_TOP_OBJECT_PROPERTY_IRI}/>
         <rdfs:label xml:lang="en" {RDF_DATATYPE_STRING}>{object_property.name}</rdfs:label>
     </owl:ObjectProperty>\n\n'''
 
-    return modelled_object_properties
-
 
 def model_class_things(ontology):
     """ Model thing classes from an Ontology object as an OWL RDF/XML string.
@@ -371,11 +428,43 @@ def model_class_things(ontology):
 
     """
 
-    # Generate the thing classes OWL RDF/XML string.
-    modelled_class_things = f'''
+    return ''.join(iter_class_things(ontology))
+
+
+def iter_class_things(ontology, fragment_cache=None):
+    """ Lazily model thing classes from an Ontology object as OWL RDF/XML blocks, one class block at a time.
+
+    Args:
+        ontology (Ontology): Ontology object
+        fragment_cache (FragmentCache): Cache of previously rendered class blocks (optional).
+
+    Yields:
+        Modelled thing classes OWL RDF/XML block
+
+    """
+
+    # Generate the thing classes OWL RDF/XML blocks.
+    yield f'''
     <!-- CLASSES - THINGS -->\n\n'''
     for class_thing in ontology.class_things:
-        modelled_class_things += f'''
+        yield render_class_fragment(
+            fragment_cache, ENTITY_TYPE_THING, class_thing,
+            lambda: model_class_thing(ontology, class_thing))
+
+
+def model_class_thing(ontology, class_thing):
+    """ Model a thing class as an OWL RDF/XML class block.
+
+    Args:
+        ontology (Ontology): Ontology object
+        class_thing: Pre-defined thing class object.
+
+    Returns:
+        Modelled thing class OWL RDF/XML block
+
+    """
+
+    return f'''
     <owl:Class rdf:about="{ontology.iri}#{class_thing.id}">
         <entityType xml:lang="en" {RDF_DATATYPE_STRING}>{ENTITY_TYPE_THING}</entityType>
         <rdfs:label {RDF_DATATYPE_STRING}>{class_thing.name}</rdfs:label>
@@ -383,8 +472,6 @@ def model_class_things(ontology):
         <url xml:lang="en" rdf:resource="{class_thing.url}"/>
     </owl:Class>\n\n'''
 
-    return modelled_class_things
-
 
 def model_class_disciplines(ontology):
     """ Model discipline classes from an Ontology object as an OWL RDF/XML string.
@@ -397,11 +484,43 @@ def model_class_disciplines(ontology):
 
     """
 
-    # Generate the discipline classes OWL RDF/XML string.
-    modelled_class_disciplines = f'''
+    return ''.join(iter_class_disciplines(ontology))
+
+
+def iter_class_disciplines(ontology, fragment_cache=None):
+    """ Lazily model discipline classes from an Ontology object as OWL RDF/XML blocks, one class block at a time.
+
+    Args:
+        ontology (Ontology): Ontology object
+        fragment_cache (FragmentCache): Cache of previously rendered class blocks (optional).
+
+    Yields:
+        Modelled discipline classes OWL RDF/XML block
+
+    """
+
+    # Generate the discipline classes OWL RDF/XML blocks.
+    yield f'''
     <!-- CLASSES - DISCIPLINES -->\n\n'''
     for class_discipline in ontology.class_disciplines:
-        modelled_class_disciplines += f'''
+        yield render_class_fragment(
+            fragment_cache, ENTITY_TYPE_DISCIPLINE, class_discipline,
+            lambda: model_class_discipline(ontology, class_discipline))
+
+
+def model_class_discipline(ontology, class_discipline):
+    """ Model a discipline class as an OWL RDF/XML class block.
+
+    Args:
+        ontology (Ontology): Ontology object
+        class_discipline: Pre-defined discipline class object.
+
+    Returns:
+        Modelled discipline class OWL RDF/XML block
+
+    """
+
+    return f'''
     <owl:Class rdf:about="{ontology.iri}#{class_discipline.id}">
         <rdfs:subClassOf rdf:resource="{ontology.iri}#{class_discipline.thing_id}"/>
         <rdfs:subClassOf>
@@ -415,8 +534,6 @@ def model_class_disciplines(ontology):
         <skos:definition xml:lang="en" {RDF_DATATYPE_STRING}>{class_discipline.description}</skos:definition>
     </owl:Class>\n\n'''
 
-    return modelled_class_disciplines
-
 
 def model_class_branches(ontology):
     """ Model branch classes from an Ontology object as an OWL RDF/XML string.
@@ -429,22 +546,53 @@ def model_class_branches(ontology):
 
     """
 
-    # Generate the branch classes OWL RDF/XML string.
-    modelled_class_branches = f'''
+    return ''.join(iter_class_branches(ontology))
+
+
+def iter_class_branches(ontology, fragment_cache=None):
+    """ Lazily model branch classes from an Ontology object as OWL RDF/XML blocks, one class block at a time.
+
+    Args:
+        ontology (Ontology): Ontology object
+        fragment_cache (FragmentCache): Cache of previously rendered class blocks (optional).
+
+    Yields:
+        Modelled branch classes OWL RDF/XML block
+
+    """
+
+    # Generate the branch classes OWL RDF/XML blocks.
+    yield f'''
     <!-- CLASSES - BRANCHES -->\n\n'''
     for class_branch in ontology.class_branches:
+        yield render_class_fragment(
+            fragment_cache, ENTITY_TYPE_BRANCH, class_branch,
+            lambda: model_class_branch(ontology, class_branch))
+
+
+def model_class_branch(ontology, class_branch):
+    """ Model a branch class as an OWL RDF/XML class block.
+
+    Args:
+        ontology (Ontology): Ontology object
+        class_branch: Pre-defined branch class object.
+
+    Returns:
+        Modelled branch class OWL RDF/XML block
+
+    """
 
-        # Branch description (nullable)
-        skos_definition = \
-            (f'\n        <skos:definition xml:lang="en" {RDF_DATATYPE_STRING}>{class_branch.description}'
-             f'</skos:definition>') if hasattr(class_branch, 'description') else ''
+    # Branch description (nullable)
+    skos_definition = \
+        (f'\n        <skos:definition xml:lang="en" {RDF_DATATYPE_STRING}>{class_branch.description}'
+         f'</skos:definition>') if class_branch.description is not None else ''
 
-        # Branch responsibilities (nullable)
-        responsibilities = \
-            (f'\n        <responsibilities xml:lang="en" {RDF_DATATYPE_STRING}>{class_branch.responsibilities}'
-             f'</responsibilities>') if hasattr(class_branch, 'responsibilities') else ''
+    # Branch responsibilities (nullable)
+    responsibilities = \
+        (f'\n        <responsibilities xml:lang="en" {RDF_DATATYPE_STRING}>{class_branch.responsibilities}'
+         f'</responsibilities>') if class_branch.responsibilities is not None else ''
 
-        modelled_class_branches += f'''
+    return f'''
     <owl:Class rdf:about="{ontology.iri}#{class_branch.id}">
         <rdfs:subClassOf rdf:resource="{ontology.iri}#{class_branch.discipline_id}"/>
         <rdfs:subClassOf>
@@ -458,8 +606,6 @@ def model_class_branches(ontology):
         <url xml:lang="en" rdf:resource="{class_branch.url}"/>
     </owl:Class>\n\n'''
 
-    return modelled_class_branches
-
 
 def model_class_skills(ontology, ddat_base_url, ddat_skills_resource):
     """ Model skill classes from an Ontology object as an OWL RDF/XML string.
@@ -474,25 +620,60 @@ def model_class_skills(ontology, ddat_base_url, ddat_skills_resource):
 
     """
 
-    # Generate the skill classes OWL RDF/XML string.
-    modelled_class_skills = f'''
+    return ''.join(iter_class_skills(ontology, ddat_base_url, ddat_skills_resource))
+
+
+def iter_class_skills(ontology, ddat_base_url, ddat_skills_resource, fragment_cache=None, render_pool=None):
+    """ Lazily model skill classes from an Ontology object as OWL RDF/XML blocks, one class block at a time.
+
+    Args:
+        ontology (Ontology): Ontology object
+        ddat_base_url (string): Base URL to the DDaT profession capability framework website.
+        ddat_skills_resource (string): Relative URL to the DDaT skills resource.
+        fragment_cache (FragmentCache): Cache of previously rendered class blocks (optional).
+        render_pool (ProcessPoolExecutor): Process pool with which to render class blocks in chunks (optional).
+
+    Yields:
+        Modelled skill classes OWL RDF/XML block
+
+    """
+
+    # Generate the skill classes OWL RDF/XML blocks.
+    yield f'''
     <!-- CLASSES - SKILLS -->\n\n'''
-    for class_skill in ontology.class_skills:
+    yield from render_class_fragments(
+        ontology, ENTITY_TYPE_SKILL, ontology.class_skills, model_class_skill, (ddat_base_url, ddat_skills_resource),
+        fragment_cache, render_pool)
+
+
+def model_class_skill(ontology, class_skill, ddat_base_url, ddat_skills_resource):
+    """ Model a skill class as an OWL RDF/XML class block.
 
-        # Class attributes.
-        class_iri = f'{ontology.iri}#{OWL_SKILL_CLASS_ID}{string_utils.pascal_case(class_skill.name)}'
-        skill_url = f'{ddat_base_url}/{ddat_skills_resource}#{class_skill.anchor_id}'
-        skill_iri = f'{ontology.iri}#{OWL_SKILL_CLASS_ID}'
-        awareness_level_capabilities = string_utils.list_to_ordered_list_string(
-            class_skill.skill_levels['Awareness'])
-        working_level_capabilities = string_utils.list_to_ordered_list_string(
-            class_skill.skill_levels['Working'])
-        practitioner_level_capabilities = string_utils.list_to_ordered_list_string(
-            class_skill.skill_levels['Practitioner'])
-        expert_level_capabilities = string_utils.list_to_ordered_list_string(
-            class_skill.skill_levels['Expert'])
-
-        modelled_class_skills += f'''
+    Args:
+        ontology (Ontology): Ontology object
+        class_skill: Skill object.
+        ddat_base_url (string): Base URL to the DDaT profession capability framework website.
+        ddat_skills_resource (string): Relative URL to the DDaT skills resource.
+
+    Returns:
+        Modelled skill class OWL RDF/XML block
+
+    """
+
+    # Class attributes.
+    class_iri = f'{ontology.iri}#{OWL_SKILL_CLASS_ID}{string_utils.pascal_case(class_skill.name)}'
+    skill_url = f'{ddat_base_url}/{ddat_skills_resource}#{class_skill.anchor_id}'
+    skill_iri = f'{ontology.iri}#{OWL_SKILL_CLASS_ID}'
+    awareness_level_capabilities = string_utils.list_to_ordered_list_string(
+        class_skill.skill_levels['Awareness'])
+    working_level_capabilities = string_utils.list_to_ordered_list_string(
+        class_skill.skill_levels['Working'])
+    practitioner_level_capabilities = string_utils.list_to_ordered_list_string(
+        class_skill.skill_levels['Practitioner'])
+    expert_level_capabilities = string_utils.list_to_ordered_list_string(
+        class_skill.skill_levels['Expert'])
+
+    return f'''
     <owl:Class rdf:about="{class_iri}">
         <rdfs:subClassOf rdf:resource="{skill_iri}"/>
         <rdfs:label xml:lang="en">{class_skill.name}</rdfs:label>
@@ -505,8 +686,6 @@ def model_class_skills(ontology, ddat_base_url, ddat_skills_resource):
         <expertLevelCapabilities xml:lang="en" {RDF_DATATYPE_STRING}>{expert_level_capabilities}</expertLevelCapabilities>
     </owl:Class>\n\n'''
 
-    return modelled_class_skills
-
 
 def model_class_roles(ontology):
     """ Model role classes from an Ontology object as an OWL RDF/XML string.
@@ -519,21 +698,51 @@ def model_class_roles(ontology):
 
     """
 
-    # Generate the role classes OWL RDF/XML string.
-    modelled_class_roles = f'''
+    return ''.join(iter_class_roles(ontology))
+
+
+def iter_class_roles(ontology, fragment_cache=None, render_pool=None):
+    """ Lazily model role classes from an Ontology object as OWL RDF/XML blocks, one class block at a time.
+
+    Args:
+        ontology (Ontology): Ontology object
+        fragment_cache (FragmentCache): Cache of previously rendered class blocks (optional).
+        render_pool (ProcessPoolExecutor): Process pool with which to render class blocks in chunks (optional).
+
+    Yields:
+        Modelled role classes OWL RDF/XML block
+
+    """
+
+    # Generate the role classes OWL RDF/XML blocks.
+    yield f'''
         <!-- CLASSES - ROLES -->\n\n'''
-    for class_role in ontology.class_roles:
+    yield from render_class_fragments(
+        ontology, ENTITY_TYPE_ROLE, ontology.class_roles, model_class_role, (), fragment_cache, render_pool)
 
-        # Class attributes.
-        class_iri = f'{ontology.iri}#{class_role.iri_id}'
-        branch_iri = f'{ontology.iri}#{class_role.branch_id}'
-        modelled_role_skills = model_role_skills(ontology, class_role.skills)
-        modelled_role_responsibilities = string_utils.list_to_ordered_list_string(
-            class_role.responsibilities)
-        modelled_civil_service_job_grades = string_utils.list_to_ordered_list_string(
-            class_role.civil_service_job_grades)
 
-        modelled_class_roles += f'''
+def model_class_role(ontology, class_role):
+    """ Model a role class as an OWL RDF/XML class block.
+
+    Args:
+        ontology (Ontology): Ontology object
+        class_role: Role object.
+
+    Returns:
+        Modelled role class OWL RDF/XML block
+
+    """
+
+    # Class attributes.
+    class_iri = f'{ontology.iri}#{class_role.iri_id}'
+    branch_iri = f'{ontology.iri}#{class_role.branch_id}'
+    modelled_role_skills = model_role_skills(ontology, class_role.skills)
+    modelled_role_responsibilities = string_utils.list_to_ordered_list_string(
+        class_role.responsibilities)
+    modelled_civil_service_job_grades = string_utils.list_to_ordered_list_string(
+        class_role.civil_service_job_grades)
+
+    return f'''
     <owl:Class rdf:about="{class_iri}">
         <rdfs:subClassOf rdf:resource="{branch_iri}"/>
         <rdfs:subClassOf>
@@ -550,7 +759,104 @@ def model_class_roles(ontology):
         <civilServiceJobGrades xml:lang="en" {RDF_DATATYPE_STRING}>{modelled_civil_service_job_grades}</civilServiceJobGrades>
     </owl:Class>\n\n'''
 
-    return modelled_class_roles
+
+def render_class_fragment(fragment_cache, entity_type, class_entity, model_class):
+    """ Render a class as an OWL RDF/XML class block, reusing the cached class block
+    if the class is unchanged since it was last rendered.
+
+    Args:
+        fragment_cache (FragmentCache): Cache of previously rendered class blocks, or None.
+        entity_type (string): Entity type of the class.
+        class_entity: Class object.
+        model_class (callable): Function modelling the class as an OWL RDF/XML class block.
+
+    Returns:
+        Modelled class OWL RDF/XML block
+
+    """
+
+    if fragment_cache is None:
+        return model_class()
+    return fragment_cache.render(entity_type, class_entity, model_class)
+
+
+def render_class_fragments(ontology, entity_type, class_entities, model_class, model_class_args=(),
+                           fragment_cache=None, render_pool=None):
+    """ Lazily render the classes of a section as OWL RDF/XML class blocks in class order, reusing the
+    cached class blocks of unchanged classes. Given a process pool, the remaining classes are rendered
+    in chunks across the pool and the chunks are merged back in class order, so that the output is
+    identical to rendering the classes one after another.
+
+    Args:
+        ontology (Ontology): Ontology object
+        entity_type (string): Entity type of the classes.
+        class_entities (list): Class objects.
+        model_class (callable): Module-level function modelling a class as an OWL RDF/XML class block, called
+            with the Ontology object, the class object and the additional arguments.
+        model_class_args (tuple): Additional arguments to the class modelling function.
+        fragment_cache (FragmentCache): Cache of previously rendered class blocks (optional).
+        render_pool (ProcessPoolExecutor): Process pool with which to render class blocks in chunks (optional).
+
+    Yields:
+        Modelled class OWL RDF/XML block
+
+    """
+
+    if render_pool is None:
+        for class_entity in class_entities:
+            yield render_class_fragment(
+                fragment_cache, entity_type, class_entity,
+                lambda: model_class(ontology, class_entity, *model_class_args))
+        return
+
+    # Look up the cached class blocks, leaving the classes to render.
+    fragment_keys = [fragment_cache.key(entity_type, class_entity) for class_entity in class_entities] \
+        if fragment_cache is not None else [None] * len(class_entities)
+    cached_class_blocks = [fragment_cache.get(fragment_key) for fragment_key in fragment_keys] \
+        if fragment_cache is not None else [None] * len(class_entities)
+    unrendered_class_entities = [class_entity for class_entity, cached_class_block
+                                 in zip(class_entities, cached_class_blocks) if cached_class_block is None]
+
+    # Render the remaining classes in chunks across the process pool. Only the ontology metadata
+    # is sent to the worker processes alongside each chunk, rather than every modelled class.
+    ontology_metadata = Ontology(
+        name=ontology.name,
+        iri=ontology.iri,
+        description=ontology.description,
+        owl_version=ontology.owl_version,
+        contributors=ontology.contributors)
+    class_entity_chunks = [unrendered_class_entities[i:i + OUTPUT_OWL_RENDER_CHUNK_SIZE]
+                           for i in range(0, len(unrendered_class_entities), OUTPUT_OWL_RENDER_CHUNK_SIZE)]
+    rendered_class_blocks = itertools.chain.from_iterable(render_pool.map(
+        model_class_chunk, itertools.repeat(model_class), itertools.repeat(ontology_metadata),
+        class_entity_chunks, itertools.repeat(model_class_args)))
+
+    # Merge the cached and rendered class blocks in class order.
+    for fragment_key, cached_class_block in zip(fragment_keys, cached_class_blocks):
+        if cached_class_block is not None:
+            yield cached_class_block
+            continue
+        rendered_class_block = next(rendered_class_blocks)
+        if fragment_cache is not None:
+            fragment_cache.put(fragment_key, rendered_class_block)
+        yield rendered_class_block
+
+
+def model_class_chunk(model_class, ontology, class_entities, model_class_args):
+    """ Model a chunk of classes as OWL RDF/XML class blocks (run in a worker process).
+
+    Args:
+        model_class (callable): Module-level function modelling a class as an OWL RDF/XML class block.
+        ontology (Ontology): Ontology object
+        class_entities (list): Class objects.
+        model_class_args (tuple): Additional arguments to the class modelling function.
+
+    Returns:
+        List of modelled class OWL RDF/XML blocks
+
+    """
+
+    return [model_class(ontology, class_entity, *model_class_args) for class_entity in class_entities]
 
 
 def model_role_skills(ontology, role_skills):
@@ -566,17 +872,486 @@ def model_role_skills(ontology, role_skills):
     """
 
     # Generate the role skill OWL RDF/XML string.
-    modelled_role_skill_relationships = ''
-    for skill_iri_id, skill_level in role_skills.items():
-        modelled_role_skill_relationships += f'''
+    return ''.join(f'''
         <rdfs:subClassOf>
             <owl:Restriction>
                 <owl:onProperty rdf:resource="{ontology.iri}#{SKILL_LEVEL_OBJECT_PROPERTY_ID[skill_level]}"/>
                 <owl:someValuesFrom rdf:resource="{ontology.iri}#{OWL_SKILL_CLASS_ID}{skill_iri_id}"/>
             </owl:Restriction>
-        </rdfs:subClassOf>'''
+        </rdfs:subClassOf>''' for skill_iri_id, skill_level in role_skills.items())
+
 
-    return modelled_role_skill_relationships
+def iter_ontology_triples(ontology, ddat_base_url, ddat_skills_resource):
+    """ Lazily model an Ontology object as the RDF triples of the OWL RDF/XML ontology, one triple at a time,
+    so that the ontology can be streamed to file in a line-based RDF serialization.
+
+    Args:
+        ontology (Ontology): Ontology object
+        ddat_base_url (string): Base URL to the DDaT profession capability framework website.
+        ddat_skills_resource (string): Relative URL to the DDaT skills resource.
+
+    Yields:
+        Tuple of subject, predicate and object terms.
+
+    """
+
+    # Restriction blank node labels, numbered in document order.
+    blank_node_ids = itertools.count(1)
+
+    yield from iter_ontology_metadata_triples(ontology)
+    yield from iter_annotation_property_triples(ontology)
+    yield from iter_object_property_triples(ontology)
+    yield from iter_class_thing_triples(ontology)
+    yield from iter_class_discipline_triples(ontology, blank_node_ids)
+    yield from iter_class_branch_triples(ontology, blank_node_ids)
+    yield from iter_class_skill_triples(ontology, ddat_base_url, ddat_skills_resource)
+    yield from iter_class_role_triples(ontology, blank_node_ids)
+
+
+def ontology_term(ontology, entity_id):
+    """ Create the IRI term of an entity in the ontology namespace.
+
+    Args:
+        ontology (Ontology): Ontology object
+        entity_id (string): Entity ID.
+
+    Returns:
+        Iri term.
+
+    """
+
+    return rdf_utils.Iri(f'{ontology.iri}#{entity_id}')
+
+
+def string_literal(value):
+    """ Create an xsd:string typed literal term. """
+
+    return rdf_utils.Literal(value, datatype=XSD_STRING)
+
+
+def lang_literal(value):
+    """ Create an English language tagged literal term. """
+
+    return rdf_utils.Literal(value, lang=LITERAL_LANG)
+
+
+def iter_ontology_metadata_triples(ontology):
+    """ Lazily model metadata from an Ontology object as RDF triples.
+
+    Args:
+        ontology (Ontology): Ontology object
+
+    Yields:
+        Tuple of subject, predicate and object terms.
+
+    """
+
+    ontology_iri = rdf_utils.Iri(ontology.iri)
+    yield ontology_iri, RDF_TYPE, OWL_ONTOLOGY
+    yield ontology_iri, DC_TITLE, lang_literal(ontology.name)
+    yield ontology_iri, RDFS_LABEL, string_literal(ontology.name)
+    for contributor in ontology.contributors:
+        yield ontology_iri, DC_TERMS_CONTRIBUTOR, rdf_utils.Literal(contributor)
+    yield ontology_iri, DC_DESCRIPTION, lang_literal(ontology.description)
+    yield ontology_iri, OWL_VERSION_INFO, string_literal(ontology.owl_version)
+
+
+def iter_annotation_property_triples(ontology):
+    """ Lazily model annotation properties from an Ontology object as RDF triples.
+
+    Args:
+        ontology (Ontology): Ontology object
+
+    Yields:
+        Tuple of subject, predicate and object terms.
+
+    """
+
+    yield SKOS_DEFINITION, RDF_TYPE, OWL_ANNOTATION_PROPERTY
+    for annotation_property in ontology.annotation_properties:
+        property_iri = ontology_term(ontology, annotation_property.id)
+        yield property_iri, RDF_TYPE, OWL_ANNOTATION_PROPERTY
+        yield property_iri, RDFS_LABEL, string_literal(annotation_property.name)
+        yield property_iri, SKOS_DEFINITION, string_literal(annotation_property.description)
+
+
+def iter_object_property_triples(ontology):
+    """ Lazily model object properties from an Ontology object as RDF triples.
+
+    Args:
+        ontology (Ontology): Ontology object
+
+    Yields:
+        Tuple of subject, predicate and object terms.
+
+    """
+
+    for object_property in ontology.object_properties:
+        property_iri = ontology_term(ontology, object_property.id)
+        yield property_iri, RDF_TYPE, OWL_OBJECT_PROPERTY
+        yield property_iri, RDFS_SUB_PROPERTY_OF, OWL_TOP_OBJECT_PROPERTY
+        yield property_iri, RDFS_LABEL, string_literal(object_property.name)
+
+
+def iter_restriction_triples(class_iri, property_iri, values_class_iri, blank_node_ids):
+    """ Lazily model an existential object property restriction on a class as RDF triples.
+
+    Args:
+        class_iri (Iri): Restricted class IRI term.
+        property_iri (Iri): Object property IRI term.
+        values_class_iri (Iri): IRI term of the class the property values are drawn from.
+        blank_node_ids (iterator): Iterator of unique restriction blank node IDs.
+
+    Yields:
+        Tuple of subject, predicate and object terms.
+
+    """
+
+    restriction = rdf_utils.BlankNode(f'restriction{next(blank_node_ids)}')
+    yield class_iri, RDFS_SUB_CLASS_OF, restriction
+    yield restriction, RDF_TYPE, OWL_RESTRICTION
+    yield restriction, OWL_ON_PROPERTY, property_iri
+    yield restriction, OWL_SOME_VALUES_FROM, values_class_iri
+
+
+def iter_class_thing_triples(ontology):
+    """ Lazily model thing classes from an Ontology object as RDF triples.
+
+    Args:
+        ontology (Ontology): Ontology object
+
+    Yields:
+        Tuple of subject, predicate and object terms.
+
+    """
+
+    for class_thing in ontology.class_things:
+        class_iri = ontology_term(ontology, class_thing.id)
+        yield class_iri, RDF_TYPE, OWL_CLASS
+        yield class_iri, ontology_term(ontology, 'entityType'), string_literal(ENTITY_TYPE_THING)
+        yield class_iri, RDFS_LABEL, string_literal(class_thing.name)
+        yield class_iri, RDFS_COMMENT, string_literal(class_thing.description)
+        yield class_iri, ontology_term(ontology, 'url'), rdf_utils.Iri(class_thing.url)
+
+
+def iter_class_discipline_triples(ontology, blank_node_ids):
+    """ Lazily model discipline classes from an Ontology object as RDF triples.
+
+    Args:
+        ontology (Ontology): Ontology object
+        blank_node_ids (iterator): Iterator of unique restriction blank node IDs.
+
+    Yields:
+        Tuple of subject, predicate and object terms.
+
+    """
+
+    for class_discipline in ontology.class_disciplines:
+        class_iri = ontology_term(ontology, class_discipline.id)
+        thing_iri = ontology_term(ontology, class_discipline.thing_id)
+        yield class_iri, RDF_TYPE, OWL_CLASS
+        yield class_iri, RDFS_SUB_CLASS_OF, thing_iri
+        yield from iter_restriction_triples(
+            class_iri, ontology_term(ontology, class_discipline.object_property_id), thing_iri, blank_node_ids)
+        yield class_iri, ontology_term(ontology, 'entityType'), string_literal(ENTITY_TYPE_DISCIPLINE)
+        yield class_iri, RDFS_LABEL, string_literal(class_discipline.name)
+        yield class_iri, SKOS_DEFINITION, string_literal(class_discipline.description)
+
+
+def iter_class_branch_triples(ontology, blank_node_ids):
+    """ Lazily model branch classes from an Ontology object as RDF triples.
+
+    Args:
+        ontology (Ontology): Ontology object
+        blank_node_ids (iterator): Iterator of unique restriction blank node IDs.
+
+    Yields:
+        Tuple of subject, predicate and object terms.
+
+    """
+
+    for class_branch in ontology.class_branches:
+        class_iri = ontology_term(ontology, class_branch.id)
+        discipline_iri = ontology_term(ontology, class_branch.discipline_id)
+        yield class_iri, RDF_TYPE, OWL_CLASS
+        yield class_iri, RDFS_SUB_CLASS_OF, discipline_iri
+        yield from iter_restriction_triples(
+            class_iri, ontology_term(ontology, class_branch.object_property_id), discipline_iri, blank_node_ids)
+        yield class_iri, ontology_term(ontology, 'entityType'), string_literal(ENTITY_TYPE_BRANCH)
+        yield class_iri, RDFS_LABEL, string_literal(class_branch.name)
+
+        # Branch description and responsibilities (nullable)
+        if class_branch.description is not None:
+            yield class_iri, SKOS_DEFINITION, string_literal(class_branch.description)
+        if class_branch.responsibilities is not None:
+            yield class_iri, ontology_term(ontology, 'responsibilities'), string_literal(class_branch.responsibilities)
+        yield class_iri, ontology_term(ontology, 'url'), rdf_utils.Iri(class_branch.url)
+
+
+def iter_class_skill_triples(ontology, ddat_base_url, ddat_skills_resource):
+    """ Lazily model skill classes from an Ontology object as RDF triples.
+
+    Args:
+        ontology (Ontology): Ontology object
+        ddat_base_url (string): Base URL to the DDaT profession capability framework website.
+        ddat_skills_resource (string): Relative URL to the DDaT skills resource.
+
+    Yields:
+        Tuple of subject, predicate and object terms.
+
+    """
+
+    skill_iri = ontology_term(ontology, OWL_SKILL_CLASS_ID)
+    for class_skill in ontology.class_skills:
+        class_iri = ontology_term(ontology, f'{OWL_SKILL_CLASS_ID}{string_utils.pascal_case(class_skill.name)}')
+        yield class_iri, RDF_TYPE, OWL_CLASS
+        yield class_iri, RDFS_SUB_CLASS_OF, skill_iri
+        yield class_iri, RDFS_LABEL, lang_literal(class_skill.name)
+        yield class_iri, SKOS_DEFINITION, string_literal(class_skill.description)
+        yield class_iri, ontology_term(ontology, 'entityType'), string_literal(ENTITY_TYPE_SKILL)
+        yield class_iri, ontology_term(ontology, 'url'), rdf_utils.Iri(
+            f'{ddat_base_url}/{ddat_skills_resource}#{class_skill.anchor_id}')
+        for skill_level in ['Awareness', 'Working', 'Practitioner', 'Expert']:
+            yield class_iri, ontology_term(ontology, f'{skill_level.lower()}LevelCapabilities'), string_literal(
+                string_utils.list_to_ordered_list_string(class_skill.skill_levels[skill_level]))
+
+
+def iter_class_role_triples(ontology, blank_node_ids):
+    """ Lazily model role classes from an Ontology object as RDF triples.
+
+    Args:
+        ontology (Ontology): Ontology object
+        blank_node_ids (iterator): Iterator of unique restriction blank node IDs.
+
+    Yields:
+        Tuple of subject, predicate and object terms.
+
+    """
+
+    for class_role in ontology.class_roles:
+        class_iri = ontology_term(ontology, class_role.iri_id)
+        branch_iri = ontology_term(ontology, class_role.branch_id)
+        yield class_iri, RDF_TYPE, OWL_CLASS
+        yield class_iri, RDFS_SUB_CLASS_OF, branch_iri
+        yield from iter_restriction_triples(
+            class_iri, ontology_term(ontology, OBJECT_PROPERTY_SPECIALIST_IN_ID), branch_iri, blank_node_ids)
+        for skill_iri_id, skill_level in class_role.skills.items():
+            yield from iter_restriction_triples(
+                class_iri, ontology_term(ontology, SKILL_LEVEL_OBJECT_PROPERTY_ID[skill_level]),
+                ontology_term(ontology, f'{OWL_SKILL_CLASS_ID}{skill_iri_id}'), blank_node_ids)
+        yield class_iri, ontology_term(ontology, 'entityType'), string_literal(ENTITY_TYPE_ROLE)
+        yield class_iri, RDFS_LABEL, lang_literal(class_role.name)
+        yield class_iri, SKOS_DEFINITION, string_literal(class_role.description)
+        yield class_iri, ontology_term(ontology, 'url'), rdf_utils.Iri(class_role.url)
+        yield class_iri, ontology_term(ontology, 'responsibilities'), string_literal(
+            string_utils.list_to_ordered_list_string(class_role.responsibilities))
+        yield class_iri, ontology_term(ontology, 'civilServiceJobGrades'), string_literal(
+            string_utils.list_to_ordered_list_string(class_role.civil_service_job_grades))
+
+
+def iter_rdf_ontology(ontology, ddat_base_url, ddat_skills_resource, rdf_serialization):
+    """ Lazily serialize an Ontology object as triples in a line-based RDF serialization format.
+
+    Args:
+        ontology (Ontology): Ontology object
+        ddat_base_url (string): Base URL to the DDaT profession capability framework website.
+        ddat_skills_resource (string): Relative URL to the DDaT skills resource.
+        rdf_serialization (string): RDF serialization format, either 'ntriples' or 'turtle'.
+
+    Returns:
+        Iterator of serialized ontology blocks.
+
+    """
+
+    triples = iter_ontology_triples(ontology, ddat_base_url, ddat_skills_resource)
+    if rdf_serialization == rdf_utils.FORMAT_NTRIPLES:
+        return rdf_utils.iter_ntriples(triples)
+    if rdf_serialization == rdf_utils.FORMAT_TURTLE:
+        return rdf_utils.iter_turtle(triples, prefixes={
+            '': f'{ontology.iri}#',
+            'owl': rdf_utils.OWL_NAMESPACE,
+            'rdf': rdf_utils.RDF_NAMESPACE,
+            'rdfs': rdf_utils.RDFS_NAMESPACE,
+            'xsd': rdf_utils.XSD_NAMESPACE,
+            'skos': rdf_utils.SKOS_NAMESPACE,
+            'dc': rdf_utils.DC_NAMESPACE,
+            'terms': rdf_utils.DC_TERMS_NAMESPACE})
+    raise ValueError(f'Unsupported RDF serialization format: {rdf_serialization}')
+
+
+def model_graph(ontology):
+    """ Model an Ontology object as a compact node/edge graph for visualisation, linking the thing,
+    discipline, branch, role and skill classes with edges typed by the object property relating them,
+    so that role to skill edges are typed by skill level. As in the filtered visualisation ontology,
+    the Skill parent class and relationships to it are left out.
+
+    Args:
+        ontology (Ontology): Ontology object
+
+    Returns:
+        Graph object.
+
+    """
+
+    graph = graph_utils.Graph()
+    skill_parent_iri = f'{ontology.iri}#{OWL_SKILL_CLASS_ID}'
+
+    # Add the class nodes.
+    for class_thing in ontology.class_things:
+        if f'{ontology.iri}#{class_thing.id}' != skill_parent_iri:
+            graph.add_node(f'{ontology.iri}#{class_thing.id}', class_thing.name, ENTITY_TYPE_THING,
+                           GRAPH_ENTITY_TYPE_LAYERS[ENTITY_TYPE_THING])
+    for class_discipline in ontology.class_disciplines:
+        graph.add_node(f'{ontology.iri}#{class_discipline.id}', class_discipline.name, ENTITY_TYPE_DISCIPLINE,
+                       GRAPH_ENTITY_TYPE_LAYERS[ENTITY_TYPE_DISCIPLINE])
+    for class_branch in ontology.class_branches:
+        graph.add_node(f'{ontology.iri}#{class_branch.id}', class_branch.name, ENTITY_TYPE_BRANCH,
+                       GRAPH_ENTITY_TYPE_LAYERS[ENTITY_TYPE_BRANCH])
+    for class_role in ontology.class_roles:
+        graph.add_node(f'{ontology.iri}#{class_role.iri_id}', class_role.name, ENTITY_TYPE_ROLE,
+                       GRAPH_ENTITY_TYPE_LAYERS[ENTITY_TYPE_ROLE])
+    for class_skill in ontology.class_skills:
+        graph.add_node(f'{ontology.iri}#{OWL_SKILL_CLASS_ID}{string_utils.pascal_case(class_skill.name)}',
+                       class_skill.name, ENTITY_TYPE_SKILL, GRAPH_ENTITY_TYPE_LAYERS[ENTITY_TYPE_SKILL])
+
+    # Add the edges from each class to the classes it is related to.
+    for class_discipline in ontology.class_disciplines:
+        graph.add_edge(f'{ontology.iri}#{class_discipline.id}', f'{ontology.iri}#{class_discipline.thing_id}',
+                       class_discipline.object_property_id)
+    for class_branch in ontology.class_branches:
+        graph.add_edge(f'{ontology.iri}#{class_branch.id}', f'{ontology.iri}#{class_branch.discipline_id}',
+                       class_branch.object_property_id)
+    for class_role in ontology.class_roles:
+        role_iri = f'{ontology.iri}#{class_role.iri_id}'
+        graph.add_edge(role_iri, f'{ontology.iri}#{class_role.branch_id}', OBJECT_PROPERTY_SPECIALIST_IN_ID)
+        for skill_iri_id, skill_level in class_role.skills.items():
+            graph.add_edge(role_iri, f'{ontology.iri}#{OWL_SKILL_CLASS_ID}{skill_iri_id}',
+                           SKILL_LEVEL_OBJECT_PROPERTY_ID[skill_level])
+
+    return graph
+
+
+def model_ontology_index(ontology):
+    """ Precompute the indexes of an Ontology object answering lookups by class IRI and name, and the
+    skill to roles by skill level, role to skills, branch to roles and discipline to branches relationships.
+
+    Args:
+        ontology (Ontology): Ontology object
+
+    Returns:
+        OntologyIndex object.
+
+    """
+
+    ontology_index = OntologyIndex()
+
+    # Index the classes by IRI and name.
+    for class_thing in ontology.class_things:
+        ontology_index.add_entity(f'{ontology.iri}#{class_thing.id}', ENTITY_TYPE_THING, class_thing.name)
+    for class_discipline in ontology.class_disciplines:
+        ontology_index.add_entity(
+            f'{ontology.iri}#{class_discipline.id}', ENTITY_TYPE_DISCIPLINE, class_discipline.name)
+    for class_branch in ontology.class_branches:
+        ontology_index.add_entity(f'{ontology.iri}#{class_branch.id}', ENTITY_TYPE_BRANCH, class_branch.name)
+    for class_role in ontology.class_roles:
+        ontology_index.add_entity(f'{ontology.iri}#{class_role.iri_id}', ENTITY_TYPE_ROLE, class_role.name)
+    for class_skill in ontology.class_skills:
+        ontology_index.add_entity(f'{ontology.iri}#{OWL_SKILL_CLASS_ID}{string_utils.pascal_case(class_skill.name)}',
+                                  ENTITY_TYPE_SKILL, class_skill.name)
+
+    # Index the relationships between the classes.
+    for class_branch in ontology.class_branches:
+        ontology_index.add_discipline_branch(
+            f'{ontology.iri}#{class_branch.discipline_id}', f'{ontology.iri}#{class_branch.id}')
+    for class_role in ontology.class_roles:
+        role_iri = f'{ontology.iri}#{class_role.iri_id}'
+        ontology_index.add_branch_role(f'{ontology.iri}#{class_role.branch_id}', role_iri)
+        for skill_iri_id, skill_level in class_role.skills.items():
+            ontology_index.add_role_skill(role_iri, f'{ontology.iri}#{OWL_SKILL_CLASS_ID}{skill_iri_id}', skill_level)
+
+    return ontology_index
+
+
+def model_skill_matrix(ontology):
+    """ Model the skill levels required by the role classes of an Ontology object as a sparse
+    role by skill matrix of ordinal skill levels, with rows and columns identified by class IRI.
+
+    Args:
+        ontology (Ontology): Ontology object
+
+    Returns:
+        SkillMatrix object.
+
+    """
+
+    return skill_matrix_utils.SkillMatrix.from_role_skills(
+        ((f'{ontology.iri}#{class_role.iri_id}',
+          {f'{ontology.iri}#{OWL_SKILL_CLASS_ID}{skill_iri_id}': skill_level
+           for skill_iri_id, skill_level in class_role.skills.items()}) for class_role in ontology.class_roles),
+        skill_ids=[f'{ontology.iri}#{OWL_SKILL_CLASS_ID}{string_utils.pascal_case(class_skill.name)}'
+                   for class_skill in ontology.class_skills])
+
+
+def load_skill_matrix(base_working_dir):
+    """ Load the role by skill level matrix modelled by the previous run, if any.
+
+    Args:
+        base_working_dir (string): Path to the base working directory.
+
+    Returns:
+        SkillMatrix object, or None if there is none.
+
+    """
+
+    return skill_matrix_utils.load_skill_matrix(f'{base_working_dir}/{OUTPUT_SKILL_MATRIX_FILE_PATH}')
+
+
+def load_ontology_index(base_working_dir):
+    """ Load the indexes precomputed over the modelled ontology by the previous run, if any.
+
+    Args:
+        base_working_dir (string): Path to the base working directory.
+
+    Returns:
+        OntologyIndex object, or None if there is none.
+
+    """
+
+    ontology_indexes = artifact_utils.load_entities(f'{base_working_dir}/{OUTPUT_INDEX_FILE_PATH}', OntologyIndex)
+    return ontology_indexes[0] if ontology_indexes else None
+
+
+def load_fragment_cache(ontology, ddat_base_url, ddat_skills_resource, base_working_dir):
+    """ Load the cache of class blocks rendered by the previous run. Cached class blocks are
+    keyed by the class data, the ontology IRI, the skills resource URL and the template version.
+
+    Args:
+        ontology (Ontology): Ontology object
+        ddat_base_url (string): Base URL to the DDaT profession capability framework website.
+        ddat_skills_resource (string): Relative URL to the DDaT skills resource.
+        base_working_dir (string): Path to the base working directory.
+
+    Returns:
+        FragmentCache object.
+
+    """
+
+    return fragment_utils.load_fragment_cache(
+        f'{base_working_dir}/{OUTPUT_OWL_FRAGMENT_CACHE_FILE_PATH}',
+        namespace=[OWL_TEMPLATE_VERSION, ontology.iri, ddat_base_url, ddat_skills_resource])
+
+
+def write_fragment_cache_to_file(fragment_cache, base_working_dir):
+    """ Write the cache of class blocks rendered by this run to file.
+
+    Args:
+        fragment_cache (FragmentCache): Cache of rendered class blocks.
+        base_working_dir (string): Path to the base working directory.
+
+    """
+
+    fragment_utils.write_fragment_cache(f'{base_working_dir}/{OUTPUT_OWL_FRAGMENT_CACHE_FILE_PATH}', fragment_cache)
+    logger.info(f'OWL class blocks reused: {fragment_cache.hits}, rendered: {fragment_cache.misses}.')
 
 
 def write_ontology_to_file(ontology, base_working_dir):
@@ -588,8 +1363,32 @@ def write_ontology_to_file(ontology, base_working_dir):
 
     """
 
-    with open(f'{base_working_dir}/{OUTPUT_FILE_PATH}', 'wb') as f:
-        pickle.dump(ontology, f)
+    artifact_utils.write_artifact(f'{base_working_dir}/{OUTPUT_FILE_PATH}', Ontology, [('ontology', [ontology])])
+
+
+def write_ontology_index_to_file(ontology_index, base_working_dir):
+    """  Write the indexes precomputed over the modelled ontology to file.
+
+    Args:
+        ontology_index (OntologyIndex): OntologyIndex object
+        base_working_dir (string): Path to the base working directory.
+
+    """
+
+    artifact_utils.write_artifact(
+        f'{base_working_dir}/{OUTPUT_INDEX_FILE_PATH}', OntologyIndex, [('index', [ontology_index])])
+
+
+def write_skill_matrix_to_file(skill_matrix, base_working_dir):
+    """  Write the role by skill level matrix to file as a sparse compressed NumPy archive.
+
+    Args:
+        skill_matrix (SkillMatrix): Role by skill level matrix.
+        base_working_dir (string): Path to the base working directory.
+
+    """
+
+    skill_matrix_utils.write_skill_matrix(f'{base_working_dir}/{OUTPUT_SKILL_MATRIX_FILE_PATH}', skill_matrix)
 
 
 def write_owl_ontology_to_file(modelled_ontology, base_working_dir):
@@ -605,20 +1404,72 @@ def write_owl_ontology_to_file(modelled_ontology, base_working_dir):
         f.write(f'{modelled_ontology}')
 
 
-def write_filtered_owl_ontology_to_file(ontology, visualisation_apply_filters, base_working_dir):
-    """ Filter a post-modelled DDaT ontology OWL RDF/XML file for visualisation
-    by removing the Skill parent class and relationships to it thereby
-    removing links that do not add value to the ontology visualisation.
+def stream_owl_ontology_to_file(modelled_ontology_blocks, base_working_dir):
+    """ Stream the modelled ontology OWL RDF/XML blocks to file through a buffered file handle.
+
+    Args:
+        modelled_ontology_blocks (iterable): Modelled ontology OWL RDF/XML blocks.
+        base_working_dir (string): Path to the base working directory.
+
+    """
+
+    with open(f'{base_working_dir}/{OUTPUT_OWL_FILE_PATH}', 'w', buffering=OUTPUT_OWL_BUFFER_SIZE) as f:
+        f.writelines(modelled_ontology_blocks)
+
+
+def stream_rdf_ontology_to_file(ontology, ddat_base_url, ddat_skills_resource, rdf_serialization, base_working_dir):
+    """ Stream the Ontology as triples to file in a line-based RDF serialization format
+    through a buffered file handle.
+
+    Args:
+        ontology (Ontology): Ontology object
+        ddat_base_url (string): Base URL to the DDaT profession capability framework website.
+        ddat_skills_resource (string): Relative URL to the DDaT skills resource.
+        rdf_serialization (string): RDF serialization format, either 'ntriples' or 'turtle'.
+        base_working_dir (string): Path to the base working directory.
+
+    """
+
+    serialized_ontology_blocks = iter_rdf_ontology(ontology, ddat_base_url, ddat_skills_resource, rdf_serialization)
+    with open(f'{base_working_dir}/{OUTPUT_RDF_FILE_PATHS[rdf_serialization]}', 'w',
+              encoding='utf-8', buffering=OUTPUT_OWL_BUFFER_SIZE) as f:
+        f.writelines(serialized_ontology_blocks)
+
+
+def write_graph_to_file(graph, graph_layout, base_working_dir):
+    """ Write the modelled ontology graph to file as compact JSON.
+
+    Args:
+        graph (Graph): Modelled ontology graph.
+        graph_layout (bool): Whether to include precomputed layout coordinates.
+        base_working_dir (string): Path to the base working directory.
+
+    """
+
+    graph_utils.write_graph(f'{base_working_dir}/{OUTPUT_GRAPH_FILE_PATH}', graph, layout=graph_layout)
+
+
+def write_filtered_owl_ontology_to_file(ontology, visualisation_apply_filters, base_working_dir,
+                                        visualisation_variants=None):
+    """ Filter a post-modelled DDaT ontology OWL RDF/XML file for visualisation, by default
+    removing the Skill parent class and relationships to it thereby removing links that
+    do not add value to the ontology visualisation. All the visualisation variants are
+    filtered in a single pass over the OWL RDF/XML file.
 
     Args:
         ontology (Ontology): Ontology object
         visualisation_apply_filters (bool): Whether to apply visualisation filters.
         base_working_dir (string): Path to the base working directory.
+        visualisation_variants (dict): Visualisation filter chains keyed by the name of the filtered
+            OWL RDF/XML file to write (optional).
 
     """
 
     if visualisation_apply_filters:
-        visualisation_utils.filter_ontology(
-            skill_iri=f'{ontology.iri}#{OWL_SKILL_CLASS_ID}',
-            modelled_ddat_ontology_owl_file_path=f'{base_working_dir}/{OUTPUT_OWL_FILE_PATH}',
-            filtered_ddat_ontology_owl_file_path=f'{base_working_dir}/{OUTPUT_OWL_FILTERED_FILE_PATH}')
+        skill_level_property_ids = list(SKILL_LEVEL_OBJECT_PROPERTY_ID.values())
+        visualisation_utils.filter_owl_file(
+            owl_file_path=f'{base_working_dir}/{OUTPUT_OWL_FILE_PATH}',
+            filter_chains={
+                f'{base_working_dir}/{OUTPUT_OWL_VISUALISATION_FILE_PATH.format(variant=variant)}':
+                    visualisation_utils.create_filter_chain(filter_configs, ontology.iri, skill_level_property_ids)
+                for variant, filter_configs in (visualisation_variants or VISUALISATION_DEFAULT_VARIANTS).items()})
@@ -1,15 +1,16 @@
 """ Duplicate skills detector. """
 
+import ddat.utils.artifact_utils as artifact_utils
 import pandas as pd
-import pickle
 
+from ddat.classes.skill import Skill
 from ddat.pipeline.models.semantic_similarity.pre_trained.sentence_similarity import compute_sentence_similarity
 
 # Module name.
 MODULE_NAME = 'Duplicate Skills Detector'
 
-# Input parsed objects.
-INPUT_SKILLS_FILE_PATH = 'parsed/skills.pkl'
+# Input parsed object artifacts.
+INPUT_SKILLS_ARTIFACT_FILE_PATH = 'parsed/skills.artifact'
 
 # Output file relative path and name.
 OUTPUT_RANKED_SKILLS_FILE_PATH = 'models/semantic_similarity/skills_semantic_similarity.xlsx'
@@ -26,7 +27,7 @@ def run(base_working_dir):
 
     """
 
-    # Load the parsed Skill objects from file.
+    # Stream the parsed Skill objects from the skills artifact.
     skills = load_skills(base_working_dir)
 
     # Flatten skill properties into descriptive sentences.
@@ -62,26 +63,28 @@ def run(base_working_dir):
 
 
 def load_skills(base_working_dir):
-    """ Load the list of parsed Skill objects from file.
+    """ Lazily load the parsed Skill objects from the skills artifact, one block at a time.
 
     Args:
         base_working_dir (string): Path to the base working directory.
 
     Returns:
-        List of skill objects.
+        Iterator of skill objects.
+
+    Raises:
+        FileNotFoundError: If there is no skills artifact, the skills parser not having been run.
+        ValueError: If the skills artifact was written with another artifact format version.
 
     """
 
-    with open(f'{base_working_dir}/{INPUT_SKILLS_FILE_PATH}', 'rb') as f:
-        skills = pickle.load(f)
-    return skills
+    return artifact_utils.iter_entities(f'{base_working_dir}/{INPUT_SKILLS_ARTIFACT_FILE_PATH}', Skill)
 
 
 def generate_skill_sentences(skills):
     """ Flatten skill properties into descriptive sentences.
 
     Args:
-        skills (List): List of skill objects.
+        skills (Iterable): Iterable of skill objects.
 
     Returns:
         Tuple of dictionaries containing descriptive sentences for each skill.
@@ -1,28 +1,38 @@
 """ Roles parser pipeline module. """
 
+import ddat.transports.async_crawler as async_crawler
+import ddat.transports.http_transport as http_transport
+import ddat.transports.selenium_waits as selenium_waits
+import ddat.transports.session_manager as session_manager
+import ddat.transports.transport_factory as transport_factory
+import ddat.utils.artifact_utils as artifact_utils
+import ddat.utils.checkpoint_utils as checkpoint_utils
 import ddat.utils.html_parser_utils as html_parser_utils
+import ddat.utils.model_utils as model_utils
+import ddat.utils.snapshot_utils as snapshot_utils
 import ddat.utils.string_utils as string_utils
-import json
-import pickle
+import lxml.etree
 
+from concurrent.futures import ThreadPoolExecutor
 from ddat.classes.role import Role
 from ddat.config.logging_config import logger
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from types import SimpleNamespace
 
 # Module name.
 MODULE_NAME = 'Roles Parser'
 
-# Input model file names.
-INPUT_MODEL_CLASS_BRANCHES_FILE_NAME = 'class_branches.json'
+# Output artifact, directory and file relative paths and names.
+OUTPUT_ARTIFACT_FILE_PATH = 'parsed/roles.artifact'
+OUTPUT_MANIFEST_FILE_PATH = 'parsed/roles_manifest.json'
+OUTPUT_CHECKPOINT_DIR_PATH = 'parsed/checkpoints/roles'
+OUTPUT_FAILURE_REPORT_FILE_PATH = 'parsed/roles_failures.json'
 
-# Output file relative path and name.
-OUTPUT_FILE_PATH = 'parsed/roles.pkl'
+# Parser version. Increment whenever the parser changes how roles are parsed so that the
+# roles parsed by previous runs are re-parsed rather than reused.
+PARSER_VERSION = '1'
 
-# CSS selectors.
-SELECTOR_ROLE_LINKS = "ul.contents-list-links.indented-list > li > a"
+# XPath expressions.
+XPATH_ROLE_LINKS = (f'//ul[{html_parser_utils.xpath_has_class("contents-list-links")} and '
+                    f'{html_parser_utils.xpath_has_class("indented-list")}]/li/a')
 
 # HTML classes.
 HTML_ROLE_LEVEL_HEADER_CLASS_NAME = "role-level-header"
@@ -33,11 +43,10 @@ HTML_SMALL_PARAGRAPH_CLASS_NAME = "govuk-body-s"
 CONTENT_ROLE_RESPONSIBILITIES_PRECEDING_TEXT = "At this role level, you will"
 CONTENT_CIVIL_SERVICE_JOB_GRADES_PRECEDING_TEXT = "This role level is often performed at the"
 
-# Wait and timeout durations.
-IMPLICIT_WAIT = 5
 
-
-def run(ontology_model_dir_path, driver_path, ddat_base_url, base_working_dir):
+def run(ontology_model_dir_path, driver_path, ddat_base_url, base_working_dir,
+        transport=transport_factory.TRANSPORT_HTTP, transport_options=None, workers=1,
+        shared_session_manager=None, resume=False):
     """  Run this pipeline module.
 
     Args:
@@ -45,206 +54,466 @@ def run(ontology_model_dir_path, driver_path, ddat_base_url, base_working_dir):
         driver_path (string): Path to the web driver.
         ddat_base_url (string): Base URL to the DDaT profession capability framework website.
         base_working_dir (string): Path to the base working directory.
+        transport (string): Fetch/parse transport, either 'http' (browserless), 'async' (browserless
+            asynchronous crawl engine) or 'selenium' (fallback).
+        transport_options (dict): Transport configuration keyed by transport name (optional).
+        workers (int): Number of transport sessions used to crawl branches concurrently.
+        shared_session_manager (SessionManager): Session manager shared by the pipeline run (optional).
+            If not given, the transport sessions are opened and closed by this pipeline module.
+        resume (bool): Whether to resume from the branches completed by the previous run.
 
     """
 
     # Load the pre-defined branch classes from the ontology model.
-    class_branches = load_class_branches(ontology_model_dir_path)
+    class_branches = model_utils.load_model_repository(ontology_model_dir_path, base_working_dir).class_branches
+
+    # Open the per-branch checkpoints, resuming from the branches completed by the previous run if required.
+    checkpoint = checkpoint_utils.CrawlCheckpoint(
+        f'{base_working_dir}/{OUTPUT_CHECKPOINT_DIR_PATH}', Role, resume)
+
+    # Borrow the shared transport session, or open one for this pipeline module only.
+    with session_manager.borrow(
+            shared_session_manager, transport, driver_path, transport_options, base_working_dir) as manager:
+        driver = manager.driver
+
+        # Borrow a bounded pool of sessions, seeded with the driver instance, for concurrent branch crawling.
+        # The asynchronous crawl engine fetches all branches concurrently itself so does not need a pool.
+        if async_crawler.is_async_transport(driver):
+            workers = 1
+        roles_session_pool = manager.session_pool(workers)
+
+        # Prefetch all the branch resources concurrently (asynchronous crawl engine only).
+        if async_crawler.is_async_transport(driver):
+            logger.info('Fetching all branches...')
+            driver.prefetch([class_branch.url for class_branch in class_branches])
+
+        # Load the snapshot of previously parsed roles.
+        snapshot = snapshot_utils.load_snapshot(
+            f'{base_working_dir}/{OUTPUT_MANIFEST_FILE_PATH}', load_roles_from_file(base_working_dir),
+            key=lambda role: role.url, parser_version=PARSER_VERSION)
+
+        # Parse all the roles in the DDaT professional capability framework, never reusing the previously
+        # parsed roles of the branches with failures recorded by the previous run as a whole.
+        logger.info('Parsing all roles...')
+        roles = parse_all_roles(
+            driver, class_branches, roles_session_pool, snapshot, manager.wait_strategy, checkpoint,
+            checkpoint_utils.load_failed_keys(f'{base_working_dir}/{OUTPUT_FAILURE_REPORT_FILE_PATH}'))
+        logger.info('Parsing finished all roles.')
 
-    # Open a browser and return a web driver instance.
-    logger.debug('Creating a headless web driver instance...')
-    driver = open_browser(driver_path, ddat_base_url)
-    logger.debug('Successfully created a headless web driver instance.')
+    # Write the list of parsed Role objects, their manifest and the failure report to file
+    write_roles_to_file(roles, base_working_dir)
+    write_roles_manifest_to_file(roles, snapshot, base_working_dir)
+    write_roles_failure_report_to_file(checkpoint, base_working_dir)
 
-    try:
+    # Clear the checkpoints of the completed run, so that they are not reused by a later resumed run
+    checkpoint.clear()
 
-        # Parse all the roles in the DDaT professional capability framework.
-        logger.info('Parsing all roles...')
-        roles = parse_all_roles(driver, class_branches)
-        logger.info('Parsing finished all roles.')
 
-        # Write the list of parsed Role objects to file
-        write_roles_to_file(roles, base_working_dir)
+def parse_all_roles(driver, class_branches, roles_session_pool=None, snapshot=None, wait_strategy=None,
+                    checkpoint=None, failed_branch_ids=None):
+    """ Parse all DDaT roles.
 
-    finally:
+    Args:
+        driver: HttpTransport or Selenium driver instance.
+        class_branches (list): List of pre-defined branch class objects.
+        roles_session_pool (SessionPool): Pool of sessions with which to crawl branches concurrently (optional).
+        snapshot (IncrementalSnapshot): Snapshot of previously parsed roles to reuse for unchanged
+            branch resources and role segments (optional).
+        wait_strategy (WaitStrategy): Explicit wait strategy (optional, Selenium transport only).
+        checkpoint (CrawlCheckpoint): Per-branch checkpoints from which to resume completed branches and
+            in which to record failures, in which case failed roles and branches are skipped (optional).
+        failed_branch_ids (set): IDs of the branches with failures recorded by the previous run, whose
+            previously parsed roles are incomplete so are not reused as a whole (optional).
 
-        # Close the web driver instance.
-        logger.debug('Closing the web driver instance...')
-        close_driver(driver)
-        logger.debug('Successfully closed the web driver instance.')
+    Returns:
+        List of Role objects in the order of the pre-defined branch classes.
 
+    """
 
-def load_class_branches(ontology_model_dir_path):
-    """ Load the pre-defined branch classes from the ontology data model.
+    # Group the previously parsed roles by branch, leaving out the branches with failures.
+    previous_branch_roles = {}
+    for role in snapshot.previous_entities.values() if snapshot is not None else []:
+        if role.branch_id not in (failed_branch_ids or ()):
+            previous_branch_roles.setdefault(role.branch_id, []).append(role)
+
+    # Resume the branches completed by the previous run.
+    branch_roles = {}
+    if checkpoint is not None:
+        for class_branch in class_branches:
+            checkpointed_branch_roles = checkpoint.load(class_branch.id)
+            if checkpointed_branch_roles is not None:
+                branch_roles[class_branch.id] = checkpointed_branch_roles
+                for role in checkpointed_branch_roles if snapshot is not None else []:
+                    snapshot.keep(role.url)
+        if branch_roles:
+            logger.info(f'Resuming {len(branch_roles)} branches completed by the previous run.')
+    pending_class_branches = [class_branch for class_branch in class_branches if class_branch.id not in branch_roles]
+
+    # Iterate over all pending class branches, either sequentially with the given driver instance or
+    # concurrently across the session pool, merging the results in the branch class order.
+    if roles_session_pool is None or roles_session_pool.size <= 1:
+        pending_branch_roles = [parse_branch_roles(
+            driver, class_branch, snapshot, previous_branch_roles.get(class_branch.id), wait_strategy, checkpoint)
+            for class_branch in pending_class_branches]
+    else:
+        with ThreadPoolExecutor(max_workers=roles_session_pool.size) as executor:
+            pending_branch_roles = list(executor.map(
+                lambda class_branch: parse_pooled_branch_roles(
+                    roles_session_pool, class_branch, snapshot, previous_branch_roles.get(class_branch.id),
+                    wait_strategy, checkpoint),
+                pending_class_branches))
+    branch_roles.update(zip([class_branch.id for class_branch in pending_class_branches], pending_branch_roles))
+
+    return [role for class_branch in class_branches for role in branch_roles[class_branch.id]]
+
+
+def parse_pooled_branch_roles(roles_session_pool, class_branch, snapshot=None, previous_branch_roles=None,
+                              wait_strategy=None, checkpoint=None):
+    """ Parse the DDaT roles of a branch using a session borrowed from a session pool.
 
     Args:
-        ontology_model_dir_path (string): Path to the directory holding the pre-defined ontology data model.
+        roles_session_pool (SessionPool): Pool of sessions.
+        class_branch: Pre-defined branch class object.
+        snapshot (IncrementalSnapshot): Snapshot of previously parsed roles (optional).
+        previous_branch_roles (list): Previously parsed Role objects of this branch (optional).
+        wait_strategy (WaitStrategy): Explicit wait strategy (optional, Selenium transport only).
+        checkpoint (CrawlCheckpoint): Per-branch checkpoints (optional).
 
     Returns:
-        List of branch class objects.
+        List of Role objects
 
     """
 
-    with open(f'{ontology_model_dir_path}/{INPUT_MODEL_CLASS_BRANCHES_FILE_NAME}', 'r') as f:
-        class_branches = json.load(f, object_hook=lambda d: SimpleNamespace(**d))
-    return class_branches
+    with roles_session_pool.session() as driver:
+        return parse_branch_roles(driver, class_branch, snapshot, previous_branch_roles, wait_strategy, checkpoint)
 
 
-def open_browser(driver_path, ddat_base_url):
-    """ Open a browser and return a Selenium driver instance.
+def parse_branch_roles(driver, class_branch, snapshot=None, previous_branch_roles=None, wait_strategy=None,
+                       checkpoint=None):
+    """ Parse the DDaT roles of a branch and, if checkpointing, write the checkpoint of the branch
+    once completed, or otherwise record the failure of the branch and skip it so that the crawl continues.
 
     Args:
-        driver_path (string): Path to the web driver.
-        ddat_base_url (string): Base URL to the DDaT profession capability framework website.
+        driver: HttpTransport or Selenium driver instance.
+        class_branch: Pre-defined branch class object.
+        snapshot (IncrementalSnapshot): Snapshot of previously parsed roles (optional).
+        previous_branch_roles (list): Previously parsed Role objects of this branch (optional).
+        wait_strategy (WaitStrategy): Explicit wait strategy (optional, Selenium transport only).
+        checkpoint (CrawlCheckpoint): Per-branch checkpoints (optional).
 
     Returns:
-        Selenium driver instance.
+        List of Role objects
 
     """
 
-    chrome_options = Options()
-    chrome_options.add_argument('--headless')
-    driver = webdriver.Chrome(driver_path, chrome_options=chrome_options)
-    driver.implicitly_wait(IMPLICIT_WAIT)
-    driver.get(f'{ddat_base_url}')
-    return driver
+    if checkpoint is None:
+        return fetch_branch_roles(driver, class_branch, snapshot, previous_branch_roles, wait_strategy)
+    try:
+        branch_roles = fetch_branch_roles(driver, class_branch, snapshot, previous_branch_roles, wait_strategy,
+                                          checkpoint)
+    except Exception as e:
+        logger.error(f'Failed to parse the roles of the {class_branch.id} branch: {repr(e)}')
+        checkpoint.record_failure(class_branch.id, class_branch.url, e)
+        if snapshot is not None:
+            snapshot.forget_source(class_branch.url)
+        return []
+
+    # Branches with roles that failed to parse are not checkpointed so that they are retried on resume,
+    # nor reused as a whole by the next run
+    if not checkpoint.has_failures(class_branch.id):
+        checkpoint.save(class_branch.id, branch_roles)
+    elif snapshot is not None:
+        snapshot.forget_source(class_branch.url)
+    return branch_roles
+
+
+def fetch_branch_roles(driver, class_branch, snapshot=None, previous_branch_roles=None, wait_strategy=None,
+                       checkpoint=None):
+    """ Navigate to a branch resource and parse its DDaT roles, reusing the previously
+    parsed roles of this branch if the branch resource has not changed since the last run.
 
+    Args:
+        driver: HttpTransport or Selenium driver instance.
+        class_branch: Pre-defined branch class object.
+        snapshot (IncrementalSnapshot): Snapshot of previously parsed roles (optional).
+        previous_branch_roles (list): Previously parsed Role objects of this branch (optional).
+        wait_strategy (WaitStrategy): Explicit wait strategy (optional, Selenium transport only).
+        checkpoint (CrawlCheckpoint): Per-branch checkpoints in which to record role failures (optional).
 
-def parse_all_roles(driver, class_branches):
-    """ Parse all DDaT skills.
+    Returns:
+        List of Role objects
+
+    """
+
+    # Navigate to the branch resource and wait for it to be ready
+    logger.debug(f'Parsing the roles of the {class_branch.id} branch...')
+    driver.get(f'{class_branch.url}')
+    if not http_transport.is_http_transport(driver):
+        (wait_strategy or selenium_waits.WaitStrategy()).wait_for_page_ready(driver)
+    # Record the branch resource the roles are parsed from, and reuse the previously parsed roles if the
+    # branch resource is unchanged since both the last fetch and the previously parsed roles were parsed
+    # from it (it may have been fetched by a run that failed before writing its roles).
+    source_unchanged = snapshot is not None and http_transport.is_http_transport(driver) and \
+        snapshot.record_source(class_branch.url, driver.page_source)
+    if previous_branch_roles is not None and http_transport.is_page_not_modified(driver) and source_unchanged:
+        logger.debug(f'Branch {class_branch.id} not modified, reusing the previously parsed roles.')
+        for role in previous_branch_roles:
+            snapshot.keep(role.url)
+        return previous_branch_roles
+
+    # Capture the branch resource once and parse the list of roles associated with this branch
+    return parse_branch_roles_from_tree(get_page_tree(driver), class_branch, snapshot, checkpoint)
+
+
+def get_page_tree(driver):
+    """ Get the parsed HTML tree of the current page, capturing the page source in a single
+    round-trip when using the Selenium transport.
 
     Args:
-        driver: Selenium driver instance.
-        class_branches (list): List of pre-defined branch class objects.
+        driver: HttpTransport or Selenium driver instance.
+
+    Returns:
+        Root lxml HTML element of the current page.
+
+    """
+
+    if http_transport.is_http_transport(driver):
+        return driver.tree
+    return html_parser_utils.parse_html(driver.page_source, driver.current_url)
+
+
+def segment_roles(tree):
+    """ Split a branch resource into per-role segments in a single pass over the siblings
+    of the role level headers, where each segment holds the elements between a role level
+    header and the next role level header.
+
+    Args:
+        tree: Root lxml HTML element of the branch resource.
+
+    Returns:
+        Dictionary of role segments keyed by role level header anchor ID.
+
+    """
+
+    segments = {}
+    role_heading_xpath = f'//h3[{html_parser_utils.xpath_has_class(HTML_ROLE_LEVEL_HEADER_CLASS_NAME)}]'
+    role_heading_parent_elems = {elem.getparent() for elem in tree.xpath(role_heading_xpath)}
+    for role_heading_parent_elem in role_heading_parent_elems:
+        segment = None
+        for elem in role_heading_parent_elem.iterchildren(tag=lxml.etree.Element):
+            elem_classes = elem.get('class', '').split()
+
+            # Start a new segment at each role level header
+            if elem.tag == 'h3' and HTML_ROLE_LEVEL_HEADER_CLASS_NAME in elem_classes:
+                segment = {'heading': elem, 'elems': [elem], 'paragraphs': [], 'uls': [], 'table': None}
+                segments[elem.get('id')] = segment
+                continue
+
+            # Assign the paragraphs, unordered lists and skills table to the current segment
+            if segment is None:
+                continue
+            segment['elems'].append(elem)
+            if elem.tag == 'p' and HTML_SMALL_PARAGRAPH_CLASS_NAME not in elem_classes:
+                segment['paragraphs'].append(elem)
+            elif elem.tag == 'ul' and HTML_CHANGELOG_UL_CLASS_NAME not in elem_classes:
+                segment['uls'].append(elem)
+            elif elem.tag == 'table' and segment['table'] is None:
+                segment['table'] = elem
+
+    return segments
+
+
+def parse_branch_roles_from_tree(tree, class_branch, snapshot=None, checkpoint=None):
+    """ Parse the DDaT roles of a branch from the parsed HTML tree of the branch resource.
+
+    Args:
+        tree: Root lxml HTML element of the branch resource.
+        class_branch: Pre-defined branch class object.
+        snapshot (IncrementalSnapshot): Snapshot of previously parsed roles to reuse for unchanged
+            role segments (optional).
+        checkpoint (CrawlCheckpoint): Per-branch checkpoints in which to record role failures, in which
+            case roles that fail to parse are skipped (optional).
 
     Returns:
         List of Role objects
 
     """
 
-    # Iterate over all class branches
     roles = []
-    for class_branch in class_branches:
-
-        # Navigate to the branch resource
-        driver.get(f'{class_branch.url}')
-
-        # Parse the list of roles associated with this branch
-        role_link_elems = driver.find_elements(By.CSS_SELECTOR, SELECTOR_ROLE_LINKS)
-        number_roles = len(role_link_elems)
-        number_roles_processed = 0
-        for role_link_elem in role_link_elems:
-
-            # Get the role URL
-            role_url = role_link_elem.get_attribute('href')
-
-            # Extract the anchor ID from the URL
-            role_url_anchor_id = role_url.split("#")[1]
-
-            # Locate the role level header with the anchor ID
-            role_heading_css_selector = f'h3#{role_url_anchor_id}.{HTML_ROLE_LEVEL_HEADER_CLASS_NAME}'
-            role_heading_elem = driver.find_element(By.CSS_SELECTOR, role_heading_css_selector)
-
-            # Get the role name and clean (remove the initial number and period prefix, and title)
-            role_name = string_utils.remove_ordered_list_prefix(role_heading_elem.text).title()
-
-            # Locate all paragraphs that are siblings (i.e. excluding those in the skills table) of the
-            # role level header which are between the current role level header and the next role level header.
-            role_paragraph_sibling_elems = driver.find_elements(
-                By.XPATH, f'//p[preceding-sibling::h3[@id="{role_url_anchor_id}"] '
-                          f'and count(following-sibling::h3)={number_roles - (number_roles_processed + 1)} '
-                          f'and not(contains(@class, "{HTML_SMALL_PARAGRAPH_CLASS_NAME}"))]')
-
-            # Get the role description (as the 1st paragraph after the role level header).
-            # Note that even if the role description is missing on the webpage,
-            # an empty <p class="govuk-body"></p> is still rendered as part of the DOM.
-            # This means that role_description will be an empty string object in this case.
-            role_description = role_paragraph_sibling_elems[0].text
-
-            # Locate all the unordered lists that are siblings (i.e. excluding those in the skills table) of the
-            # role level header which are between the current role level header and the next role level header.
-            role_ul_sibling_elems = driver.find_elements(
-                By.XPATH, f'//ul[preceding-sibling::h3[@id="{role_url_anchor_id}"] '
-                          f'and count(following-sibling::h3)={number_roles - (number_roles_processed + 1)} '
-                          f'and not(contains(@class, "{HTML_CHANGELOG_UL_CLASS_NAME}"))]')
-            number_ul_siblings = len(role_ul_sibling_elems)
-
-            # If there are two unordered list siblings, then both the list of responsibilities
-            # and list of civil service job grades are available for this role.
-            role_responsibilities = []
-            role_civil_service_job_grades = []
-            if number_ul_siblings == 2:
-
-                # Get the list of role responsibilities (as the 1st unordered list)
-                role_responsibilities = html_parser_utils.ul_to_list(role_ul_sibling_elems[0])
-
-                # Get the list of civil service job grades (as the 2nd unordered list)
-                role_civil_service_job_grades = html_parser_utils.ul_to_list(role_ul_sibling_elems[1])
-
-            # If there is only one unordered list, then determine whether it is the list of role responsibilities
-            # or the list of civil service job grades by examining the contents of the paragraphs parsed earlier.
-            elif number_ul_siblings == 1:
-                for role_paragraph_sibling_elem in role_paragraph_sibling_elems:
-
-                    # Get the list of role responsibilities (as the 1st and only unordered list)
-                    if CONTENT_ROLE_RESPONSIBILITIES_PRECEDING_TEXT in role_paragraph_sibling_elem.text:
-                        role_responsibilities = html_parser_utils.ul_to_list(role_ul_sibling_elems[0])
-                        break
-
-                    # Get the list of civil service job grades (as the 1st and only unordered list)
-                    elif CONTENT_CIVIL_SERVICE_JOB_GRADES_PRECEDING_TEXT in role_paragraph_sibling_elem.text:
-                        role_civil_service_job_grades = html_parser_utils.ul_to_list(role_ul_sibling_elems[0])
-                        break
-
-            # Locate the skills table and its rows of skills
-            role_skill_table_css_selector = f'{role_heading_css_selector} ~ table'
-            role_skill_table_elem = driver.find_element(By.CSS_SELECTOR, role_skill_table_css_selector)
-            role_skill_table_th_css_selector = f'tbody > tr > th'
-            role_skill_table_th_elems = role_skill_table_elem.find_elements(
-                By.CSS_SELECTOR, role_skill_table_th_css_selector)
-
-            # Get the dictionary of skills
-            role_skills = {}
-            for role_skill_table_th_elem in role_skill_table_th_elems:
-                role_skill_table_th_p_elems = role_skill_table_th_elem.find_elements(By.TAG_NAME, 'p')
-                role_skill_name_link_elem = role_skill_table_th_p_elems[0].find_element(By.TAG_NAME, 'a')
-                role_skill_name = role_skill_name_link_elem.text
-                role_skill_iri_id = string_utils.pascal_case(role_skill_name)
-                role_skill_level = role_skill_table_th_p_elems[1].text
-                role_skills[role_skill_iri_id] = string_utils.clean_skill_level(role_skill_level)
-
-            # Create a Role object for this role
-            role = Role(
-                name=role_name,
-                branch_id=class_branch.id,
-                description=role_description,
-                url=role_url,
-                responsibilities=role_responsibilities,
-                civil_service_job_grades=role_civil_service_job_grades)
-            role.set_skills(role_skills)
-
-            # Add this new Role object to the list of Roles
-            roles.append(role)
-
-            # Increment the number of roles processed counter
-            number_roles_processed += 1
+    role_segments = segment_roles(tree)
+    for role_link_elem in tree.xpath(XPATH_ROLE_LINKS):
+
+        # Get the role URL (made absolute when the page was parsed) and extract the anchor ID
+        role_url = role_link_elem.get('href')
+        role_url_anchor_id = role_url.split("#")[1]
+
+        try:
+
+            # Reuse the previously parsed role if its segment content is unchanged
+            role_segment = role_segments[role_url_anchor_id]
+            if snapshot is not None:
+                role = snapshot.reuse(role_url, snapshot_utils.content_hash(
+                    class_branch.id + html_parser_utils.elements_to_string(role_segment['elems'])))
+                if role is not None:
+                    roles.append(role)
+                    continue
+
+            # Create a Role object for this role from its segment
+            roles.append(parse_role_segment(role_segment, role_url, class_branch))
+
+        except Exception as e:
+            if checkpoint is None:
+                raise
+            logger.error(f'Failed to parse the role {role_url}: {repr(e)}')
+            checkpoint.record_failure(class_branch.id, role_url, e)
 
     return roles
 
 
-def write_roles_to_file(roles, base_working_dir):
-    """  Write the list of parsed Role objects to file.
+def parse_role_segment(role_segment, role_url, class_branch):
+    """ Parse a DDaT role from its segment of the branch resource.
+
+    Args:
+        role_segment (dict): Role segment as generated by segment_roles.
+        role_url (string): Role URL including anchor ID.
+        class_branch: Pre-defined branch class object.
+
+    Returns:
+        Role object
+
+    """
+
+    # Get the role name and clean (remove the initial number and period prefix, and title)
+    role_name = string_utils.remove_ordered_list_prefix(
+        html_parser_utils.element_text(role_segment['heading'])).title()
+
+    # Get the role description (as the 1st paragraph after the role level header).
+    # Note that even if the role description is missing on the webpage,
+    # an empty <p class="govuk-body"></p> is still rendered as part of the DOM.
+    # This means that role_description will be an empty string object in this case.
+    role_paragraph_texts = [html_parser_utils.element_text(elem) for elem in role_segment['paragraphs']]
+    role_description = role_paragraph_texts[0]
+
+    # Get the list of role responsibilities and the list of civil service job grades
+    role_ul_lists = [html_parser_utils.tree_ul_to_list(elem) for elem in role_segment['uls']]
+    role_responsibilities, role_civil_service_job_grades = classify_role_lists(
+        role_paragraph_texts, role_ul_lists)
+
+    # Get the dictionary of skills from the skills table
+    role_skills = {}
+    if role_segment['table'] is not None:
+        for role_skill_table_th_elem in role_segment['table'].xpath('.//tbody/tr/th'):
+            role_skill_table_th_p_elems = role_skill_table_th_elem.xpath('.//p')
+            role_skill_name = html_parser_utils.element_text(role_skill_table_th_p_elems[0].xpath('.//a')[0])
+            role_skill_level = html_parser_utils.element_text(role_skill_table_th_p_elems[1])
+            role_skills[string_utils.pascal_case(role_skill_name)] = string_utils.clean_skill_level(role_skill_level)
+
+    # Create a Role object for this role
+    role = Role(
+        name=role_name,
+        branch_id=class_branch.id,
+        description=role_description,
+        url=role_url,
+        responsibilities=role_responsibilities,
+        civil_service_job_grades=role_civil_service_job_grades)
+    role.set_skills(role_skills)
+    return role
+
+
+def classify_role_lists(role_paragraph_texts, role_ul_lists):
+    """ Determine which of the unordered lists following a role level header hold the
+    role responsibilities and which hold the civil service job grades.
+
+    Args:
+        role_paragraph_texts (list): Text of the paragraphs following the role level header.
+        role_ul_lists (list): Contents of the unordered lists following the role level header.
+
+    Returns:
+        Tuple of the list of role responsibilities and the list of civil service job grades.
+
+    """
+
+    # If there are two unordered lists, then both the list of responsibilities
+    # and list of civil service job grades are available for this role.
+    role_responsibilities = []
+    role_civil_service_job_grades = []
+    if len(role_ul_lists) == 2:
+        role_responsibilities = role_ul_lists[0]
+        role_civil_service_job_grades = role_ul_lists[1]
+
+    # If there is only one unordered list, then determine whether it is the list of role responsibilities
+    # or the list of civil service job grades by examining the contents of the paragraphs.
+    elif len(role_ul_lists) == 1:
+        for role_paragraph_text in role_paragraph_texts:
+            if CONTENT_ROLE_RESPONSIBILITIES_PRECEDING_TEXT in role_paragraph_text:
+                role_responsibilities = role_ul_lists[0]
+                break
+            elif CONTENT_CIVIL_SERVICE_JOB_GRADES_PRECEDING_TEXT in role_paragraph_text:
+                role_civil_service_job_grades = role_ul_lists[0]
+                break
+
+    return role_responsibilities, role_civil_service_job_grades
+
+
+def load_roles_from_file(base_working_dir):
+    """ Load the list of previously parsed Role objects from file, if any.
+
+    Args:
+        base_working_dir (string): Path to the base working directory.
+
+    Returns:
+        List of previously parsed Role objects, or None if there are none.
+
+    """
+
+    return artifact_utils.load_entities(f'{base_working_dir}/{OUTPUT_ARTIFACT_FILE_PATH}', Role)
+
+
+def write_roles_manifest_to_file(roles, snapshot, base_working_dir):
+    """  Write the manifest of parsed Role objects, recording the roles added, changed
+    and removed since the previous snapshot, to file.
 
     Args:
         roles (list): List of parsed Role objects.
+        snapshot (IncrementalSnapshot): Snapshot of previously parsed roles.
+        base_working_dir (string): Path to the base working directory.
+
+    """
+
+    manifest, changes = snapshot.generate_manifest({role.url: role for role in roles})
+    snapshot_utils.write_manifest(
+        f'{base_working_dir}/{OUTPUT_MANIFEST_FILE_PATH}', manifest, changes, snapshot.sources,
+        snapshot.parser_version)
+    logger.info(f'Roles added: {len(changes[snapshot_utils.CHANGE_ADDED])}, '
+                f'changed: {len(changes[snapshot_utils.CHANGE_CHANGED])}, '
+                f'removed: {len(changes[snapshot_utils.CHANGE_REMOVED])}.')
+
+
+def write_roles_failure_report_to_file(checkpoint, base_working_dir):
+    """  Write the report of the roles and branches that failed to parse to file.
+
+    Args:
+        checkpoint (CrawlCheckpoint): Per-branch checkpoints holding the failures recorded.
         base_working_dir (string): Path to the base working directory.
 
     """
 
-    with open(f'{base_working_dir}/{OUTPUT_FILE_PATH}', 'wb') as f:
-        pickle.dump(roles, f)
+    checkpoint.write_failure_report(f'{base_working_dir}/{OUTPUT_FAILURE_REPORT_FILE_PATH}')
+    if checkpoint.failures:
+        logger.warning(f'Roles failed: {len(checkpoint.failures)}. '
+                       f'Please consult {OUTPUT_FAILURE_REPORT_FILE_PATH} for further information.')
+
+
+def write_roles_to_file(roles, base_working_dir):
+    """  Write the list of parsed Role objects to the roles artifact as one block per branch.
+
+    Args:
+        roles (list): List of parsed Role objects.
+        base_working_dir (string): Path to the base working directory.
+
+    """
 
+    artifact_utils.write_artifact(
+        f'{base_working_dir}/{OUTPUT_ARTIFACT_FILE_PATH}', Role,
+        artifact_utils.group(roles, key=lambda role: role.branch_id))
 
-def close_driver(driver):
-    """ Close a Selenium driver instance. """
-    driver.quit()
@@ -1,18 +1,30 @@
 """ Skills parser pipeline module. """
 
-import pickle
+import ddat.transports.http_transport as http_transport
+import ddat.transports.selenium_waits as selenium_waits
+import ddat.transports.session_manager as session_manager
+import ddat.transports.transport_factory as transport_factory
+import ddat.utils.artifact_utils as artifact_utils
+import ddat.utils.html_parser_utils as html_parser_utils
+import ddat.utils.snapshot_utils as snapshot_utils
 
 from ddat.classes.skill import Skill
 from ddat.config.logging_config import logger
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 
 # Module name.
 MODULE_NAME = 'Skills Parser'
 
-# Output file relative path and name.
-OUTPUT_FILE_PATH = 'parsed/skills.pkl'
+# Output artifact and file relative paths and names.
+OUTPUT_ARTIFACT_FILE_PATH = 'parsed/skills.artifact'
+OUTPUT_MANIFEST_FILE_PATH = 'parsed/skills_manifest.json'
+
+# Parser version. Increment whenever the parser changes how skills are parsed so that the
+# skills parsed by previous runs are re-parsed rather than reused.
+PARSER_VERSION = '1'
+
+# Maximum number of skills per output artifact block.
+OUTPUT_BLOCK_SIZE = 50
 
 # CSS selectors.
 SELECTOR_SKILLS_RESOURCE_HEADING = "h1.govuk-heading-xl"
@@ -23,12 +35,25 @@ SELECTOR_SKILL_LEVEL_TABLE = "table.govuk-table"
 SELECTOR_SKILL_LEVEL_TABLE_BODY = "tbody.govuk-table__body"
 SELECTOR_SKILL_LEVEL_TABLE_BODY_ROW = "tr.govuk-table__row:nth-child(2n+1)"
 SELECTOR_SKILL_LEVEL_TABLE_BODY_ROW_CELL = "td.govuk-table__cell"
-
-# Wait and timeout durations.
-IMPLICIT_WAIT = 5
-
-
-def run(driver_path, ddat_base_url, ddat_skills_resource, base_working_dir):
+# Selector names used to look up the configured explicit wait timeouts (Selenium transport).
+WAIT_SKILLS_SHOW_ALL_SECTIONS_BUTTON = 'skills_show_all_sections_button'
+WAIT_SKILLS_ACCORDION_SECTIONS = 'skills_accordion_sections'
+
+# XPath expressions (browserless HTTP transports, and bulk extraction from the Selenium page source).
+# Accordion sections are only marked as expanded client-side, so all sections are selected.
+XPATH_SKILLS_ACCORDION_SECTIONS = f'//div[{html_parser_utils.xpath_has_class("govuk-accordion__section")}]'
+XPATH_SKILL_NAME = f'.//*[{html_parser_utils.xpath_has_class("govuk-accordion__section-header")}]//*[@id]'
+XPATH_SKILL_CONTENT_SECTION = f'.//div[{html_parser_utils.xpath_has_class("govuk-accordion__section-content")}]'
+XPATH_SKILL_LEVEL_TABLE_BODY_ROWS = (
+    f'.//table[{html_parser_utils.xpath_has_class("govuk-table")}]'
+    f'//tbody[{html_parser_utils.xpath_has_class("govuk-table__body")}]'
+    f'/*[position() mod 2 = 1][self::tr and {html_parser_utils.xpath_has_class("govuk-table__row")}]')
+XPATH_SKILL_LEVEL_TABLE_BODY_ROW_CELLS = f'./td[{html_parser_utils.xpath_has_class("govuk-table__cell")}]'
+
+
+def run(driver_path, ddat_base_url, ddat_skills_resource, base_working_dir,
+        transport=transport_factory.TRANSPORT_HTTP, transport_options=None, bulk_extraction=True,
+        shared_session_manager=None):
     """  Run this pipeline module. 
     
     Args:
@@ -36,67 +61,179 @@ def run(driver_path, ddat_base_url, ddat_skills_resource, base_working_dir):
         ddat_base_url (string): Base URL to the DDaT profession capability framework website.
         ddat_skills_resource (string): Relative URL to the DDaT skills resource.
         base_working_dir (string): Path to the base working directory.
+        transport (string): Fetch/parse transport, either 'http' (browserless), 'async' (browserless
+            asynchronous crawl engine) or 'selenium' (fallback).
+        transport_options (dict): Transport configuration keyed by transport name (optional).
+        bulk_extraction (bool): Whether to extract all skills from the page source, fetched in a single round-trip,
+            rather than by web element lookups (Selenium transport only).
+        shared_session_manager (SessionManager): Session manager shared by the pipeline run (optional).
+            If not given, the transport session is opened and closed by this pipeline module.
     
     """
     
-    # Open a browser and return a web driver instance.
-    logger.debug('Creating a headless web driver instance...')
-    driver = open_browser(driver_path, ddat_base_url, ddat_skills_resource)
-    logger.debug('Successfully created a headless web driver instance.')
-    
-    try:
-        
-        # Parse all the skills in the DDaT professional capability framework.
-        logger.info('Parsing all skills...')
-        skills = parse_all_skills(driver)
-        logger.info('Parsing finished all skills.')
-
-        # Write the list of parsed Skill objects to file
-        write_skills_to_file(skills, base_working_dir)
-        
-    finally:
-        
-        # Close the web driver instance.
-        logger.debug('Closing the web driver instance...')
-        close_driver(driver)
-        logger.debug('Successfully closed the web driver instance.')
-
-
-def open_browser(driver_path, ddat_base_url, ddat_skills_resource):
-    """ Open a browser and return a Selenium driver instance.
-    
+    # Borrow the shared transport session, or open one for this pipeline module only.
+    with session_manager.borrow(
+            shared_session_manager, transport, driver_path, transport_options, base_working_dir) as manager:
+        driver = manager.driver
+
+        # Navigate to the skills resource and wait for it to be ready.
+        skills_resource_url = f'{ddat_base_url}/{ddat_skills_resource}'
+        driver.get(skills_resource_url)
+        if not http_transport.is_http_transport(driver):
+            manager.wait_strategy.wait_for_page_ready(driver)
+
+        # Load the snapshot of previously parsed skills.
+        previous_skills = load_skills_from_file(base_working_dir)
+        snapshot = snapshot_utils.load_snapshot(
+            f'{base_working_dir}/{OUTPUT_MANIFEST_FILE_PATH}', previous_skills, key=lambda skill: skill.anchor_id,
+            parser_version=PARSER_VERSION)
+
+        # Parse all the skills in the DDaT professional capability framework, reusing the
+        # previously parsed skills if the skills resource has not changed since the last run
+        # and is the page they were parsed from (it may have been fetched by a run that failed
+        # before writing its skills), or otherwise the previously parsed skills whose accordion
+        # sections have not changed.
+        if previous_skills is not None and http_transport.is_page_not_modified(driver) and \
+                snapshot.record_source(skills_resource_url, driver.page_source):
+            logger.info('Skills resource not modified, reusing the previously parsed skills.')
+            skills = previous_skills
+            for skill in skills:
+                snapshot.keep(skill.anchor_id)
+        else:
+            if http_transport.is_http_transport(driver):
+                snapshot.record_source(skills_resource_url, driver.page_source)
+            logger.info('Parsing all skills...')
+            skills = parse_all_skills(driver, bulk_extraction, snapshot, manager.wait_strategy)
+            logger.info('Parsing finished all skills.')
+
+    # Write the list of parsed Skill objects and their manifest to file
+    write_skills_to_file(skills, base_working_dir)
+    write_skills_manifest_to_file(skills, snapshot, base_working_dir)
+
+
+def parse_all_skills(driver, bulk_extraction=True, snapshot=None, wait_strategy=None):
+    """ Parse all DDaT skills.
+
     Args:
-        driver_path (string): Path to the web driver.
-        ddat_base_url (string): Base URL to the DDaT profession capability framework website.
-        ddat_skills_resource (string): Relative URL to the DDaT skills resource.
-        
+        driver: HttpTransport or Selenium driver instance.
+        bulk_extraction (bool): Whether to extract all skills from the page source, fetched in a single round-trip,
+            rather than by web element lookups (Selenium transport only).
+        snapshot (IncrementalSnapshot): Snapshot of previously parsed skills to reuse for unchanged
+            accordion sections (optional, HTTP transports only).
+        wait_strategy (WaitStrategy): Explicit wait strategy (optional, Selenium transport only).
+
     Returns:
-        Selenium driver instance.
-    
+        List of Skill objects
+
     """
-    
-    chrome_options = Options()
-    chrome_options.add_argument('--headless')
-    driver = webdriver.Chrome(driver_path, chrome_options=chrome_options)
-    driver.implicitly_wait(IMPLICIT_WAIT)
-    driver.get(f'{ddat_base_url}/{ddat_skills_resource}')
-    return driver
 
+    if http_transport.is_http_transport(driver):
+        return parse_all_skills_from_tree(driver.tree, snapshot)
+    show_all_skill_sections(driver, wait_strategy or selenium_waits.WaitStrategy())
+    if bulk_extraction:
+        return parse_all_skills_from_page_source(driver)
+    return parse_all_skills_from_browser(driver)
 
-def parse_all_skills(driver):
-    """ Parse all DDaT skills.
+
+def show_all_skill_sections(driver, wait_strategy):
+    """ Press the 'Show all sections' button and wait for the expanded skill accordion sections (Selenium transport).
 
     Args:
         driver: Selenium driver instance.
+        wait_strategy (WaitStrategy): Explicit wait strategy.
+
+    """
+
+    show_all_sections_button_elem = wait_strategy.wait_for_element(
+        driver, WAIT_SKILLS_SHOW_ALL_SECTIONS_BUTTON, SELECTOR_SKILLS_SHOW_ALL_SECTIONS_BUTTON, clickable=True)
+    show_all_sections_button_elem.click()
+    wait_strategy.wait_for_element(driver, WAIT_SKILLS_ACCORDION_SECTIONS, SELECTOR_SKILLS_ACCORDION_SECTIONS)
+
+
+def parse_all_skills_from_tree(tree, snapshot=None):
+    """ Parse all DDaT skills from the parsed HTML tree of the skills resource.
+
+    Args:
+        tree: Root lxml HTML element of the skills resource.
+        snapshot (IncrementalSnapshot): Snapshot of previously parsed skills to reuse for unchanged
+            accordion sections (optional).
 
     Returns:
         List of Skill objects
 
     """
 
-    # Press the 'Show all sections' button and wait
-    show_all_sections_button_elem = driver.find_element(By.CSS_SELECTOR, SELECTOR_SKILLS_SHOW_ALL_SECTIONS_BUTTON)
-    show_all_sections_button_elem.click()
+    # Iterate over all skill accordion sections and create corresponding Skill objects
+    skills = []
+    for skill_section_elem in tree.xpath(XPATH_SKILLS_ACCORDION_SECTIONS):
+
+        # Parse the skill name element
+        skill_name_elem = skill_section_elem.xpath(XPATH_SKILL_NAME)[0]
+
+        # Reuse the previously parsed skill if its accordion section content is unchanged
+        if snapshot is not None:
+            skill = snapshot.reuse(
+                skill_name_elem.get('id'),
+                snapshot_utils.content_hash(html_parser_utils.elements_to_string([skill_section_elem])))
+            if skill is not None:
+                skills.append(skill)
+                continue
+
+        # Parse the skill description
+        skill_content_elem = skill_section_elem.xpath(XPATH_SKILL_CONTENT_SECTION)[0]
+        skill_description_elem = skill_content_elem.xpath('.//p')[0]
+
+        # Parse the skill levels
+        skill_levels = {}
+        for skill_table_body_row_elem in skill_content_elem.xpath(XPATH_SKILL_LEVEL_TABLE_BODY_ROWS):
+            skill_table_body_row_cell_elems = skill_table_body_row_elem.xpath(XPATH_SKILL_LEVEL_TABLE_BODY_ROW_CELLS)
+
+            # Parse the skill level and its capabilities for the current row
+            skill_level_elem = skill_table_body_row_cell_elems[0].xpath('.//p')[0]
+            skill_level_capabilities = [html_parser_utils.element_text(skill_level_capability_elem)
+                                        for skill_level_capability_elem
+                                        in skill_table_body_row_cell_elems[1].iter('li')]
+
+            # Insert this skill level <> capability mapping into the skill levels dictionary
+            skill_levels[html_parser_utils.element_text(skill_level_elem)] = skill_level_capabilities
+
+        # Create a Skill object for this skill
+        skills.append(Skill(
+            anchor_id=skill_name_elem.get('id'),
+            name=html_parser_utils.element_text(skill_name_elem),
+            description=html_parser_utils.element_text(skill_description_elem),
+            skill_levels=skill_levels))
+
+    return skills
+
+
+def parse_all_skills_from_page_source(driver):
+    """ Parse all DDaT skills from the page source of the skills resource, fetched in a single WebDriver
+    round-trip (Selenium transport) once all the skill accordion sections are shown. The skills are parsed
+    from the page source in the same way as by the browserless transports.
+
+    Args:
+        driver: Selenium driver instance.
+
+    Returns:
+        List of Skill objects
+
+    """
+
+    return parse_all_skills_from_tree(html_parser_utils.parse_html(driver.page_source, driver.current_url))
+
+
+def parse_all_skills_from_browser(driver):
+    """ Parse all DDaT skills using Selenium web element lookups (fallback transport),
+    once all the skill accordion sections are shown.
+
+    Args:
+        driver: Selenium driver instance.
+
+    Returns:
+        List of Skill objects
+
+    """
 
     # Iterate over all skill accordion sections and create corresponding Skill objects
     skills = []
@@ -147,19 +284,49 @@ def parse_all_skills(driver):
     return skills
 
 
-def write_skills_to_file(skills, base_working_dir):
-    """  Write the list of parsed Skill objects to file.
+def load_skills_from_file(base_working_dir):
+    """ Load the list of previously parsed Skill objects from file, if any.
+
+    Args:
+        base_working_dir (string): Path to the base working directory.
+
+    Returns:
+        List of previously parsed Skill objects, or None if there are none.
+
+    """
+
+    return artifact_utils.load_entities(f'{base_working_dir}/{OUTPUT_ARTIFACT_FILE_PATH}', Skill)
+
+
+def write_skills_manifest_to_file(skills, snapshot, base_working_dir):
+    """  Write the manifest of parsed Skill objects, recording the skills added, changed
+    and removed since the previous snapshot, to file.
 
     Args:
         skills (list): List of parsed Skill objects.
+        snapshot (IncrementalSnapshot): Snapshot of previously parsed skills.
         base_working_dir (string): Path to the base working directory.
 
     """
 
-    with open(f'{base_working_dir}/{OUTPUT_FILE_PATH}', 'wb') as f:
-        pickle.dump(skills, f)
+    manifest, changes = snapshot.generate_manifest({skill.anchor_id: skill for skill in skills})
+    snapshot_utils.write_manifest(
+        f'{base_working_dir}/{OUTPUT_MANIFEST_FILE_PATH}', manifest, changes, snapshot.sources,
+        snapshot.parser_version)
+    logger.info(f'Skills added: {len(changes[snapshot_utils.CHANGE_ADDED])}, '
+                f'changed: {len(changes[snapshot_utils.CHANGE_CHANGED])}, '
+                f'removed: {len(changes[snapshot_utils.CHANGE_REMOVED])}.')
+
+
+def write_skills_to_file(skills, base_working_dir):
+    """  Write the list of parsed Skill objects to the skills artifact as fixed-size blocks.
+
+    Args:
+        skills (list): List of parsed Skill objects.
+        base_working_dir (string): Path to the base working directory.
+
+    """
 
+    artifact_utils.write_artifact(
+        f'{base_working_dir}/{OUTPUT_ARTIFACT_FILE_PATH}', Skill, artifact_utils.chunk(skills, OUTPUT_BLOCK_SIZE))
 
-def close_driver(driver):
-    """ Close a Selenium driver instance. """
-    driver.quit()
@@ -3,7 +3,8 @@
 import os
 
 MODULE_NAME = 'Setup'
-required_working_dirs = ['logs', 'models', 'models/ontology', 'models/semantic_similarity', 'parsed']
+required_working_dirs = ['cache', 'cache/http', 'cache/model', 'logs', 'models', 'models/ontology',
+                         'models/semantic_similarity', 'parsed']
 
 
 def setup_environment(base_working_dir):
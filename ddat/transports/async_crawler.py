@@ -0,0 +1,340 @@
+""" Asynchronous crawl engine with connection pooling and adaptive rate limiting. """
+
+import aiohttp
+import asyncio
+import ddat.transports.http_cache as http_cache
+import ddat.transports.http_transport as http_transport
+import time
+
+from ddat.config.logging_config import logger
+
+# Transport name.
+TRANSPORT_NAME = 'async'
+
+# Default concurrency, retry and backoff settings.
+DEFAULT_MAX_CONCURRENCY = 16
+DEFAULT_INITIAL_CONCURRENCY = 4
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_BACKOFF_SECONDS = 1.0
+MAX_BACKOFF_SECONDS = 60.0
+
+# AIMD additive increase and multiplicative decrease factors.
+AIMD_ADDITIVE_INCREASE = 1.0
+AIMD_MULTIPLICATIVE_DECREASE = 0.5
+
+# HTTP status codes signalling that the service is overloaded or rate limiting.
+THROTTLE_STATUS_CODES = [429, 500, 502, 503, 504]
+
+
+class AdaptiveRateLimiter:
+
+    def __init__(self, initial_limit=DEFAULT_INITIAL_CONCURRENCY, max_limit=DEFAULT_MAX_CONCURRENCY, min_limit=1):
+        """ Additive-increase/multiplicative-decrease (AIMD) concurrency limiter. The number of
+        requests in flight is capped by a limit that grows by one every time a window of healthy
+        responses completes and halves when the service throttles (HTTP 429/5xx), in which case
+        all requests also pause for the requested or computed backoff period.
+
+        Args:
+            initial_limit (int): Initial number of concurrent requests.
+            max_limit (int): Maximum number of concurrent requests.
+            min_limit (int): Minimum number of concurrent requests.
+        """
+
+        self.limit = float(initial_limit)
+        self.max_limit = max_limit
+        self.min_limit = min_limit
+        self._in_flight = 0
+        self._resume_at = 0.0
+        self._condition = None
+        self._condition_loop = None
+
+    def _get_condition(self):
+        """ Get the condition variable bound to the running event loop, as each crawl runs its own loop. """
+
+        loop = asyncio.get_running_loop()
+        if self._condition_loop is not loop:
+            self._condition = asyncio.Condition()
+            self._condition_loop = loop
+            self._in_flight = 0
+        return self._condition
+
+    async def acquire(self):
+        """ Wait until a request may be sent under the current limit and backoff period. """
+
+        async with self._get_condition():
+            await self._condition.wait_for(lambda: self._in_flight < int(self.limit))
+            self._in_flight += 1
+        delay = self._resume_at - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def release(self, throttled, backoff_seconds=DEFAULT_BACKOFF_SECONDS):
+        """ Release a request slot and adapt the limit to the response.
+
+        Args:
+            throttled (bool): Whether the response signalled throttling (HTTP 429/5xx).
+            backoff_seconds (float): Backoff period to apply if throttled.
+
+        """
+
+        async with self._get_condition():
+            self._in_flight -= 1
+            if throttled:
+                self.limit = max(self.min_limit, self.limit * AIMD_MULTIPLICATIVE_DECREASE)
+                self._resume_at = max(self._resume_at, time.monotonic() + backoff_seconds)
+            else:
+                self.limit = min(self.max_limit, self.limit + AIMD_ADDITIVE_INCREASE / self.limit)
+            self._condition.notify_all()
+
+
+class CrawlResponse:
+
+    def __init__(self, url, status, text, headers):
+        """
+        Args:
+            url (string): Final URL of the response.
+            status (int): HTTP status code.
+            text (string): Response body.
+            headers (dict): Response headers.
+        """
+
+        self.url = url
+        self.status = status
+        self.text = text
+        self.headers = headers
+
+
+class AsyncCrawler:
+
+    def __init__(self, max_concurrency=DEFAULT_MAX_CONCURRENCY, initial_concurrency=DEFAULT_INITIAL_CONCURRENCY,
+                 timeout=http_transport.DEFAULT_TIMEOUT, max_retries=DEFAULT_MAX_RETRIES,
+                 user_agent=http_transport.DEFAULT_USER_AGENT):
+        """ Asynchronous crawler fetching many pages concurrently over a shared connection pool,
+        capped by max_concurrency and throttled by an AIMD adaptive rate limiter that persists
+        across crawls.
+
+        Args:
+            max_concurrency (int): Maximum number of concurrent requests and pooled connections.
+            initial_concurrency (int): Initial number of concurrent requests.
+            timeout (int): Request timeout in seconds.
+            max_retries (int): Maximum number of retries of a throttled or failed request.
+            user_agent (string): User agent request header.
+        """
+
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.user_agent = user_agent
+        self.rate_limiter = AdaptiveRateLimiter(initial_limit=initial_concurrency, max_limit=max_concurrency)
+
+    def crawl(self, urls, request_headers=None):
+        """ Fetch the given URLs concurrently, blocking until all have been fetched.
+
+        Args:
+            urls (list): URLs to fetch.
+            request_headers (dict): Additional request headers keyed by URL (optional).
+
+        Returns:
+            Dictionary of CrawlResponse objects, or of the exceptions raised fetching the URLs, keyed by
+            requested URL.
+
+        """
+
+        return asyncio.run(self.fetch_all(urls, request_headers or {}))
+
+    async def fetch_all(self, urls, request_headers):
+        """ Fetch the given URLs concurrently over a single pooled client session. A URL that cannot
+        be fetched does not abort the other fetches, its exception being returned in place of its response.
+
+        Args:
+            urls (list): URLs to fetch.
+            request_headers (dict): Additional request headers keyed by URL.
+
+        Returns:
+            Dictionary of CrawlResponse objects, or of the exceptions raised fetching the URLs, keyed by
+            requested URL.
+
+        """
+
+        connector = aiohttp.TCPConnector(limit=self.max_concurrency, limit_per_host=self.max_concurrency)
+        async with aiohttp.ClientSession(
+                connector=connector,
+                headers={'User-Agent': self.user_agent},
+                timeout=aiohttp.ClientTimeout(total=self.timeout)) as session:
+            responses = await asyncio.gather(
+                *[self.fetch(session, url, request_headers.get(url, {})) for url in urls], return_exceptions=True)
+        return dict(zip(urls, responses))
+
+    async def fetch(self, session, url, headers):
+        """ Fetch a URL, retrying with backoff when the service throttles or the request fails.
+
+        Args:
+            session (aiohttp.ClientSession): Pooled client session.
+            url (string): URL to fetch.
+            headers (dict): Additional request headers.
+
+        Returns:
+            CrawlResponse object.
+
+        """
+
+        attempt = 0
+        while True:
+            await self.rate_limiter.acquire()
+            throttled = True
+            backoff_seconds = min(MAX_BACKOFF_SECONDS, DEFAULT_BACKOFF_SECONDS * 2 ** attempt)
+            try:
+                async with session.get(url, headers=headers) as response:
+                    if response.status not in THROTTLE_STATUS_CODES:
+                        throttled = False
+                        response.raise_for_status()
+                        return CrawlResponse(str(response.url), response.status, await response.text(),
+                                             dict(response.headers))
+                    backoff_seconds = parse_retry_after(response.headers.get('Retry-After'), backoff_seconds)
+                    if attempt >= self.max_retries:
+                        response.raise_for_status()
+                    logger.debug(f'Throttled with HTTP {response.status} fetching {url}, '
+                                 f'backing off for {backoff_seconds}s.')
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if attempt >= self.max_retries:
+                    raise
+                logger.debug(f'Failed to connect fetching {url}, backing off for {backoff_seconds}s.')
+            finally:
+                await self.rate_limiter.release(throttled, backoff_seconds)
+            attempt += 1
+
+
+class AsyncHttpTransport(http_transport.HttpTransport):
+
+    def __init__(self, crawler, pool_size=http_transport.DEFAULT_POOL_SIZE, timeout=http_transport.DEFAULT_TIMEOUT,
+                 cache=None, archive=None):
+        """ Browserless transport whose pages are prefetched concurrently by an AsyncCrawler,
+        so that subsequent calls to get are served without blocking on the network. Pages
+        that were not prefetched are fetched on demand.
+
+        Args:
+            crawler (AsyncCrawler): Asynchronous crawler.
+            pool_size (int): Maximum number of pooled keep-alive connections per host.
+            timeout (int): Request timeout in seconds.
+            cache (HttpCache): Conditional-request HTTP cache (optional).
+            archive (PageArchive): Page archive in which to record every page loaded (optional).
+        """
+
+        super().__init__(pool_size=pool_size, timeout=timeout, cache=cache, archive=archive)
+        self.crawler = crawler
+        self.prefetched_responses = {}
+
+    def prefetch(self, urls):
+        """ Fetch the given URLs concurrently ahead of calls to get. The exception raised fetching a URL
+        is kept in place of its response and raised by the call to get for that URL.
+
+        Args:
+            urls (list): URLs to fetch.
+
+        """
+
+        urls = list(dict.fromkeys(url for url in urls if url not in self.prefetched_responses))
+        request_headers = {url: self.cache.validators(url) for url in urls} if self.cache is not None else {}
+        uncached_urls = []
+        for url, response in self.crawler.crawl(urls, request_headers).items():
+            if isinstance(response, BaseException):
+                self.prefetched_responses[url] = response
+                continue
+
+            # Serve unchanged pages from the HTTP cache and cache changed pages. Pages whose cached copy
+            # was removed since the conditional request was sent are fetched again unconditionally.
+            if response.status == http_cache.HTTP_STATUS_NOT_MODIFIED and request_headers.get(url):
+                cached_response = self.cache.load(url)
+                if cached_response is None:
+                    uncached_urls.append(url)
+                    continue
+                response.url, response.text = cached_response
+            elif self.cache is not None:
+                self.cache.store(url, response.url, response.text, response.headers)
+            self.prefetched_responses[url] = response
+        for url, response in self.crawler.crawl(uncached_urls).items() if uncached_urls else []:
+            if not isinstance(response, BaseException):
+                self.cache.store(url, response.url, response.text, response.headers)
+            self.prefetched_responses[url] = response
+
+    def get(self, url):
+        """ Make a page the current page, fetching it first if it was not prefetched.
+
+        Args:
+            url (string): URL of the page.
+
+        Raises:
+            aiohttp.ClientError: If the page could not be fetched.
+
+        """
+
+        if url not in self.prefetched_responses:
+            self.prefetch([url])
+        response = self.prefetched_responses[url]
+        if isinstance(response, BaseException):
+
+            # Forget the failed fetch, so that the page is fetched again if requested again
+            del self.prefetched_responses[url]
+            raise response
+        self.load(response.url, response.text, not_modified=response.status == http_cache.HTTP_STATUS_NOT_MODIFIED,
+                  request_url=url)
+
+
+def parse_retry_after(retry_after, default_seconds):
+    """ Parse the number of seconds from a Retry-After response header.
+
+    Args:
+        retry_after (string): Retry-After header value, if any.
+        default_seconds (float): Number of seconds to default to if the header is missing or an HTTP date.
+
+    Returns:
+        Number of seconds to back off for.
+
+    """
+
+    try:
+        return min(MAX_BACKOFF_SECONDS, float(retry_after))
+    except (TypeError, ValueError):
+        return default_seconds
+
+
+def open_session(max_concurrency=DEFAULT_MAX_CONCURRENCY, initial_concurrency=DEFAULT_INITIAL_CONCURRENCY,
+                 max_retries=DEFAULT_MAX_RETRIES, pool_size=http_transport.DEFAULT_POOL_SIZE,
+                 timeout=http_transport.DEFAULT_TIMEOUT, cache_dir=None, archive=None):
+    """ Open a browserless transport backed by the asynchronous crawl engine.
+
+    Args:
+        max_concurrency (int): Maximum number of concurrent requests and pooled connections.
+        initial_concurrency (int): Initial number of concurrent requests.
+        max_retries (int): Maximum number of retries of a throttled or failed request.
+        pool_size (int): Maximum number of pooled keep-alive connections for on-demand fetches.
+        timeout (int): Request timeout in seconds.
+        cache_dir (string): Path to the conditional-request HTTP cache directory (optional).
+        archive (PageArchive): Page archive in which to record every page loaded (optional).
+
+    Returns:
+        AsyncHttpTransport instance.
+
+    """
+
+    crawler = AsyncCrawler(
+        max_concurrency=max_concurrency,
+        initial_concurrency=initial_concurrency,
+        timeout=timeout,
+        max_retries=max_retries)
+    cache = http_cache.HttpCache(cache_dir) if cache_dir else None
+    return AsyncHttpTransport(crawler, pool_size=pool_size, timeout=timeout, cache=cache, archive=archive)
+
+
+def is_async_transport(driver):
+    """ Whether a given driver is a browserless transport backed by the asynchronous crawl engine.
+
+    Args:
+        driver: Selenium driver or HttpTransport instance.
+
+    Returns:
+        True if the driver is an AsyncHttpTransport instance.
+
+    """
+
+    return isinstance(driver, AsyncHttpTransport)
@@ -0,0 +1,73 @@
+""" Lightweight headless browser crawl profile for the Selenium transport. """
+
+# Page load strategy returning control once the DOM is parsed, without waiting for subresources.
+PAGE_LOAD_STRATEGY_EAGER = 'eager'
+
+# Chrome content setting value blocking a content type.
+CONTENT_SETTING_BLOCK = 2
+
+# Default window size and memory limits.
+DEFAULT_WINDOW_SIZE = '1024,768'
+DEFAULT_MAX_OLD_SPACE_SIZE = 512
+DEFAULT_RENDERER_PROCESS_LIMIT = 2
+DEFAULT_DISK_CACHE_SIZE = 0
+
+# Chrome arguments reducing the GPU, background and extension footprint of the browser.
+LIGHTWEIGHT_ARGUMENTS = [
+    '--disable-gpu',
+    '--disable-software-rasterizer',
+    '--disable-dev-shm-usage',
+    '--disable-extensions',
+    '--disable-background-networking',
+    '--disable-default-apps',
+    '--disable-sync',
+    '--mute-audio',
+    '--no-first-run',
+    '--blink-settings=imagesEnabled=false'
+]
+
+
+def apply_crawl_profile(chrome_options, crawl_profile=None):
+    """ Apply the lightweight crawl profile to a set of Chrome options, if enabled. The profile
+    uses the eager page load strategy, disables images and stylesheets, blocks hosts other than
+    the allowed hosts, reduces the window and GPU footprint and limits the browser memory.
+
+    Args:
+        chrome_options (Options): Selenium Chrome options.
+        crawl_profile (dict): Crawl profile configuration (optional).
+
+    Returns:
+        The given Selenium Chrome options.
+
+    """
+
+    crawl_profile = crawl_profile or {}
+    if not crawl_profile.get('enabled'):
+        return chrome_options
+
+    # Return control once the DOM is parsed and do not fetch images or stylesheets.
+    chrome_options.page_load_strategy = PAGE_LOAD_STRATEGY_EAGER
+    chrome_options.add_experimental_option('prefs', {
+        'profile.managed_default_content_settings.images': CONTENT_SETTING_BLOCK,
+        'profile.managed_default_content_settings.stylesheets': CONTENT_SETTING_BLOCK
+    })
+
+    # Block third-party hosts (analytics, fonts etc.) by failing their name resolution.
+    allowed_hosts = crawl_profile.get('allowed_hosts') or []
+    if allowed_hosts:
+        host_resolver_rules = ', '.join(['MAP * ~NOTFOUND'] + [f'EXCLUDE {host}' for host in allowed_hosts])
+        chrome_options.add_argument(f'--host-resolver-rules={host_resolver_rules}')
+
+    # Reduce the window, GPU and background footprint.
+    chrome_options.add_argument(f'--window-size={crawl_profile.get("window_size", DEFAULT_WINDOW_SIZE)}')
+    for argument in LIGHTWEIGHT_ARGUMENTS:
+        chrome_options.add_argument(argument)
+
+    # Limit the browser memory.
+    chrome_options.add_argument(
+        f'--js-flags=--max-old-space-size={crawl_profile.get("max_old_space_size", DEFAULT_MAX_OLD_SPACE_SIZE)}')
+    chrome_options.add_argument(
+        f'--renderer-process-limit={crawl_profile.get("renderer_process_limit", DEFAULT_RENDERER_PROCESS_LIMIT)}')
+    chrome_options.add_argument(
+        f'--disk-cache-size={crawl_profile.get("disk_cache_size", DEFAULT_DISK_CACHE_SIZE)}')
+    return chrome_options
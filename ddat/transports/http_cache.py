@@ -0,0 +1,119 @@
+""" On-disk conditional-request HTTP cache. """
+
+import hashlib
+import json
+import os
+import threading
+
+# Cache directory path relative to the base working directory.
+CACHE_DIR_PATH = 'cache/http'
+
+# Cached file extensions.
+METADATA_FILE_EXTENSION = 'json'
+BODY_FILE_EXTENSION = 'html'
+
+# HTTP status code of a response to a conditional request for an unchanged resource.
+HTTP_STATUS_NOT_MODIFIED = 304
+
+
+class HttpCache:
+
+    def __init__(self, cache_dir):
+        """ On-disk cache of HTTP response bodies and their validators (ETag and Last-Modified)
+        keyed by request URL, used to issue conditional requests for previously fetched pages.
+
+        Args:
+            cache_dir (string): Path to the cache directory.
+        """
+
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, url, extension):
+        """ Path to a cached file for a given request URL. """
+
+        return f'{self.cache_dir}/{hashlib.sha256(url.encode("utf-8")).hexdigest()}.{extension}'
+
+    def _load_metadata(self, url):
+        """ Load the cached metadata for a given request URL, if any. """
+
+        try:
+            with open(self._path(url, METADATA_FILE_EXTENSION), 'r') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def validators(self, url):
+        """ Generate the conditional request headers for a given request URL.
+
+        Args:
+            url (string): Request URL.
+
+        Returns:
+            Dictionary of conditional request headers, empty if the URL is not cached.
+
+        """
+
+        metadata = self._load_metadata(url)
+        if metadata is None or not os.path.exists(self._path(url, BODY_FILE_EXTENSION)):
+            return {}
+        headers = {}
+        if metadata.get('etag'):
+            headers['If-None-Match'] = metadata['etag']
+        if metadata.get('last_modified'):
+            headers['If-Modified-Since'] = metadata['last_modified']
+        return headers
+
+    def load(self, url):
+        """ Load a cached response for a given request URL.
+
+        Args:
+            url (string): Request URL.
+
+        Returns:
+            Tuple of the final response URL and response body, or None if the URL is not cached.
+
+        """
+
+        metadata = self._load_metadata(url)
+        if metadata is None:
+            return None
+        try:
+            with open(self._path(url, BODY_FILE_EXTENSION), 'r', encoding='utf-8') as f:
+                return metadata['url'], f.read()
+        except FileNotFoundError:
+            return None
+
+    def store(self, url, response_url, body, headers):
+        """ Store a response for a given request URL if it carries validators.
+
+        Args:
+            url (string): Request URL.
+            response_url (string): Final response URL.
+            body (string): Response body.
+            headers (dict): Response headers.
+
+        """
+
+        etag = headers.get('ETag')
+        last_modified = headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return
+        write_file_atomically(self._path(url, BODY_FILE_EXTENSION), body)
+        write_file_atomically(self._path(url, METADATA_FILE_EXTENSION), json.dumps({
+            'url': response_url, 'etag': etag, 'last_modified': last_modified}))
+
+
+def write_file_atomically(file_path, content):
+    """ Write a text file atomically by writing to a temporary file and renaming it.
+
+    Args:
+        file_path (string): Path to the file.
+        content (string): File content.
+
+    """
+
+    tmp_file_path = f'{file_path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(tmp_file_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    os.replace(tmp_file_path, file_path)
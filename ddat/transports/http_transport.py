@@ -0,0 +1,161 @@
+""" Browserless HTTP transport. """
+
+import ddat.transports.http_cache as http_cache
+import ddat.utils.html_parser_utils as html_parser_utils
+import requests
+
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Transport name.
+TRANSPORT_NAME = 'http'
+
+# Default connection pool, timeout and retry settings.
+DEFAULT_POOL_SIZE = 10
+DEFAULT_TIMEOUT = 30
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF_FACTOR = 0.5
+DEFAULT_USER_AGENT = 'DDaT Ontology Modeller'
+
+# HTTP status codes to retry.
+RETRY_STATUS_CODES = [429, 500, 502, 503, 504]
+
+
+class HttpTransport:
+
+    def __init__(self, pool_size=DEFAULT_POOL_SIZE, timeout=DEFAULT_TIMEOUT, user_agent=DEFAULT_USER_AGENT,
+                 cache=None, archive=None):
+        """ Browserless transport that fetches pages over a pooled keep-alive HTTP session
+        and exposes the subset of the Selenium driver interface used by the parsers
+        (get, current_url, page_source and quit), together with a parsed HTML tree.
+
+        Args:
+            pool_size (int): Maximum number of pooled keep-alive connections per host.
+            timeout (int): Request timeout in seconds.
+            user_agent (string): User agent request header.
+            cache (HttpCache): Conditional-request HTTP cache (optional).
+            archive (PageArchive): Page archive in which to record every page loaded (optional).
+        """
+
+        self.timeout = timeout
+        self.cache = cache
+        self.archive = archive
+        self.session = requests.Session()
+        self.session.headers.update({'User-Agent': user_agent})
+        adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=Retry(
+                total=DEFAULT_MAX_RETRIES,
+                backoff_factor=DEFAULT_BACKOFF_FACTOR,
+                status_forcelist=RETRY_STATUS_CODES))
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.current_url = None
+        self.page_source = None
+        self.not_modified = False
+        self._tree = None
+
+    def get(self, url):
+        """ Fetch a page and make it the current page. If the page is cached, a conditional
+        request is sent and the cached page is used when the server responds 304 Not Modified.
+
+        Args:
+            url (string): URL of the page to fetch.
+
+        """
+
+        request_headers = self.cache.validators(url) if self.cache is not None else {}
+        response = self.session.get(url, headers=request_headers, timeout=self.timeout)
+        if response.status_code == http_cache.HTTP_STATUS_NOT_MODIFIED and request_headers:
+            cached_response = self.cache.load(url)
+            if cached_response is not None:
+                cached_url, cached_page_source = cached_response
+                self.load(cached_url, cached_page_source, not_modified=True, request_url=url)
+                return
+
+            # The cached page was removed since the conditional request was sent, so fetch it unconditionally
+            response = self.session.get(url, timeout=self.timeout)
+        response.raise_for_status()
+        if self.cache is not None:
+            self.cache.store(url, response.url, response.text, response.headers)
+        self.load(response.url, response.text, request_url=url)
+
+    def load(self, url, page_source, not_modified=False, request_url=None):
+        """ Make the given page source the current page, recording it in the page archive if any.
+
+        Args:
+            url (string): URL of the page.
+            page_source (string): HTML source of the page.
+            not_modified (bool): Whether the page is unchanged since it was last fetched.
+            request_url (string): URL with which the page was requested, if different (optional).
+
+        """
+
+        if self.archive is not None:
+            self.archive.record(request_url or url, url, page_source)
+
+        self.current_url = url
+        self.page_source = page_source
+        self.not_modified = not_modified
+        self._tree = None
+
+    @property
+    def tree(self):
+        """ Parsed HTML tree of the current page (parsed lazily). """
+
+        if self._tree is None and self.page_source is not None:
+            self._tree = html_parser_utils.parse_html(self.page_source, self.current_url)
+        return self._tree
+
+    def quit(self):
+        """ Close the pooled HTTP session. """
+
+        self.session.close()
+
+
+def open_session(pool_size=DEFAULT_POOL_SIZE, timeout=DEFAULT_TIMEOUT, cache_dir=None, archive=None):
+    """ Open a browserless HTTP transport.
+
+    Args:
+        pool_size (int): Maximum number of pooled keep-alive connections per host.
+        timeout (int): Request timeout in seconds.
+        cache_dir (string): Path to the conditional-request HTTP cache directory (optional).
+        archive (PageArchive): Page archive in which to record every page loaded (optional).
+
+    Returns:
+        HttpTransport instance.
+
+    """
+
+    cache = http_cache.HttpCache(cache_dir) if cache_dir else None
+    return HttpTransport(pool_size=pool_size, timeout=timeout, cache=cache, archive=archive)
+
+
+def is_page_not_modified(driver):
+    """ Whether the current page of a given driver is unchanged since it was last fetched,
+    as reported by a conditional request. Always False for Selenium drivers.
+
+    Args:
+        driver: Selenium driver or HttpTransport instance.
+
+    Returns:
+        True if the current page was served from the HTTP cache following a 304 response.
+
+    """
+
+    return is_http_transport(driver) and driver.not_modified
+
+
+def is_http_transport(driver):
+    """ Whether a given driver is a browserless HTTP transport rather than a Selenium driver.
+
+    Args:
+        driver: Selenium driver or HttpTransport instance.
+
+    Returns:
+        True if the driver is an HttpTransport instance.
+
+    """
+
+    return isinstance(driver, HttpTransport)
@@ -0,0 +1,184 @@
+""" Compressed page archive for recording and replaying parser runs. """
+
+import ddat.transports.http_cache as http_cache
+import ddat.transports.http_transport as http_transport
+import hashlib
+import json
+import os
+import threading
+import zipfile
+
+from selenium import webdriver
+
+# Archive modes.
+ARCHIVE_MODE_OFF = 'off'
+ARCHIVE_MODE_RECORD = 'record'
+ARCHIVE_MODE_REPLAY = 'replay'
+
+# Archive directory path relative to the base working directory, and archive file names.
+ARCHIVE_DIR_PATH = 'archive'
+ARCHIVE_PAGES_FILE_NAME = 'pages.zip'
+ARCHIVE_INDEX_FILE_NAME = 'index.json'
+
+
+class PageArchive:
+
+    def __init__(self, archive_dir, mode):
+        """ Archive of the pages fetched by the parsers, keyed by request URL. Pages are stored
+        as deflate-compressed members of a ZIP file, and an index maps each request URL to its
+        final response URL and archive member so that any page can be read without decompressing
+        the others. Recording the same URL again appends a new member that supersedes the previous one.
+
+        Args:
+            archive_dir (string): Path to the archive directory.
+            mode (string): Archive mode, either 'record' or 'replay'.
+        """
+
+        self.archive_dir = archive_dir
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._index_file_path = f'{archive_dir}/{ARCHIVE_INDEX_FILE_NAME}'
+        self.index = {}
+        if os.path.exists(self._index_file_path):
+            with open(self._index_file_path, 'r') as f:
+                self.index = json.load(f)
+        elif mode == ARCHIVE_MODE_REPLAY:
+            raise FileNotFoundError(f'Page archive not found: {archive_dir}')
+        if mode == ARCHIVE_MODE_RECORD:
+            os.makedirs(archive_dir, exist_ok=True)
+        self._pages_file = zipfile.ZipFile(
+            f'{archive_dir}/{ARCHIVE_PAGES_FILE_NAME}',
+            'a' if mode == ARCHIVE_MODE_RECORD else 'r',
+            compression=zipfile.ZIP_DEFLATED)
+
+    def record(self, url, response_url, page_source):
+        """ Record a page in the archive.
+
+        Args:
+            url (string): Request URL.
+            response_url (string): Final response URL.
+            page_source (string): HTML source of the page.
+
+        """
+
+        url_hash = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        with self._lock:
+            member_name = f'{url_hash}.{len(self._pages_file.namelist())}.html'
+            self._pages_file.writestr(member_name, page_source)
+            self.index[url] = {'url': response_url, 'member': member_name}
+
+    def load(self, url):
+        """ Load a page from the archive.
+
+        Args:
+            url (string): Request URL.
+
+        Returns:
+            Tuple of the final response URL and the HTML source of the page, or None if the URL is not archived.
+
+        """
+
+        index_entry = self.index.get(url)
+        if index_entry is None:
+            return None
+        with self._lock:
+            page_source = self._pages_file.read(index_entry['member']).decode('utf-8')
+        return index_entry['url'], page_source
+
+    def close(self):
+        """ Close the archive, writing its index when recording. """
+
+        with self._lock:
+            self._pages_file.close()
+            if self.mode == ARCHIVE_MODE_RECORD:
+                http_cache.write_file_atomically(self._index_file_path, json.dumps(self.index, indent=4))
+
+
+class ReplayTransport(http_transport.HttpTransport):
+
+    def __init__(self, archive):
+        """ Browserless transport serving pages from a page archive instead of the network.
+
+        Args:
+            archive (PageArchive): Page archive opened in replay mode.
+        """
+
+        super().__init__()
+        self.replay_archive = archive
+
+    def get(self, url):
+        """ Make an archived page the current page.
+
+        Args:
+            url (string): Request URL of the page.
+
+        Raises:
+            LookupError: If the page is not archived.
+
+        """
+
+        archived_page = self.replay_archive.load(url)
+        if archived_page is None:
+            raise LookupError(f'Page not archived: {url}')
+        self.load(*archived_page)
+
+
+class RecordingChrome(webdriver.Chrome):
+
+    def __init__(self, archive, *args, **kwargs):
+        """ Selenium Chrome driver recording every page it navigates to in a page archive.
+
+        Args:
+            archive (PageArchive): Page archive opened in record mode.
+            args: Selenium Chrome driver positional arguments.
+            kwargs: Selenium Chrome driver keyword arguments.
+        """
+
+        super().__init__(*args, **kwargs)
+        self.archive = archive
+
+    def get(self, url):
+        """ Navigate to a page and record it in the page archive.
+
+        Args:
+            url (string): URL of the page.
+
+        """
+
+        super().get(url)
+        self.archive.record(url, self.current_url, self.page_source)
+
+
+def open_archive(archive_options=None, base_working_dir=None):
+    """ Open the page archive configured for a pipeline run, if any.
+
+    Args:
+        archive_options (dict): Archive configuration with the archive mode and directory (optional).
+        base_working_dir (string): Path to the base working directory.
+
+    Returns:
+        PageArchive instance, or None if the archive mode is 'off'.
+
+    """
+
+    archive_options = archive_options or {}
+    mode = archive_options.get('mode') or ARCHIVE_MODE_OFF
+    if mode == ARCHIVE_MODE_OFF:
+        return None
+    if mode not in (ARCHIVE_MODE_RECORD, ARCHIVE_MODE_REPLAY):
+        raise ValueError(f'Unsupported page archive mode: {mode}')
+    return PageArchive(f'{base_working_dir}/{archive_options.get("dir", ARCHIVE_DIR_PATH)}', mode)
+
+
+def is_replay_archive(archive):
+    """ Whether a given page archive is opened in replay mode.
+
+    Args:
+        archive (PageArchive): Page archive, or None.
+
+    Returns:
+        True if pages are replayed from the archive.
+
+    """
+
+    return archive is not None and archive.mode == ARCHIVE_MODE_REPLAY
@@ -0,0 +1,94 @@
+""" Explicit wait strategy for the Selenium transport. """
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions
+from selenium.webdriver.support.ui import WebDriverWait
+
+# Default wait timeouts in seconds.
+DEFAULT_PAGE_READY_TIMEOUT = 10
+DEFAULT_SELECTOR_TIMEOUT = 5
+
+# Wait polling frequency in seconds.
+POLL_FREQUENCY = 0.1
+
+# Document ready states at which the page DOM has been parsed.
+PAGE_READY_STATES = ('interactive', 'complete')
+
+
+class WaitStrategy:
+
+    def __init__(self, page_ready_timeout=DEFAULT_PAGE_READY_TIMEOUT, selector_timeouts=None,
+                 default_selector_timeout=DEFAULT_SELECTOR_TIMEOUT):
+        """ Explicit wait strategy replacing the Selenium implicit wait. The page is waited for
+        once after navigation and required elements are waited for with per-selector timeouts,
+        failing fast when they do not appear, so that lookups of optional elements (with the
+        implicit wait disabled) return immediately rather than stalling.
+
+        Args:
+            page_ready_timeout (int): Timeout in seconds to wait for the page DOM to be parsed.
+            selector_timeouts (dict): Timeouts in seconds keyed by selector name (optional).
+            default_selector_timeout (int): Timeout in seconds for selectors without a configured timeout.
+        """
+
+        self.page_ready_timeout = page_ready_timeout
+        self.selector_timeouts = selector_timeouts or {}
+        self.default_selector_timeout = default_selector_timeout
+
+    def wait_for_page_ready(self, driver):
+        """ Wait for the DOM of the current page to be parsed.
+
+        Args:
+            driver: Selenium driver instance.
+
+        Raises:
+            TimeoutException: If the page is not ready within the page ready timeout.
+
+        """
+
+        WebDriverWait(driver, self.page_ready_timeout, poll_frequency=POLL_FREQUENCY).until(
+            lambda d: d.execute_script('return document.readyState') in PAGE_READY_STATES,
+            message=f'Page not ready after {self.page_ready_timeout}s: {driver.current_url}')
+
+    def wait_for_element(self, driver, selector_name, selector, by=By.CSS_SELECTOR, clickable=False):
+        """ Wait for a required element to be present (or clickable) on the current page.
+
+        Args:
+            driver: Selenium driver instance.
+            selector_name (string): Name of the selector used to look up its configured timeout.
+            selector (string): Selector of the element.
+            by (string): Selenium locator strategy of the selector.
+            clickable (bool): Whether to wait for the element to be visible and enabled.
+
+        Returns:
+            Selenium web element.
+
+        Raises:
+            TimeoutException: If the element does not appear within the selector timeout.
+
+        """
+
+        timeout = self.selector_timeouts.get(selector_name, self.default_selector_timeout)
+        condition = expected_conditions.element_to_be_clickable((by, selector)) if clickable \
+            else expected_conditions.presence_of_element_located((by, selector))
+        return WebDriverWait(driver, timeout, poll_frequency=POLL_FREQUENCY).until(
+            condition, message=f'Element {selector_name} ({selector}) not found after {timeout}s')
+
+
+def from_options(wait_options=None):
+    """ Create a wait strategy from the Selenium transport wait configuration.
+
+    Args:
+        wait_options (dict): Wait configuration with the page ready timeout, the default
+            selector timeout and the timeouts keyed by selector name (optional).
+
+    Returns:
+        WaitStrategy instance.
+
+    """
+
+    wait_options = wait_options or {}
+    return WaitStrategy(
+        page_ready_timeout=wait_options.get('page_ready', DEFAULT_PAGE_READY_TIMEOUT),
+        selector_timeouts=wait_options.get('selectors'),
+        default_selector_timeout=wait_options.get('default', DEFAULT_SELECTOR_TIMEOUT))
+
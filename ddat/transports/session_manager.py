@@ -0,0 +1,131 @@
+""" Transport session manager shared by the parser pipeline modules. """
+
+import contextlib
+import ddat.transports.page_archive as page_archive
+import ddat.transports.session_pool as session_pool
+import ddat.transports.transport_factory as transport_factory
+import threading
+
+from ddat.config.logging_config import logger
+
+
+class SessionManager:
+
+    def __init__(self, transport, driver_path, transport_options=None, base_working_dir=None):
+        """ Manager of the transport sessions (Selenium drivers or HttpTransport instances) of
+        a pipeline run. The parsers borrow a single warm session, and a pool of additional
+        sessions for concurrent crawling, that are opened lazily and closed once at the end
+        of the run.
+
+        Args:
+            transport (string): Fetch/parse transport, either 'http' (browserless), 'async' (browserless
+                asynchronous crawl engine) or 'selenium' (fallback).
+            driver_path (string): Path to the web driver (Selenium transport only).
+            transport_options (dict): Transport configuration keyed by transport name (optional).
+            base_working_dir (string): Path to the base working directory holding the HTTP cache (optional).
+        """
+
+        self.transport = transport
+        self.driver_path = driver_path
+        self.transport_options = transport_options
+        self.base_working_dir = base_working_dir
+        self.wait_strategy = transport_factory.open_wait_strategy(transport_options)
+        self._lock = threading.Lock()
+        self._archive = None
+        self._driver = None
+        self._session_pool = None
+
+    @property
+    def archive(self):
+        """ Page archive in which to record, or from which to replay, every page (opened lazily). """
+
+        if self._archive is None:
+            self._archive = page_archive.open_archive(
+                (self.transport_options or {}).get('archive'), self.base_working_dir)
+        return self._archive
+
+    def open_session(self):
+        """ Open a new transport session.
+
+        Returns:
+            HttpTransport, AsyncHttpTransport or Selenium driver instance.
+
+        """
+
+        logger.debug(f'Creating a {self.transport} transport instance...')
+        driver = transport_factory.open_transport(
+            self.transport, self.driver_path, self.transport_options, self.base_working_dir, self.archive)
+        logger.debug(f'Successfully created a {self.transport} transport instance.')
+        return driver
+
+    @property
+    def driver(self):
+        """ Shared transport session (opened lazily). """
+
+        with self._lock:
+            if self._driver is None:
+                self._driver = self.open_session()
+            return self._driver
+
+    def session_pool(self, size):
+        """ Get the pool of transport sessions, seeded with the shared session, growing it to
+        the given size if required. Sessions opened by the pool are kept warm between stages.
+
+        Args:
+            size (int): Minimum number of sessions in the pool.
+
+        Returns:
+            SessionPool instance.
+
+        """
+
+        driver = self.driver
+        with self._lock:
+            if self._session_pool is None:
+                self._session_pool = session_pool.SessionPool(
+                    open_session=self.open_session, size=size, sessions=[driver])
+            self._session_pool.size = max(self._session_pool.size, size)
+            return self._session_pool
+
+    def close(self):
+        """ Close the pooled sessions, the shared session and the page archive. """
+
+        with self._lock:
+            if self._session_pool is not None:
+                self._session_pool.close()
+                self._session_pool = None
+            if self._driver is not None:
+                logger.debug(f'Closing the {self.transport} transport instance...')
+                transport_factory.close_transport(self._driver)
+                self._driver = None
+                logger.debug(f'Successfully closed the {self.transport} transport instance.')
+            if self._archive is not None:
+                self._archive.close()
+                self._archive = None
+
+
+@contextlib.contextmanager
+def borrow(session_manager, transport, driver_path, transport_options=None, base_working_dir=None):
+    """ Borrow the given session manager for the duration of a with block or, if none is given,
+    open a session manager that is closed at the end of the with block.
+
+    Args:
+        session_manager (SessionManager): Shared session manager, or None.
+        transport (string): Fetch/parse transport.
+        driver_path (string): Path to the web driver (Selenium transport only).
+        transport_options (dict): Transport configuration keyed by transport name (optional).
+        base_working_dir (string): Path to the base working directory holding the HTTP cache (optional).
+
+    Yields:
+        SessionManager instance.
+
+    """
+
+    if session_manager is not None:
+        yield session_manager
+        return
+    session_manager = SessionManager(transport, driver_path, transport_options, base_working_dir)
+    try:
+        yield session_manager
+    finally:
+        session_manager.close()
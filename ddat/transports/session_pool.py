@@ -0,0 +1,67 @@
+""" Bounded pool of transport sessions. """
+
+import contextlib
+import queue
+import threading
+
+
+class SessionPool:
+
+    def __init__(self, open_session, size, sessions=()):
+        """ Bounded pool of transport sessions (Selenium drivers or HttpTransport instances)
+        shared by concurrent workers, where each session is used by at most one worker at a time.
+        Sessions are opened lazily up to the pool size.
+
+        Args:
+            open_session (callable): Function that opens and returns a new session.
+            size (int): Maximum number of sessions in the pool.
+            sessions (iterable): Already open sessions to seed the pool with. Seeded sessions
+                count towards the pool size but remain owned, and are closed, by the caller.
+        """
+
+        self.open_session = open_session
+        self.size = size
+        self._lock = threading.Lock()
+        self._idle_sessions = queue.LifoQueue()
+        self._seeded_sessions = list(sessions)
+        self._opened_sessions = []
+        for session in self._seeded_sessions:
+            self._idle_sessions.put(session)
+
+    @contextlib.contextmanager
+    def session(self):
+        """ Borrow a session from the pool for the duration of a with block, blocking
+        until one is available if the pool is exhausted.
+
+        Yields:
+            Session instance.
+
+        """
+
+        session = self._acquire()
+        try:
+            yield session
+        finally:
+            self._idle_sessions.put(session)
+
+    def _acquire(self):
+        """ Acquire an idle session, opening a new one if the pool has not reached its size. """
+
+        try:
+            return self._idle_sessions.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if len(self._seeded_sessions) + len(self._opened_sessions) < self.size:
+                session = self.open_session()
+                self._opened_sessions.append(session)
+                return session
+        return self._idle_sessions.get()
+
+    def close(self):
+        """ Close all the sessions opened by the pool. """
+
+        with self._lock:
+            for session in self._opened_sessions:
+                session.quit()
+            self._opened_sessions = []
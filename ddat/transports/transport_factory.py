@@ -0,0 +1,106 @@
+""" Transport factory shared by the parser pipeline modules. """
+
+import ddat.transports.async_crawler as async_crawler
+import ddat.transports.browser_profile as browser_profile
+import ddat.transports.http_cache as http_cache
+import ddat.transports.http_transport as http_transport
+import ddat.transports.page_archive as page_archive
+import ddat.transports.selenium_waits as selenium_waits
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+
+# Transport names.
+TRANSPORT_HTTP = http_transport.TRANSPORT_NAME
+TRANSPORT_ASYNC = async_crawler.TRANSPORT_NAME
+TRANSPORT_SELENIUM = 'selenium'
+
+
+def open_transport(transport, driver_path, transport_options=None, base_working_dir=None, archive=None):
+    """ Open the given transport and return a driver instance.
+
+    Args:
+        transport (string): Fetch/parse transport, either 'http' (browserless), 'async' (browserless
+            asynchronous crawl engine) or 'selenium' (fallback).
+        driver_path (string): Path to the web driver (Selenium transport only).
+        transport_options (dict): Transport configuration keyed by transport name (optional).
+        base_working_dir (string): Path to the base working directory holding the HTTP cache (optional).
+        archive (PageArchive): Page archive in which to record every page fetched or, if opened in replay
+            mode, from which to serve every page instead of the given transport (optional).
+
+    Returns:
+        HttpTransport, AsyncHttpTransport, ReplayTransport or Selenium driver instance.
+
+    """
+
+    if page_archive.is_replay_archive(archive):
+        return page_archive.ReplayTransport(archive)
+
+    transport_options = transport_options or {}
+    http_options = transport_options.get(TRANSPORT_HTTP) or {}
+    async_options = transport_options.get(TRANSPORT_ASYNC) or {}
+    selenium_options = transport_options.get(TRANSPORT_SELENIUM) or {}
+    cache_dir = f'{base_working_dir}/{http_cache.CACHE_DIR_PATH}' \
+        if http_options.get('cache') and base_working_dir else None
+    if transport == TRANSPORT_HTTP:
+        return http_transport.open_session(
+            pool_size=http_options.get('pool_size', http_transport.DEFAULT_POOL_SIZE),
+            timeout=http_options.get('timeout', http_transport.DEFAULT_TIMEOUT),
+            cache_dir=cache_dir,
+            archive=archive)
+    if transport == TRANSPORT_ASYNC:
+        return async_crawler.open_session(
+            max_concurrency=async_options.get('max_concurrency', async_crawler.DEFAULT_MAX_CONCURRENCY),
+            initial_concurrency=async_options.get('initial_concurrency', async_crawler.DEFAULT_INITIAL_CONCURRENCY),
+            max_retries=async_options.get('max_retries', async_crawler.DEFAULT_MAX_RETRIES),
+            pool_size=http_options.get('pool_size', http_transport.DEFAULT_POOL_SIZE),
+            timeout=http_options.get('timeout', http_transport.DEFAULT_TIMEOUT),
+            cache_dir=cache_dir,
+            archive=archive)
+    if transport == TRANSPORT_SELENIUM:
+        return open_browser(driver_path, selenium_options.get('crawl_profile'), archive)
+    raise ValueError(f'Unsupported transport: {transport}')
+
+
+def open_browser(driver_path, crawl_profile=None, archive=None):
+    """ Open a headless browser and return a Selenium driver instance.
+
+    Args:
+        driver_path (string): Path to the web driver.
+        crawl_profile (dict): Lightweight crawl profile configuration (optional).
+        archive (PageArchive): Page archive in which to record every page navigated to (optional).
+
+    Returns:
+        Selenium driver instance.
+
+    """
+
+    chrome_options = Options()
+    chrome_options.add_argument('--headless')
+    browser_profile.apply_crawl_profile(chrome_options, crawl_profile)
+
+    # The implicit wait is left disabled so that lookups of optional elements return immediately.
+    # Required elements are waited for explicitly (see open_wait_strategy).
+    if archive is not None:
+        return page_archive.RecordingChrome(archive, driver_path, chrome_options=chrome_options)
+    return webdriver.Chrome(driver_path, chrome_options=chrome_options)
+
+
+def open_wait_strategy(transport_options=None):
+    """ Create the explicit wait strategy of the Selenium transport.
+
+    Args:
+        transport_options (dict): Transport configuration keyed by transport name (optional).
+
+    Returns:
+        WaitStrategy instance.
+
+    """
+
+    selenium_options = (transport_options or {}).get(TRANSPORT_SELENIUM) or {}
+    return selenium_waits.from_options(selenium_options.get('waits'))
+
+
+def close_transport(driver):
+    """ Close a Selenium driver or HttpTransport instance. """
+    driver.quit()
@@ -0,0 +1,277 @@
+""" Binary, versioned artifact store utility functions.
+
+An artifact file holds a list of entities of one Entity class, grouped into blocks (for example one
+block per branch). Each block is stored column by column, one column per schema field, as compressed
+JSON, so that a single block can be read without reading or decoding the rest of the artifact.
+
+Artifact file layout:
+    magic (4 bytes), format version (2 bytes), header length (4 bytes), both big-endian unsigned integers
+    header (JSON): entity class name, schema field names, compression and the index of blocks
+    blocks: compressed columns of each block, at the offsets given by the index
+"""
+
+import json
+import os
+import struct
+import zlib
+
+# Artifact file magic number and format version. The format version is incremented whenever the
+# artifact file layout changes, and artifacts written with another format version are not read.
+ARTIFACT_MAGIC = b'DDAT'
+ARTIFACT_FORMAT_VERSION = 1
+
+# Artifact file preamble holding the magic number, format version and header length.
+ARTIFACT_PREAMBLE = struct.Struct('>4sHI')
+
+# Block compression algorithm and level.
+ARTIFACT_COMPRESSION = 'zlib'
+ARTIFACT_COMPRESSION_LEVEL = 6
+
+
+def chunk(entities, block_size):
+    """ Split a list of entities into consecutive blocks of a given size.
+
+    Args:
+        entities (list): List of entities.
+        block_size (int): Maximum number of entities per block.
+
+    Returns:
+        List of tuples of block key and list of entities.
+
+    """
+
+    return [(f'{i // block_size:04d}', entities[i:i + block_size]) for i in range(0, len(entities), block_size)]
+
+
+def group(entities, key):
+    """ Group a list of entities into blocks by a given key, preserving the entity order.
+
+    Args:
+        entities (list): List of entities.
+        key (callable): Function returning the block key of an entity.
+
+    Returns:
+        List of tuples of block key and list of entities.
+
+    """
+
+    blocks = {}
+    for entity in entities:
+        blocks.setdefault(key(entity), []).append(entity)
+    return list(blocks.items())
+
+
+def encode_block(entity_class, entities):
+    """ Encode a block of entities as compressed columns, one column per schema field.
+
+    Args:
+        entity_class (type): Entity subclass.
+        entities (list): List of entities.
+
+    Returns:
+        Compressed block bytes.
+
+    """
+
+    entity_dicts = [entity.to_dict() for entity in entities]
+    columns = {field.name: [entity_dict[field.name] for entity_dict in entity_dicts] for field in entity_class.SCHEMA}
+    return zlib.compress(json.dumps(columns, ensure_ascii=False, separators=(',', ':')).encode('utf-8'),
+                         ARTIFACT_COMPRESSION_LEVEL)
+
+
+def decode_block(entity_class, block, count):
+    """ Decode a block of compressed columns into entities. Columns of fields no longer in the
+    schema are ignored, and fields missing from the columns are set to None.
+
+    Args:
+        entity_class (type): Entity subclass.
+        block (bytes): Compressed block bytes.
+        count (int): Number of entities in the block.
+
+    Returns:
+        List of entities.
+
+    """
+
+    return entity_class.from_columns(json.loads(zlib.decompress(block).decode('utf-8')), count)
+
+
+def write_artifact(artifact_file_path, entity_class, blocks):
+    """ Write blocks of entities to an artifact file atomically, in block order.
+
+    Args:
+        artifact_file_path (string): Path to the artifact file.
+        entity_class (type): Entity subclass of the entities.
+        blocks (list): List of tuples of block key and list of entities.
+
+    """
+
+    index = []
+    encoded_blocks = []
+    offset = 0
+    for block_key, entities in blocks:
+        encoded_block = encode_block(entity_class, entities)
+        index.append({'key': block_key, 'offset': offset, 'length': len(encoded_block), 'count': len(entities)})
+        encoded_blocks.append(encoded_block)
+        offset += len(encoded_block)
+    header = json.dumps({
+        'entity': entity_class.__name__,
+        'schema': [field.name for field in entity_class.SCHEMA],
+        'compression': ARTIFACT_COMPRESSION,
+        'blocks': index
+    }, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    os.makedirs(os.path.dirname(artifact_file_path) or '.', exist_ok=True)
+    tmp_file_path = f'{artifact_file_path}.{os.getpid()}.tmp'
+    with open(tmp_file_path, 'wb') as f:
+        f.write(ARTIFACT_PREAMBLE.pack(ARTIFACT_MAGIC, ARTIFACT_FORMAT_VERSION, len(header)))
+        f.write(header)
+        for encoded_block in encoded_blocks:
+            f.write(encoded_block)
+    os.replace(tmp_file_path, artifact_file_path)
+
+
+def read_artifact_header(f, entity_class):
+    """ Read the header of an open artifact file.
+
+    Args:
+        f (file): Artifact file opened in binary mode, positioned at its start.
+        entity_class (type): Entity subclass expected in the artifact.
+
+    Returns:
+        Tuple of header dictionary and file offset of the first block, or None if the artifact
+        was written with another format version.
+
+    Raises:
+        ValueError: If the file is not an artifact file or holds entities of another class.
+
+    """
+
+    preamble = f.read(ARTIFACT_PREAMBLE.size)
+    if len(preamble) < ARTIFACT_PREAMBLE.size:
+        raise ValueError(f'Invalid artifact file {f.name}: truncated preamble')
+    magic, format_version, header_length = ARTIFACT_PREAMBLE.unpack(preamble)
+    if magic != ARTIFACT_MAGIC:
+        raise ValueError(f'Invalid artifact file {f.name}: unknown magic number')
+    if format_version != ARTIFACT_FORMAT_VERSION:
+        return None
+    header = json.loads(f.read(header_length).decode('utf-8'))
+    if header['entity'] != entity_class.__name__:
+        raise ValueError(f'Invalid artifact file {f.name}: holds {header["entity"]} entities, '
+                         f'expected {entity_class.__name__}')
+    return header, ARTIFACT_PREAMBLE.size + header_length
+
+
+def load_artifact_index(artifact_file_path, entity_class):
+    """ Load the index of the blocks of an artifact file, without reading the blocks.
+
+    Args:
+        artifact_file_path (string): Path to the artifact file.
+        entity_class (type): Entity subclass expected in the artifact.
+
+    Returns:
+        List of block index entries (key, offset, length and entity count), or None if there is
+        no artifact file or it was written with another format version.
+
+    """
+
+    try:
+        with open(artifact_file_path, 'rb') as f:
+            header = read_artifact_header(f, entity_class)
+    except FileNotFoundError:
+        return None
+    return header[0]['blocks'] if header is not None else None
+
+
+def iter_blocks(artifact_file_path, entity_class, block_keys=None):
+    """ Lazily load the blocks of an artifact file in block order, one block at a time, reading
+    and decoding only the blocks requested. The artifact header is read before any block is requested,
+    so that a missing or unsupported artifact file is reported by the call itself.
+
+    Args:
+        artifact_file_path (string): Path to the artifact file.
+        entity_class (type): Entity subclass expected in the artifact.
+        block_keys (iterable): Keys of the blocks to load (optional, defaults to all blocks).
+
+    Returns:
+        Iterator of tuples of block key and list of entities.
+
+    Raises:
+        FileNotFoundError: If there is no artifact file.
+        ValueError: If the file is not an artifact file, holds entities of another class or was written
+            with another format version.
+
+    """
+
+    f = open(artifact_file_path, 'rb')
+    try:
+        header = read_artifact_header(f, entity_class)
+        if header is None:
+            raise ValueError(f'Unsupported artifact file {artifact_file_path}: written with another format '
+                             f'version, expected format version {ARTIFACT_FORMAT_VERSION}')
+    except BaseException:
+        f.close()
+        raise
+    return read_blocks(f, entity_class, *header, set(block_keys) if block_keys is not None else None)
+
+
+def read_blocks(f, entity_class, header, data_offset, block_keys):
+    """ Read the requested blocks of an open artifact file in block order, closing the file once done.
+
+    Args:
+        f (file): Artifact file opened in binary mode.
+        entity_class (type): Entity subclass expected in the artifact.
+        header (dict): Artifact header, as returned by read_artifact_header.
+        data_offset (int): File offset of the first block, as returned by read_artifact_header.
+        block_keys (set): Keys of the blocks to load, or None to load all blocks.
+
+    Yields:
+        Tuple of block key and list of entities.
+
+    """
+
+    with f:
+        for block in header['blocks']:
+            if block_keys is None or block['key'] in block_keys:
+                f.seek(data_offset + block['offset'])
+                yield block['key'], decode_block(entity_class, f.read(block['length']), block['count'])
+
+
+def iter_entities(artifact_file_path, entity_class, block_keys=None):
+    """ Lazily load the entities of an artifact file in block order, one block at a time.
+
+    Args:
+        artifact_file_path (string): Path to the artifact file.
+        entity_class (type): Entity subclass expected in the artifact.
+        block_keys (iterable): Keys of the blocks to load (optional, defaults to all blocks).
+
+    Returns:
+        Iterator of entities.
+
+    Raises:
+        FileNotFoundError: If there is no artifact file.
+        ValueError: If the file is not an artifact file, holds entities of another class or was written
+            with another format version.
+
+    """
+
+    blocks = iter_blocks(artifact_file_path, entity_class, block_keys)
+    return (entity for _, entities in blocks for entity in entities)
+
+
+def load_entities(artifact_file_path, entity_class, block_keys=None):
+    """ Load the entities of an artifact file.
+
+    Args:
+        artifact_file_path (string): Path to the artifact file.
+        entity_class (type): Entity subclass expected in the artifact.
+        block_keys (iterable): Keys of the blocks to load (optional, defaults to all blocks).
+
+    Returns:
+        List of entities, or None if there is no artifact file or it was written with another format version.
+
+    """
+
+    if load_artifact_index(artifact_file_path, entity_class) is None:
+        return None
+    return list(iter_entities(artifact_file_path, entity_class, block_keys))
@@ -0,0 +1,131 @@
+""" Resumable crawl checkpoint utility functions. """
+
+import ddat.utils.artifact_utils as artifact_utils
+import json
+import os
+import shutil
+import threading
+import zlib
+
+# Checkpoint file name extension. Checkpoints are artifact files holding a single block.
+CHECKPOINT_FILE_EXTENSION = 'artifact'
+
+
+class CrawlCheckpoint:
+
+    def __init__(self, checkpoint_dir, entity_class, resume=False):
+        """ Checkpoints of the entities parsed for each completed unit of a crawl (for example
+        a branch resource), written as the crawl proceeds so that an interrupted crawl can be
+        resumed from the completed units, together with a report of the failures encountered.
+        The checkpoint of each crawl unit is written as an artifact file, so that checkpoints hold
+        data only and remain readable when fields are added to or removed from the entity class.
+
+        Args:
+            checkpoint_dir (string): Path to the checkpoint directory.
+            entity_class (type): Entity subclass of the parsed entities.
+            resume (bool): Whether to resume from the existing checkpoints, otherwise they are cleared.
+        """
+
+        self.checkpoint_dir = checkpoint_dir
+        self.entity_class = entity_class
+        self.failures = []
+        self._lock = threading.Lock()
+        if not resume and os.path.exists(checkpoint_dir):
+            shutil.rmtree(checkpoint_dir)
+        os.makedirs(checkpoint_dir, exist_ok=True)
+
+    def _path(self, key):
+        """ Path to the checkpoint file of a given crawl unit. """
+
+        return f'{self.checkpoint_dir}/{key}.{CHECKPOINT_FILE_EXTENSION}'
+
+    def load(self, key):
+        """ Load the entities parsed for a completed crawl unit.
+
+        Args:
+            key (string): Crawl unit key.
+
+        Returns:
+            List of parsed entities, or None if the crawl unit has not been completed or its
+            checkpoint is unreadable or was written with another artifact format version.
+
+        """
+
+        try:
+            return artifact_utils.load_entities(self._path(key), self.entity_class)
+        except (ValueError, zlib.error):
+            return None
+
+    def save(self, key, entities):
+        """ Save the entities parsed for a completed crawl unit.
+
+        Args:
+            key (string): Crawl unit key.
+            entities (list): Parsed entities.
+
+        """
+
+        artifact_utils.write_artifact(self._path(key), self.entity_class, [(key, entities)])
+
+    def record_failure(self, key, url, exception):
+        """ Record a failure to parse an entity or a crawl unit.
+
+        Args:
+            key (string): Crawl unit key.
+            url (string): URL of the entity or crawl unit that failed.
+            exception (Exception): Exception raised.
+
+        """
+
+        with self._lock:
+            self.failures.append({'key': key, 'url': url, 'error': repr(exception)})
+
+    def has_failures(self, key):
+        """ Whether any failure was recorded for a given crawl unit.
+
+        Args:
+            key (string): Crawl unit key.
+
+        Returns:
+            True if a failure was recorded for the crawl unit.
+
+        """
+
+        with self._lock:
+            return any(failure['key'] == key for failure in self.failures)
+
+    def clear(self):
+        """ Remove the checkpoints of every crawl unit once the crawl has completed and its output has been
+        written, so that a later resumed crawl does not reuse them.
+        """
+
+        shutil.rmtree(self.checkpoint_dir, ignore_errors=True)
+
+    def write_failure_report(self, failure_report_file_path):
+        """ Write the report of the failures encountered to file.
+
+        Args:
+            failure_report_file_path (string): Path to the failure report file.
+
+        """
+
+        with open(failure_report_file_path, 'w') as f:
+            json.dump(self.failures, f, indent=4)
+
+
+def load_failed_keys(failure_report_file_path):
+    """ Load the keys of the crawl units with failures recorded in a failure report.
+
+    Args:
+        failure_report_file_path (string): Path to the failure report file.
+
+    Returns:
+        Set of crawl unit keys, empty if there is no failure report.
+
+    """
+
+    try:
+        with open(failure_report_file_path, 'r') as f:
+            return {failure['key'] for failure in json.load(f)}
+    except (FileNotFoundError, json.JSONDecodeError):
+        return set()
@@ -0,0 +1,157 @@
+""" Rendered fragment cache utility functions. """
+
+import hashlib
+import json
+import os
+
+# Fragment cache file format version. The format version is incremented whenever the fragment cache
+# file layout changes, and fragment caches written with another format version are not read.
+FRAGMENT_CACHE_FORMAT_VERSION = 1
+
+
+class FragmentCache:
+
+    def __init__(self, namespace, fragments=None):
+        """ Cache of rendered fragments (e.g. OWL RDF/XML class blocks) keyed by a content hash
+        of the data each fragment is rendered from, so that only fragments whose data changed
+        are re-rendered. Fragments not used by the current render are dropped when written.
+
+        Args:
+            namespace (list): Strings every fragment depends on, such as the ontology IRI and
+                the template version, so that changing any of them invalidates all fragments.
+            fragments (dict): Previously rendered fragments keyed by content hash (optional).
+        """
+
+        self.namespace = hashlib.sha256('\0'.join(namespace).encode('utf-8')).hexdigest()
+        self.previous_fragments = fragments or {}
+        self.fragments = {}
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, kind, entity):
+        """ Get the key of the fragment rendered from a given entity.
+
+        Args:
+            kind (string): Fragment kind (e.g. the entity type).
+            entity: Entity the fragment is rendered from, serializable to JSON through to_dict or its attributes.
+
+        Returns:
+            Fragment key.
+
+        """
+
+        return fragment_key(self.namespace, kind, entity)
+
+    def get(self, key):
+        """ Get a cached fragment.
+
+        Args:
+            key (string): Fragment key.
+
+        Returns:
+            Rendered fragment string, or None if the fragment is not cached.
+
+        """
+
+        fragment = self.previous_fragments.get(key)
+        if fragment is None:
+            fragment = self.fragments.get(key)
+        if fragment is not None:
+            self.hits += 1
+            self.fragments[key] = fragment
+        return fragment
+
+    def put(self, key, fragment):
+        """ Cache a newly rendered fragment.
+
+        Args:
+            key (string): Fragment key.
+            fragment (string): Rendered fragment string.
+
+        """
+
+        self.misses += 1
+        self.fragments[key] = fragment
+
+    def render(self, kind, entity, render_fragment):
+        """ Get the cached fragment rendered from a given entity, rendering it if required.
+
+        Args:
+            kind (string): Fragment kind (e.g. the entity type).
+            entity: Entity the fragment is rendered from, serializable to JSON through to_dict or its attributes.
+            render_fragment (callable): Function rendering the fragment.
+
+        Returns:
+            Rendered fragment string.
+
+        """
+
+        key = self.key(kind, entity)
+        fragment = self.get(key)
+        if fragment is None:
+            fragment = render_fragment()
+            self.put(key, fragment)
+        return fragment
+
+
+def fragment_key(namespace, kind, entity):
+    """ Generate the content hash of a fragment rendered from a given entity.
+
+    Args:
+        namespace (string): Fragment cache namespace hash.
+        kind (string): Fragment kind.
+        entity: Entity the fragment is rendered from.
+
+    Returns:
+        Hexadecimal SHA-256 hash string.
+
+    """
+
+    entity_json = json.dumps(
+        entity, default=lambda o: o.to_dict() if hasattr(o, 'to_dict') else vars(o), sort_keys=True)
+    return hashlib.sha256(f'{namespace}\0{kind}\0{entity_json}'.encode('utf-8')).hexdigest()
+
+
+def load_fragment_cache(fragment_cache_file_path, namespace):
+    """ Load the cache of previously rendered fragments. Fragments are only loaded from a fragment cache
+    file with the current format version and the same namespace, otherwise none of them could be reused.
+
+    Args:
+        fragment_cache_file_path (string): Path to the fragment cache file.
+        namespace (list): Strings every fragment depends on.
+
+    Returns:
+        FragmentCache object.
+
+    """
+
+    fragment_cache = FragmentCache(namespace)
+    try:
+        with open(fragment_cache_file_path, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return fragment_cache
+    if isinstance(cached, dict) and cached.get('version') == FRAGMENT_CACHE_FORMAT_VERSION \
+            and cached.get('namespace') == fragment_cache.namespace and isinstance(cached.get('fragments'), dict):
+        fragment_cache.previous_fragments = cached['fragments']
+    return fragment_cache
+
+
+def write_fragment_cache(fragment_cache_file_path, fragment_cache):
+    """ Write the fragments used by the current render to file atomically as JSON, together with the
+    format version and namespace of the fragment cache.
+
+    Args:
+        fragment_cache_file_path (string): Path to the fragment cache file.
+        fragment_cache (FragmentCache): Fragment cache.
+
+    """
+
+    tmp_file_path = f'{fragment_cache_file_path}.{os.getpid()}.tmp'
+    with open(tmp_file_path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'version': FRAGMENT_CACHE_FORMAT_VERSION,
+            'namespace': fragment_cache.namespace,
+            'fragments': fragment_cache.fragments
+        }, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_file_path, fragment_cache_file_path)
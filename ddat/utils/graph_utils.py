@@ -0,0 +1,173 @@
+""" Compact node/edge graph utility functions. """
+
+import json
+import os
+
+# Graph format version.
+GRAPH_FORMAT_VERSION = 1
+
+# Layered layout dimensions.
+LAYOUT_LAYER_WIDTH = 1000
+LAYOUT_LAYER_SPACING = 250
+
+
+class StringTable:
+
+    def __init__(self):
+        """ Table of distinct strings, each referenced by its integer index, so that
+        strings repeated across a graph (IRIs, labels, types) are only written once.
+        """
+
+        self.strings = []
+        self._indexes = {}
+
+    def index(self, string):
+        """ Get the index of a string, adding it to the table if required.
+
+        Args:
+            string (string): String.
+
+        Returns:
+            Integer index of the string in the table.
+
+        """
+
+        index = self._indexes.get(string)
+        if index is None:
+            index = self._indexes[string] = len(self.strings)
+            self.strings.append(string)
+        return index
+
+
+class Graph:
+
+    def __init__(self):
+        """ Directed graph of typed nodes and typed edges stored column by column, with
+        every string held once in a string table and every node referenced by its index.
+        """
+
+        self.string_table = StringTable()
+        self.node_indexes = {}
+        self.node_iris = []
+        self.node_labels = []
+        self.node_types = []
+        self.node_layers = []
+        self.edge_sources = []
+        self.edge_targets = []
+        self.edge_types = []
+        self._edges = set()
+
+    def add_node(self, iri, label, node_type, layer):
+        """ Add a node to the graph. Nodes are identified by IRI, so a node is only added once.
+
+        Args:
+            iri (string): Node IRI.
+            label (string): Node label.
+            node_type (string): Node type.
+            layer (int): Node layer in the layered layout.
+
+        Returns:
+            Integer index of the node.
+
+        """
+
+        node_index = self.node_indexes.get(iri)
+        if node_index is not None:
+            return node_index
+        node_index = self.node_indexes[iri] = len(self.node_iris)
+        self.node_iris.append(self.string_table.index(iri))
+        self.node_labels.append(self.string_table.index(label))
+        self.node_types.append(self.string_table.index(node_type))
+        self.node_layers.append(layer)
+        return node_index
+
+    def add_edge(self, source_iri, target_iri, edge_type):
+        """ Add an edge between two nodes of the graph. Duplicate edges, and edges to or from
+        unknown nodes, are ignored.
+
+        Args:
+            source_iri (string): Source node IRI.
+            target_iri (string): Target node IRI.
+            edge_type (string): Edge type.
+
+        """
+
+        source = self.node_indexes.get(source_iri)
+        target = self.node_indexes.get(target_iri)
+        if source is None or target is None:
+            return
+        edge = (source, target, self.string_table.index(edge_type))
+        if edge not in self._edges:
+            self._edges.add(edge)
+            self.edge_sources.append(source)
+            self.edge_targets.append(target)
+            self.edge_types.append(edge[2])
+
+    def layout(self):
+        """ Compute a deterministic layered layout, with one horizontal layer per node layer. Nodes
+        are ordered within their layer by the mean position of the nodes they link to in the layers
+        above (the barycentre heuristic), reducing edge crossings, then spread evenly across the layer.
+
+        Returns:
+            Tuple of lists of integer x and y coordinates, indexed by node.
+
+        """
+
+        neighbours = [[] for _ in self.node_iris]
+        for source, target in zip(self.edge_sources, self.edge_targets):
+            neighbours[source].append(target)
+            neighbours[target].append(source)
+
+        x = [0] * len(self.node_iris)
+        y = [layer * LAYOUT_LAYER_SPACING for layer in self.node_layers]
+        for layer in sorted(set(self.node_layers)):
+            layer_nodes = [node for node, node_layer in enumerate(self.node_layers) if node_layer == layer]
+
+            def barycentre(node):
+                """ Mean x coordinate of the neighbours of a node in the layers above. """
+
+                above = [x[neighbour] for neighbour in neighbours[node] if self.node_layers[neighbour] < layer]
+                return sum(above) / len(above) if above else 0
+
+            layer_nodes.sort(key=lambda node: (barycentre(node), node))
+            spacing = LAYOUT_LAYER_WIDTH / len(layer_nodes)
+            for position, node in enumerate(layer_nodes):
+                x[node] = round(spacing * (position + 0.5))
+        return x, y
+
+    def to_dict(self, layout=False):
+        """ Serialize the graph as a dictionary of columns.
+
+        Args:
+            layout (bool): Whether to include precomputed layout coordinates.
+
+        Returns:
+            Dictionary holding the format version, string table, node columns and edge columns.
+
+        """
+
+        nodes = {'iri': self.node_iris, 'label': self.node_labels, 'type': self.node_types}
+        if layout:
+            nodes['x'], nodes['y'] = self.layout()
+        return {
+            'version': GRAPH_FORMAT_VERSION,
+            'strings': self.string_table.strings,
+            'nodes': nodes,
+            'edges': {'source': self.edge_sources, 'target': self.edge_targets, 'type': self.edge_types}
+        }
+
+
+def write_graph(graph_file_path, graph, layout=False):
+    """ Write a graph to file atomically as compact JSON.
+
+    Args:
+        graph_file_path (string): Path to the graph file.
+        graph (Graph): Graph.
+        layout (bool): Whether to include precomputed layout coordinates.
+
+    """
+
+    tmp_file_path = f'{graph_file_path}.{os.getpid()}.tmp'
+    with open(tmp_file_path, 'w', encoding='utf-8') as f:
+        json.dump(graph.to_dict(layout), f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_file_path, graph_file_path)
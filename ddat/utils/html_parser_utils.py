@@ -1,21 +1,79 @@
 """ Collection of custom HTML parsing utility functions for Python. """
 
-from selenium.webdriver.common.by import By
+import lxml.html
 
 
-def ul_to_list(ul_elem):
-    """ Load a Python list with the contents of an unordered list HTML element.
+def parse_html(page_source, base_url=None):
+    """ Parse an HTML page source into an lxml element tree.
 
     Args:
-         ul_elem: HTML UL element.
+        page_source (string): HTML page source.
+        base_url (string): URL of the page used to resolve relative links (optional).
+
+    Returns:
+        Root lxml HTML element.
+
+    """
+
+    root_elem = lxml.html.fromstring(page_source)
+    if base_url:
+        root_elem.make_links_absolute(base_url, resolve_base_href=True)
+    return root_elem
+
+
+def xpath_has_class(class_name):
+    """ Generate an XPath predicate expression matching elements with a given HTML class,
+    equivalent to the CSS class selector .class_name.
+
+    Args:
+        class_name (string): HTML class name.
+
+    Returns:
+        XPath predicate expression string.
+
+    """
+
+    return f'contains(concat(" ", normalize-space(@class), " "), " {class_name} ")'
+
+
+def element_text(elem):
+    """ Get the whitespace-normalised text content of an lxml HTML element,
+    consistent with the rendered text returned by Selenium web elements.
+
+    Args:
+        elem: lxml HTML element.
+
+    Returns:
+        Text content of the element.
+
+    """
+
+    return ' '.join(elem.text_content().split())
+
+
+def tree_ul_to_list(ul_elem):
+    """ Load a Python list with the contents of an lxml unordered list HTML element.
+
+    Args:
+         ul_elem: lxml HTML UL element.
 
     Returns:
         List containing the contents of the unordered list HTML element.
 
     """
 
-    ul_list = []
-    li_elems = ul_elem.find_elements(By.TAG_NAME, "li")
-    for li_elem in li_elems:
-        ul_list.append(li_elem.text)
-    return ul_list
+    return [element_text(li_elem) for li_elem in ul_elem.iter('li')]
+
+
+def elements_to_string(elems):
+    """ Serialize a sequence of lxml HTML elements (excluding their tails) to a single HTML string.
+
+    Args:
+        elems (list): lxml HTML elements.
+
+    Returns:
+        HTML string.
+
+    """
+
+    return ''.join(lxml.html.tostring(elem, encoding='unicode', with_tail=False) for elem in elems)
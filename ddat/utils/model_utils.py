@@ -0,0 +1,283 @@
+""" Pre-defined ontology data model repository utility functions. """
+
+import hashlib
+import json
+import os
+import threading
+
+from ddat.classes.model import AnnotationProperty, ClassBranch, ClassDiscipline, ClassThing, ModelRepository, \
+    ObjectProperty, OntologyMetadata
+from ddat.config.logging_config import logger
+
+# Model file names.
+MODEL_ONTOLOGY_METADATA_FILE_NAME = 'ontology_metadata.json'
+MODEL_ANNOTATION_PROPERTIES_FILE_NAME = 'annotation_properties.json'
+MODEL_OBJECT_PROPERTIES_FILE_NAME = 'object_properties.json'
+MODEL_CLASS_THINGS_FILE_NAME = 'class_things.json'
+MODEL_CLASS_DISCIPLINES_FILE_NAME = 'class_disciplines.json'
+MODEL_CLASS_BRANCHES_FILE_NAME = 'class_branches.json'
+
+# Model object class of every list model file, keyed by file name.
+MODEL_LIST_FILE_CLASSES = {
+    MODEL_ANNOTATION_PROPERTIES_FILE_NAME: AnnotationProperty,
+    MODEL_OBJECT_PROPERTIES_FILE_NAME: ObjectProperty,
+    MODEL_CLASS_THINGS_FILE_NAME: ClassThing,
+    MODEL_CLASS_DISCIPLINES_FILE_NAME: ClassDiscipline,
+    MODEL_CLASS_BRANCHES_FILE_NAME: ClassBranch
+}
+
+# Model file names, in loading order.
+MODEL_FILE_NAMES = (MODEL_ONTOLOGY_METADATA_FILE_NAME, *MODEL_LIST_FILE_CLASSES)
+
+# Compiled model cache file relative path. The cache format version is incremented whenever
+# the cache file layout or the model classes change, invalidating previously compiled caches.
+MODEL_CACHE_FILE_PATH = 'cache/model/ontology.json'
+MODEL_CACHE_FORMAT_VERSION = 2
+
+# Model repositories already loaded by this process, keyed by absolute model directory path.
+_repositories = {}
+_repositories_lock = threading.Lock()
+
+
+def load_model_repository(ontology_model_dir_path, base_working_dir=None):
+    """ Load the pre-defined ontology data model, once per process. The model files are only parsed
+    and validated when they have changed since they were last compiled, otherwise the repository
+    is loaded from the in-process cache or from the compiled model cache in the working directory.
+    Model files are considered unchanged when their sizes and modification times are unchanged,
+    or failing that when their content hashes are unchanged.
+
+    Args:
+        ontology_model_dir_path (string): Path to the directory holding the pre-defined ontology data model.
+        base_working_dir (string): Path to the base working directory holding the compiled model cache
+            (optional). If not given, the compiled model cache is not used.
+
+    Returns:
+        ModelRepository object.
+
+    Raises:
+        ValueError: If a model file is invalid.
+
+    """
+
+    model_dir_path = os.path.abspath(ontology_model_dir_path)
+    file_stats = model_file_stats(model_dir_path)
+    with _repositories_lock:
+        cached = _repositories.get(model_dir_path)
+        if cached is not None and cached[0] == file_stats:
+            return cached[1]
+
+        cache_file_path = f'{base_working_dir}/{MODEL_CACHE_FILE_PATH}' if base_working_dir is not None else None
+        compiled = load_compiled_model(cache_file_path, model_dir_path) if cache_file_path is not None else None
+        repository = None
+        if compiled is not None and compiled['file_stats'] == file_stats:
+            repository = compiled['repository']
+        else:
+            file_hashes = model_file_hashes(model_dir_path)
+            if compiled is not None and compiled['file_hashes'] == file_hashes:
+                repository = compiled['repository']
+            else:
+                logger.info(f'Compiling the ontology data model in {model_dir_path}...')
+                repository = compile_model_repository(model_dir_path)
+            if cache_file_path is not None:
+                write_compiled_model(cache_file_path, model_dir_path, file_stats, file_hashes, repository)
+
+        _repositories[model_dir_path] = (file_stats, repository)
+        return repository
+
+
+def model_file_stats(model_dir_path):
+    """ Get the size and modification time of every model file.
+
+    Args:
+        model_dir_path (string): Path to the model directory.
+
+    Returns:
+        Tuple of tuples of file name, size in bytes and modification time in nanoseconds.
+
+    """
+
+    stats = []
+    for file_name in MODEL_FILE_NAMES:
+        stat = os.stat(f'{model_dir_path}/{file_name}')
+        stats.append((file_name, stat.st_size, stat.st_mtime_ns))
+    return tuple(stats)
+
+
+def model_file_hashes(model_dir_path):
+    """ Get the SHA-256 content hash of every model file.
+
+    Args:
+        model_dir_path (string): Path to the model directory.
+
+    Returns:
+        Tuple of tuples of file name and hexadecimal content hash.
+
+    """
+
+    hashes = []
+    for file_name in MODEL_FILE_NAMES:
+        with open(f'{model_dir_path}/{file_name}', 'rb') as f:
+            hashes.append((file_name, hashlib.sha256(f.read()).hexdigest()))
+    return tuple(hashes)
+
+
+def compile_model_repository(model_dir_path):
+    """ Parse and validate the model files into a model repository.
+
+    Args:
+        model_dir_path (string): Path to the model directory.
+
+    Returns:
+        ModelRepository object.
+
+    Raises:
+        ValueError: If a model file is invalid.
+
+    """
+
+    repository_dict = {}
+    for file_name in MODEL_FILE_NAMES:
+        with open(f'{model_dir_path}/{file_name}', 'r') as f:
+            repository_dict[file_name] = json.load(f)
+        if file_name in MODEL_LIST_FILE_CLASSES and not isinstance(repository_dict[file_name], list):
+            raise ValueError(f'Invalid {file_name}: expected a list of objects')
+
+    repository = repository_from_dict(repository_dict)
+    validate_model_repository(repository)
+    return repository
+
+
+def validate_model_repository(repository):
+    """ Validate the identifiers and cross-references of a model repository.
+
+    Args:
+        repository (ModelRepository): Model repository.
+
+    Raises:
+        ValueError: If an identifier is duplicated or a cross-reference is unknown.
+
+    """
+
+    model_ids = {}
+    for file_name in MODEL_LIST_FILE_CLASSES:
+        model_objects = getattr(repository, file_name.removesuffix('.json'))
+        ids = model_ids[file_name] = set()
+        for model_object in model_objects:
+            if model_object.id in ids:
+                raise ValueError(f'Invalid {file_name}: duplicate id {model_object.id}')
+            ids.add(model_object.id)
+
+    references = (
+        (MODEL_CLASS_DISCIPLINES_FILE_NAME, 'thing_id', MODEL_CLASS_THINGS_FILE_NAME),
+        (MODEL_CLASS_DISCIPLINES_FILE_NAME, 'object_property_id', MODEL_OBJECT_PROPERTIES_FILE_NAME),
+        (MODEL_CLASS_BRANCHES_FILE_NAME, 'discipline_id', MODEL_CLASS_DISCIPLINES_FILE_NAME),
+        (MODEL_CLASS_BRANCHES_FILE_NAME, 'object_property_id', MODEL_OBJECT_PROPERTIES_FILE_NAME)
+    )
+    for file_name, key, referenced_file_name in references:
+        for model_object in getattr(repository, file_name.removesuffix('.json')):
+            if getattr(model_object, key) not in model_ids[referenced_file_name]:
+                raise ValueError(f'Invalid {file_name}: {model_object.id} references unknown {key} '
+                                 f'{getattr(model_object, key)}')
+
+
+def load_compiled_model(cache_file_path, model_dir_path):
+    """ Load the compiled model cache. The model repository is only deserialized once the cache
+    has been checked to have the current format version and the same model directory.
+
+    Args:
+        cache_file_path (string): Path to the compiled model cache file.
+        model_dir_path (string): Path to the model directory.
+
+    Returns:
+        Dictionary holding the model file stats, file hashes and model repository, or None if the
+        cache does not exist, is unreadable, has another format version or another model directory.
+
+    """
+
+    try:
+        with open(cache_file_path, 'r', encoding='utf-8') as f:
+            compiled = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(compiled, dict) or compiled.get('version') != MODEL_CACHE_FORMAT_VERSION \
+            or compiled.get('model_dir_path') != model_dir_path:
+        return None
+    try:
+        return {
+            'file_stats': tuple(tuple(file_stat) for file_stat in compiled['file_stats']),
+            'file_hashes': tuple(tuple(file_hash) for file_hash in compiled['file_hashes']),
+            'repository': repository_from_dict(compiled['repository'])
+        }
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def write_compiled_model(cache_file_path, model_dir_path, file_stats, file_hashes, repository):
+    """ Write the compiled model cache atomically as JSON.
+
+    Args:
+        cache_file_path (string): Path to the compiled model cache file.
+        model_dir_path (string): Path to the model directory.
+        file_stats (tuple): Model file stats, as returned by model_file_stats.
+        file_hashes (tuple): Model file hashes, as returned by model_file_hashes.
+        repository (ModelRepository): Model repository.
+
+    """
+
+    compiled = {
+        'version': MODEL_CACHE_FORMAT_VERSION,
+        'model_dir_path': model_dir_path,
+        'file_stats': file_stats,
+        'file_hashes': file_hashes,
+        'repository': repository_to_dict(repository)
+    }
+    os.makedirs(os.path.dirname(cache_file_path), exist_ok=True)
+    tmp_file_path = f'{cache_file_path}.{os.getpid()}.tmp'
+    with open(tmp_file_path, 'w', encoding='utf-8') as f:
+        json.dump(compiled, f, ensure_ascii=False)
+    os.replace(tmp_file_path, cache_file_path)
+
+
+def repository_to_dict(repository):
+    """ Serialize a model repository as the JSON-compatible contents of its model files, keyed by file name.
+
+    Args:
+        repository (ModelRepository): Model repository.
+
+    Returns:
+        Dictionary of model file contents keyed by model file name.
+
+    """
+
+    repository_dict = {MODEL_ONTOLOGY_METADATA_FILE_NAME: repository.ontology_metadata.to_dict()}
+    for file_name in MODEL_LIST_FILE_CLASSES:
+        repository_dict[file_name] = [model_object.to_dict()
+                                      for model_object in getattr(repository, file_name.removesuffix('.json'))]
+    return repository_dict
+
+
+def repository_from_dict(repository_dict):
+    """ Deserialize a model repository from the contents of its model files, as returned by repository_to_dict.
+
+    Args:
+        repository_dict (dict): Dictionary of model file contents keyed by model file name.
+
+    Returns:
+        ModelRepository object.
+
+    Raises:
+        ValueError: If a model object is invalid.
+
+    """
+
+    model_lists = {file_name: tuple(model_class.from_dict(model_dict, file_name)
+                                    for model_dict in repository_dict[file_name])
+                   for file_name, model_class in MODEL_LIST_FILE_CLASSES.items()}
+    return ModelRepository(
+        ontology_metadata=OntologyMetadata.from_dict(
+            repository_dict[MODEL_ONTOLOGY_METADATA_FILE_NAME], MODEL_ONTOLOGY_METADATA_FILE_NAME),
+        annotation_properties=model_lists[MODEL_ANNOTATION_PROPERTIES_FILE_NAME],
+        object_properties=model_lists[MODEL_OBJECT_PROPERTIES_FILE_NAME],
+        class_things=model_lists[MODEL_CLASS_THINGS_FILE_NAME],
+        class_disciplines=model_lists[MODEL_CLASS_DISCIPLINES_FILE_NAME],
+        class_branches=model_lists[MODEL_CLASS_BRANCHES_FILE_NAME])
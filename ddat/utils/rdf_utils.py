@@ -0,0 +1,142 @@
+""" RDF triple and line-based RDF serialization utility functions. """
+
+import collections
+import re
+
+# RDF, RDFS, OWL, XSD, SKOS and Dublin Core namespace IRIs.
+RDF_NAMESPACE = 'http://www.w3.org/1999/02/22-rdf-syntax-ns#'
+RDFS_NAMESPACE = 'http://www.w3.org/2000/01/rdf-schema#'
+OWL_NAMESPACE = 'http://www.w3.org/2002/07/owl#'
+XSD_NAMESPACE = 'http://www.w3.org/2001/XMLSchema#'
+SKOS_NAMESPACE = 'http://www.w3.org/2004/02/skos/core#'
+DC_NAMESPACE = 'http://purl.org/dc/elements/1.1/'
+DC_TERMS_NAMESPACE = 'http://purl.org/dc/terms/'
+
+# Serialization formats.
+FORMAT_NTRIPLES = 'ntriples'
+FORMAT_TURTLE = 'turtle'
+
+# Literal characters escaped by the N-Triples and Turtle serializers.
+LITERAL_ESCAPES = {'\\': '\\\\', '"': '\\"', '\n': '\\n', '\r': '\\r', '\t': '\\t'}
+LITERAL_ESCAPE_PATTERN = re.compile(r'[\\"\n\r\t]')
+
+# IRI characters escaped by the N-Triples and Turtle serializers.
+IRI_ESCAPE_PATTERN = re.compile(r'[\x00-\x20<>"{}|^`\\]')
+
+# Turtle prefixed name local part pattern.
+TURTLE_LOCAL_NAME_PATTERN = re.compile(r'^[A-Za-z_][A-Za-z0-9_-]*$')
+
+
+class Iri(str):
+    """ IRI term. """
+
+
+class BlankNode(str):
+    """ Blank node term, identified by its label. """
+
+
+# Literal term with an optional language tag or datatype IRI.
+Literal = collections.namedtuple('Literal', ['value', 'lang', 'datatype'], defaults=[None, None])
+
+
+def ntriples_term(term):
+    """ Serialize an RDF term in N-Triples syntax.
+
+    Args:
+        term (Iri | BlankNode | Literal): RDF term.
+
+    Returns:
+        N-Triples term string.
+
+    """
+
+    if isinstance(term, Literal):
+        literal = f'"{escape_literal(term.value)}"'
+        if term.lang is not None:
+            return f'{literal}@{term.lang}'
+        if term.datatype is not None:
+            return f'{literal}^^{ntriples_term(term.datatype)}'
+        return literal
+    if isinstance(term, BlankNode):
+        return f'_:{term}'
+    escaped_iri = IRI_ESCAPE_PATTERN.sub(lambda m: '\\u%04X' % ord(m.group()), term)
+    return f'<{escaped_iri}>'
+
+
+def escape_literal(value):
+    """ Escape a literal value for use in an N-Triples or Turtle quoted string.
+
+    Args:
+        value (string): Literal value.
+
+    Returns:
+        Escaped literal value.
+
+    """
+
+    return LITERAL_ESCAPE_PATTERN.sub(lambda m: LITERAL_ESCAPES[m.group()], value)
+
+
+def iter_ntriples(triples):
+    """ Lazily serialize RDF triples as N-Triples, one line per triple.
+
+    Args:
+        triples (iterable): Tuples of subject, predicate and object terms.
+
+    Yields:
+        N-Triples line.
+
+    """
+
+    for subject, predicate, obj in triples:
+        yield f'{ntriples_term(subject)} {ntriples_term(predicate)} {ntriples_term(obj)} .\n'
+
+
+def turtle_term(term, prefixes):
+    """ Serialize an RDF term in Turtle syntax, abbreviating IRIs with the given prefixes.
+
+    Args:
+        term (Iri | BlankNode | Literal): RDF term.
+        prefixes (dict): Namespace IRIs keyed by prefix.
+
+    Returns:
+        Turtle term string.
+
+    """
+
+    if isinstance(term, Literal):
+        if term.datatype is not None and term.lang is None:
+            return f'"{escape_literal(term.value)}"^^{turtle_term(term.datatype, prefixes)}'
+        return ntriples_term(term)
+    if isinstance(term, Iri):
+        for prefix, namespace in prefixes.items():
+            local_name = term[len(namespace):]
+            if term.startswith(namespace) and TURTLE_LOCAL_NAME_PATTERN.match(local_name):
+                return f'{prefix}:{local_name}'
+    return ntriples_term(term)
+
+
+def iter_turtle(triples, prefixes):
+    """ Lazily serialize RDF triples as Turtle, one statement per run of consecutive triples
+    sharing a subject, so that the triples are never held in memory.
+
+    Args:
+        triples (iterable): Tuples of subject, predicate and object terms.
+        prefixes (dict): Namespace IRIs keyed by prefix.
+
+    Yields:
+        Turtle block.
+
+    """
+
+    yield ''.join(f'@prefix {prefix}: {ntriples_term(Iri(namespace))} .\n' for prefix, namespace in prefixes.items())
+    current_subject = None
+    for subject, predicate, obj in triples:
+        predicate_object = f'{turtle_term(predicate, prefixes)} {turtle_term(obj, prefixes)}'
+        if subject == current_subject and type(subject) is type(current_subject):
+            yield f' ;\n    {predicate_object}'
+        else:
+            yield f'{" ." if current_subject is not None else ""}\n{turtle_term(subject, prefixes)} {predicate_object}'
+            current_subject = subject
+    if current_subject is not None:
+        yield ' .\n'
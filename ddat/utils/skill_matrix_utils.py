@@ -0,0 +1,222 @@
+""" Role by skill level matrix utility functions. """
+
+import numpy as np
+import os
+import scipy.sparse
+
+# Skill levels in ordinal order. A role requiring a skill at the n-th skill level holds the ordinal
+# level n (from 1) in the matrix, and a role not requiring a skill holds 0.
+SKILL_LEVELS = ('AWARENESS', 'WORKING', 'PRACTITIONER', 'EXPERT')
+SKILL_LEVEL_ORDINALS = {skill_level: ordinal for ordinal, skill_level in enumerate(SKILL_LEVELS, start=1)}
+
+# Ordinal level matrix data type.
+SKILL_LEVEL_DTYPE = np.int8
+
+
+class SkillMatrix:
+
+    def __init__(self, role_ids, skill_ids, levels):
+        """ Sparse matrix of the ordinal skill levels required by roles, with one row per role
+        and one column per skill.
+
+        Args:
+            role_ids (list): Role IDs, indexing the matrix rows.
+            skill_ids (list): Skill IDs, indexing the matrix columns.
+            levels (scipy.sparse.csr_matrix): Ordinal skill levels, of shape (roles, skills).
+        """
+
+        self.role_ids = list(role_ids)
+        self.skill_ids = list(skill_ids)
+        self.levels = levels
+        self.role_indexes = {role_id: index for index, role_id in enumerate(self.role_ids)}
+        self.skill_indexes = {skill_id: index for index, skill_id in enumerate(self.skill_ids)}
+
+    @classmethod
+    def from_role_skills(cls, role_skills, skill_ids=None):
+        """ Build the matrix of the skill levels required by roles. Roles are identified by ID, so
+        only the first occurrence of a role is included.
+
+        Args:
+            role_skills (iterable): Tuples of role ID and dictionary of skill levels keyed by skill ID,
+                as in Role.skills.
+            skill_ids (list): Skill IDs, indexing the matrix columns (optional, defaults to the skills
+                required by the roles, in order of first occurrence). Skills not in the list are ignored.
+
+        Returns:
+            SkillMatrix object.
+
+        """
+
+        skill_indexes = {skill_id: index for index, skill_id in enumerate(skill_ids)} \
+            if skill_ids is not None else {}
+        role_ids, rows, columns, data = [], [], [], []
+        seen_role_ids = set()
+        for role_id, skills in role_skills:
+            if role_id in seen_role_ids:
+                continue
+            seen_role_ids.add(role_id)
+            for skill_id, skill_level in (skills or {}).items():
+                if skill_id not in skill_indexes:
+                    if skill_ids is not None:
+                        continue
+                    skill_indexes[skill_id] = len(skill_indexes)
+                rows.append(len(role_ids))
+                columns.append(skill_indexes[skill_id])
+                data.append(SKILL_LEVEL_ORDINALS[skill_level])
+            role_ids.append(role_id)
+
+        levels = scipy.sparse.csr_matrix(
+            (np.array(data, dtype=SKILL_LEVEL_DTYPE), (rows, columns)), shape=(len(role_ids), len(skill_indexes)))
+        return cls(role_ids, list(skill_indexes), levels)
+
+    def role_rows(self, role_ids):
+        """ Get the matrix row indexes of roles.
+
+        Args:
+            role_ids (list): Role IDs.
+
+        Returns:
+            Array of row indexes.
+
+        Raises:
+            KeyError: If a role is not in the matrix.
+
+        """
+
+        return np.fromiter((self.role_indexes[role_id] for role_id in role_ids), dtype=np.intp, count=len(role_ids))
+
+    def profile_levels(self, skill_profiles):
+        """ Build the matrix of the ordinal skill levels of skill profiles.
+
+        Args:
+            skill_profiles (list): Dictionaries of skill levels keyed by skill ID. Skills not in the matrix are ignored.
+
+        Returns:
+            scipy.sparse.csr_matrix of shape (profiles, skills).
+
+        """
+
+        rows, columns, data = [], [], []
+        for row, skill_profile in enumerate(skill_profiles):
+            for skill_id, skill_level in skill_profile.items():
+                column = self.skill_indexes.get(skill_id)
+                if column is not None:
+                    rows.append(row)
+                    columns.append(column)
+                    data.append(SKILL_LEVEL_ORDINALS[skill_level])
+        return scipy.sparse.csr_matrix((np.array(data, dtype=SKILL_LEVEL_DTYPE), (rows, columns)),
+                                       shape=(len(skill_profiles), len(self.skill_ids)))
+
+    def skill_gaps(self, from_role_ids, to_role_ids):
+        """ Compute the skill gaps between pairs of roles, being the number of skill levels by which
+        each skill required by the role moved to exceeds the level held in the role moved from.
+
+        Args:
+            from_role_ids (list): IDs of the roles moved from.
+            to_role_ids (list): IDs of the roles moved to, paired with the roles moved from.
+
+        Returns:
+            numpy.ndarray of shape (pairs, skills) of non-negative skill level gaps.
+
+        """
+
+        from_levels = self.levels[self.role_rows(from_role_ids)].toarray()
+        to_levels = self.levels[self.role_rows(to_role_ids)].toarray()
+        return np.maximum(to_levels - from_levels, 0)
+
+    def similarities(self, skill_levels=None):
+        """ Compute the cosine similarities between the skill levels of roles, or of given skill levels
+        and roles. Roles and skill levels not requiring any skill have a similarity of 0.
+
+        Args:
+            skill_levels (scipy.sparse.csr_matrix): Ordinal skill levels of shape (n, skills) (optional,
+                defaults to the skill levels of all the roles).
+
+        Returns:
+            numpy.ndarray of shape (n, roles) of similarities between 0 and 1.
+
+        """
+
+        role_levels = normalize_rows(self.levels)
+        other_levels = normalize_rows(skill_levels) if skill_levels is not None else role_levels
+        return (other_levels @ role_levels.T).toarray()
+
+    def closest_roles(self, skill_profiles, top_n=10):
+        """ Find the roles whose skill levels are the most similar to each of the given skill profiles.
+
+        Args:
+            skill_profiles (list): Dictionaries of skill levels keyed by skill ID.
+            top_n (int): Maximum number of roles to find per skill profile.
+
+        Returns:
+            List of lists of tuples of role ID and similarity, most similar first, one list per skill profile.
+
+        """
+
+        similarities = self.similarities(self.profile_levels(skill_profiles))
+        top_n = min(top_n, len(self.role_ids))
+        if top_n <= 0:
+            return [[] for _ in skill_profiles]
+        top_rows = np.argpartition(-similarities, top_n - 1, axis=1)[:, :top_n]
+        closest_roles = []
+        for profile_similarities, profile_top_rows in zip(similarities, top_rows):
+            profile_top_rows = profile_top_rows[np.lexsort((profile_top_rows, -profile_similarities[profile_top_rows]))]
+            closest_roles.append([(self.role_ids[row], float(profile_similarities[row])) for row in profile_top_rows])
+        return closest_roles
+
+
+def normalize_rows(matrix):
+    """ Scale the rows of a sparse matrix to unit Euclidean length, leaving all-zero rows unchanged.
+
+    Args:
+        matrix (scipy.sparse.csr_matrix): Sparse matrix.
+
+    Returns:
+        scipy.sparse.csr_matrix of floating point values.
+
+    """
+
+    matrix = matrix.astype(np.float64)
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    return scipy.sparse.diags(1 / norms) @ matrix
+
+
+def write_skill_matrix(skill_matrix_file_path, skill_matrix):
+    """ Write a skill matrix to file atomically as a compressed NumPy archive holding the matrix in
+    compressed sparse row format together with its role and skill IDs.
+
+    Args:
+        skill_matrix_file_path (string): Path to the skill matrix file.
+        skill_matrix (SkillMatrix): Skill matrix.
+
+    """
+
+    levels = skill_matrix.levels
+    tmp_file_path = f'{skill_matrix_file_path}.{os.getpid()}.tmp'
+    with open(tmp_file_path, 'wb') as f:
+        np.savez_compressed(
+            f, data=levels.data, indices=levels.indices, indptr=levels.indptr, shape=np.array(levels.shape),
+            role_ids=np.array(skill_matrix.role_ids, dtype=str), skill_ids=np.array(skill_matrix.skill_ids, dtype=str),
+            skill_levels=np.array(SKILL_LEVELS, dtype=str))
+    os.replace(tmp_file_path, skill_matrix_file_path)
+
+
+def load_skill_matrix(skill_matrix_file_path):
+    """ Load a skill matrix from file.
+
+    Args:
+        skill_matrix_file_path (string): Path to the skill matrix file.
+
+    Returns:
+        SkillMatrix object, or None if there is no skill matrix file.
+
+    """
+
+    try:
+        with np.load(skill_matrix_file_path) as archive:
+            levels = scipy.sparse.csr_matrix(
+                (archive['data'], archive['indices'], archive['indptr']), shape=tuple(archive['shape']))
+            return SkillMatrix(archive['role_ids'].tolist(), archive['skill_ids'].tolist(), levels)
+    except FileNotFoundError:
+        return None
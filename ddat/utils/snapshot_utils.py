@@ -0,0 +1,191 @@
+""" Incremental parsing snapshot utility functions. """
+
+import hashlib
+import json
+import os
+
+# Manifest change types.
+CHANGE_ADDED = 'added'
+CHANGE_CHANGED = 'changed'
+CHANGE_REMOVED = 'removed'
+
+
+class IncrementalSnapshot:
+
+    def __init__(self, previous_entities, previous_manifest, previous_sources=None, parser_version=None,
+                 reusable=True):
+        """ Snapshot of the previously parsed entities and the content hashes of the web page
+        sections they were parsed from, used to reuse entities whose sections are unchanged,
+        together with the content hashes of the web pages they were parsed from, used to reuse
+        all the entities of a web page that is unchanged.
+
+        Args:
+            previous_entities (dict): Previously parsed entities keyed by entity key.
+            previous_manifest (dict): Previous manifest entries keyed by entity key.
+            previous_sources (dict): Previous web page content hashes keyed by web page URL (optional).
+            parser_version (string): Version of the parser parsing the entities (optional).
+            reusable (bool): Whether the previously parsed entities may be reused, which is not the case
+                when they were parsed by another parser version. They are still compared with the
+                current entities to report the changes since the previous snapshot.
+        """
+
+        self.previous_entities = previous_entities
+        self.previous_manifest = previous_manifest
+        self.previous_sources = previous_sources or {}
+        self.parser_version = parser_version
+        self.reusable = reusable
+        self.content_hashes = {}
+        self.sources = {}
+
+    def reuse(self, key, content_hash):
+        """ Record the content hash of an entity's web page section and return the previously
+        parsed entity if the section is unchanged.
+
+        Args:
+            key (string): Entity key.
+            content_hash (string): Content hash of the web page section the entity is parsed from.
+
+        Returns:
+            Previously parsed entity, or None if the entity must be parsed.
+
+        """
+
+        self.content_hashes[key] = content_hash
+        previous_manifest_entry = self.previous_manifest.get(key)
+        if self.reusable and previous_manifest_entry is not None and previous_manifest_entry['content_hash'] == content_hash:
+            return self.previous_entities.get(key)
+        return None
+
+    def record_source(self, url, page_source):
+        """ Record the content hash of a web page the entities are parsed from.
+
+        Args:
+            url (string): Web page URL.
+            page_source (string): Web page source.
+
+        Returns:
+            True if the web page is unchanged since the previously parsed entities were parsed from it.
+
+        """
+
+        self.sources[url] = content_hash(page_source)
+        return self.reusable and self.previous_sources.get(url) == self.sources[url]
+
+    def forget_source(self, url):
+        """ Forget the content hash of a web page whose entities were not all parsed, so that
+        its entities are not reused as a whole by the next snapshot.
+
+        Args:
+            url (string): Web page URL.
+
+        """
+
+        self.sources.pop(url, None)
+
+    def keep(self, key):
+        """ Carry over the previous content hash of an entity reused as a whole, for example
+        from a web page that was not modified since it was last fetched.
+
+        Args:
+            key (string): Entity key.
+
+        """
+
+        previous_manifest_entry = self.previous_manifest.get(key)
+        self.content_hashes[key] = previous_manifest_entry['content_hash'] if previous_manifest_entry else None
+
+    def generate_manifest(self, entities):
+        """ Generate the manifest entries of the current entities and the changes since the previous snapshot.
+
+        Args:
+            entities (dict): Current entities keyed by entity key.
+
+        Returns:
+            Tuple of the manifest entries keyed by entity key and the dictionary of changed entity keys.
+
+        """
+
+        manifest = {key: {'content_hash': self.content_hashes.get(key), 'entity_hash': entity_hash(entity)}
+                    for key, entity in entities.items()}
+        changes = {
+            CHANGE_ADDED: [key for key in manifest if key not in self.previous_manifest],
+            CHANGE_CHANGED: [key for key in manifest if key in self.previous_manifest and
+                             manifest[key]['entity_hash'] != self.previous_manifest[key]['entity_hash']],
+            CHANGE_REMOVED: [key for key in self.previous_manifest if key not in manifest]
+        }
+        return manifest, changes
+
+
+def content_hash(content):
+    """ Generate the SHA-256 hash of a given string.
+
+    Args:
+        content (string): String to hash.
+
+    Returns:
+        Hexadecimal SHA-256 hash string.
+
+    """
+
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+def entity_hash(entity):
+    """ Generate the SHA-256 hash of the JSON serialization of a parsed entity.
+
+    Args:
+        entity: Parsed entity (e.g. Skill or Role object) providing a to_json method.
+
+    Returns:
+        Hexadecimal SHA-256 hash string.
+
+    """
+
+    return content_hash(entity.to_json())
+
+
+def load_snapshot(manifest_file_path, previous_entities, key, parser_version=None):
+    """ Load the incremental snapshot of previously parsed entities and their manifest. Previously
+    parsed entities are only reused if they were parsed by the given parser version.
+
+    Args:
+        manifest_file_path (string): Path to the previous manifest file.
+        previous_entities (list): Previously parsed entities, or None if there are none.
+        key (callable): Function returning the entity key of an entity.
+        parser_version (string): Version of the parser parsing the entities (optional).
+
+    Returns:
+        IncrementalSnapshot object.
+
+    """
+
+    # The manifest is only meaningful together with the entities it describes.
+    previous_manifest = {}
+    previous_sources = {}
+    reusable = True
+    if previous_entities is not None and os.path.exists(manifest_file_path):
+        with open(manifest_file_path, 'r') as f:
+            manifest = json.load(f)
+        previous_manifest = manifest['entities']
+        previous_sources = manifest.get('sources', {})
+        reusable = manifest.get('parser_version') == parser_version
+    return IncrementalSnapshot({key(entity): entity for entity in previous_entities or []}, previous_manifest,
+                               previous_sources, parser_version, reusable)
+
+
+def write_manifest(manifest_file_path, manifest, changes, sources=None, parser_version=None):
+    """ Write a manifest of parsed entities and the changes since the previous snapshot to file.
+
+    Args:
+        manifest_file_path (string): Path to the manifest file.
+        manifest (dict): Manifest entries keyed by entity key.
+        changes (dict): Dictionary of added, changed and removed entity keys.
+        sources (dict): Content hashes of the web pages the entities were parsed from, keyed by web page URL
+            (optional).
+        parser_version (string): Version of the parser that parsed the entities (optional).
+
+    """
+
+    with open(manifest_file_path, 'w') as f:
+        json.dump({'parser_version': parser_version, 'entities': manifest, 'changes': changes,
+                   'sources': sources or {}}, f, indent=4)
@@ -1,7 +1,395 @@
 """ DDaT ontology visualisation utility functions. """
 
-# Filter windows.
-CLASS_THING_SKILL_LINE_COUNT = 5
+import copy
+import re
+
+# Filter file read and write buffer size in bytes.
+FILTER_BUFFER_SIZE = 1024 * 1024
+
+# OWL RDF/XML element names and attributes matched by the filters.
+OWL_CLASS_ELEMENT = 'owl:Class'
+OWL_ANNOTATION_PROPERTY_ELEMENT = 'owl:AnnotationProperty'
+OWL_OBJECT_PROPERTY_ELEMENT = 'owl:ObjectProperty'
+OWL_ON_PROPERTY_ELEMENT = 'owl:onProperty'
+OWL_SOME_VALUES_FROM_ELEMENT = 'owl:someValuesFrom'
+RDFS_SUBCLASS_OF_ELEMENT = 'rdfs:subClassOf'
+RDFS_LABEL_ELEMENT = 'rdfs:label'
+ENTITY_TYPE_ELEMENT = 'entityType'
+RDF_ABOUT_ATTRIBUTE = 'rdf:about'
+RDF_RESOURCE_ATTRIBUTE = 'rdf:resource'
+
+# Entity types matched by the filters.
+ENTITY_TYPE_DISCIPLINE = 'Discipline'
+ENTITY_TYPE_BRANCH = 'Branch'
+ENTITY_TYPE_ROLE = 'Role'
+
+# Filter types declared in the visualisation variant configuration.
+FILTER_TYPE_DROP_CLASSES = 'drop_classes'
+FILTER_TYPE_DROP_ENTITY_TYPES = 'drop_entity_types'
+FILTER_TYPE_DROP_ANNOTATION_PROPERTIES = 'drop_annotation_properties'
+FILTER_TYPE_COLLAPSE_SKILL_LEVELS = 'collapse_skill_levels'
+FILTER_TYPE_RESTRICT_DISCIPLINES = 'restrict_disciplines'
+
+# XML markup patterns. Tags may span lines and attribute values may contain '>'. Comments, CDATA sections
+# and processing instructions, which may contain '>', only match once their closing delimiter is read.
+XML_MARKUP_PATTERN = re.compile(
+    r'<!--.*?-->|<\?.*?\?>|<!\[CDATA\[.*?\]\]>|<!(?!--|\[CDATA\[)[^>]*>'
+    r'|<[^!?>"\'][^>"\']*(?:(?:"[^"]*"|\'[^\']*\')[^>"\']*)*>', re.DOTALL)
+XML_TAG_NAME_PATTERN = re.compile(r'</?\s*([^\s/>]+)')
+XML_ATTRIBUTE_PATTERN = re.compile(r'([^\s=/>]+)\s*=\s*(?:"([^"]*)"|\'([^\']*)\')')
+
+# XML event types.
+XML_EVENT_TEXT = 'text'
+XML_EVENT_START = 'start'
+XML_EVENT_END = 'end'
+XML_EVENT_EMPTY = 'empty'
+XML_EVENT_OTHER = 'other'
+
+
+class XmlElement:
+
+    def __init__(self, start_tag, name, attributes, empty=False):
+        """ XML element holding the raw markup and text of the element and its descendants, so that
+        the element can be inspected and edited, then written back byte for byte where unchanged.
+
+        Args:
+            start_tag (string): Raw start tag (or empty-element tag).
+            name (string): Element name.
+            attributes (dict): Element attributes.
+            empty (bool): Whether the element is an empty-element tag.
+        """
+
+        self.start_tag = start_tag
+        self.name = name
+        self.attributes = attributes
+        self.children = None if empty else []
+        self.end_tag = ''
+
+    def raw(self):
+        """ Raw XML string of the element and its descendants. """
+
+        content = ''.join(child if isinstance(child, str) else child.raw() for child in self.children or [])
+        return f'{self.start_tag}{content}{self.end_tag}'
+
+    def text(self):
+        """ Text content of the element, excluding the text of its descendant elements. """
+
+        return ''.join(child for child in self.children or [] if isinstance(child, str) and not child.startswith('<'))
+
+    def iter_elements(self, name=None):
+        """ Lazily iterate the descendant elements of the element in document order.
+
+        Args:
+            name (string): Name of the descendant elements to iterate (optional, defaults to all).
+
+        Yields:
+            XmlElement object.
+
+        """
+
+        for child in self.children or []:
+            if isinstance(child, XmlElement):
+                if name is None or child.name == name:
+                    yield child
+                yield from child.iter_elements(name)
+
+    def find_text(self, name):
+        """ Text content of the first descendant element with a given name, or None. """
+
+        return next((element.text() for element in self.iter_elements(name)), None)
+
+    def set_attribute(self, name, value):
+        """ Set the value of an existing attribute, leaving the rest of the start tag as it is.
+
+        Args:
+            name (string): Attribute name.
+            value (string): Attribute value.
+
+        """
+
+        self.start_tag = re.sub(
+            rf'(\s{re.escape(name)}\s*=\s*)(?:"[^"]*"|\'[^\']*\')',
+            lambda m: f'{m.group(1)}"{value}"', self.start_tag, count=1)
+        self.attributes[name] = value
+
+    def set_text(self, text):
+        """ Replace the content of the element with a given text. """
+
+        self.children = [text]
+
+    def remove_children(self, remove_element):
+        """ Remove the child elements selected by a given predicate, as well as the indentation
+        and line break of removed child elements that occupied their own lines.
+
+        Args:
+            remove_element (callable): Predicate called with each child XmlElement object.
+
+        """
+
+        if self.children is None:
+            return
+        writer = FilteredXmlWriter()
+        for child in self.children:
+            if isinstance(child, str):
+                writer.write_text(child)
+            elif remove_element(child):
+                writer.drop_element()
+            else:
+                writer.write_element(child)
+        self.children = writer.close()
+
+
+class FilteredXmlWriter:
+
+    def __init__(self, f=None):
+        """ Writer of the text and elements remaining after filtering a sequence of sibling XML nodes.
+        The indentation before, and line break after, a dropped element are dropped with it, so
+        that filtering does not leave empty lines behind.
+
+        Args:
+            f (file): File handle to write to (optional, otherwise the remaining nodes are collected).
+        """
+
+        self.f = f
+        self.nodes = []
+        self.pending_text = ''
+        self.strip_line_end = False
+
+    def _write(self, node):
+        """ Write a node to file, or collect it. """
+
+        if self.f is not None:
+            self.f.write(node if isinstance(node, str) else node.raw())
+        elif node != '':
+            self.nodes.append(node)
+
+    def write_text(self, text):
+        """ Write text or non-element markup, holding it back until the next element is written or dropped. """
+
+        if self.strip_line_end:
+            line_end, newline, rest = text.partition('\n')
+            if newline and not line_end.strip():
+                text = rest
+            self.strip_line_end = not newline and not line_end.strip()
+        self.pending_text += text
+
+    def write_element(self, element):
+        """ Write an element. """
+
+        self._write(self.pending_text)
+        self._write(element)
+        self.pending_text = ''
+        self.strip_line_end = False
+
+    def drop_element(self):
+        """ Drop an element, together with its indentation and line break if it occupied its own lines. """
+
+        line_start, newline, indentation = self.pending_text.rpartition('\n')
+        if newline and not indentation.strip():
+            self.pending_text = f'{line_start}{newline}'
+        self._write(self.pending_text)
+        self.pending_text = ''
+        self.strip_line_end = True
+
+    def close(self):
+        """ Write the remaining text.
+
+        Returns:
+            List of collected nodes.
+
+        """
+
+        self._write(self.pending_text)
+        self.pending_text = ''
+        return self.nodes
+
+
+class OwlFilter:
+
+    def filter_element(self, element):
+        """ Filter a top-level element of an OWL RDF/XML document. Elements are filtered in document
+        order, so filters may hold state such as the classes they have dropped so far.
+
+        Args:
+            element (XmlElement): Top-level element, which the filter may edit in place.
+
+        Returns:
+            Filtered XmlElement object, or None to drop the element.
+
+        """
+
+        return element
+
+
+class DropClassesFilter(OwlFilter):
+
+    def __init__(self, class_iris=None, entity_types=None):
+        """ Filter dropping classes by IRI or entity type, together with the subclass relationships
+        and restrictions referencing them. As the document is filtered in a single pass, references
+        are removed from the elements following a dropped class, which holds for the modelled DDaT
+        ontology where things, disciplines, branches, skills and roles are written in that order.
+
+        Args:
+            class_iris (list): IRIs of the classes to drop (optional).
+            entity_types (list): Entity types of the classes to drop (optional).
+        """
+
+        self.dropped_class_iris = set(class_iris or [])
+        self.entity_types = set(entity_types or [])
+
+    def drop_class(self, element):
+        """ Whether to drop a given class element. """
+
+        return element.attributes.get(RDF_ABOUT_ATTRIBUTE) in self.dropped_class_iris or \
+            element.find_text(ENTITY_TYPE_ELEMENT) in self.entity_types
+
+    def references_dropped_class(self, element):
+        """ Whether a given subclass relationship or restriction references a dropped class. """
+
+        return element.attributes.get(RDF_RESOURCE_ATTRIBUTE) in self.dropped_class_iris or \
+            any(values.attributes.get(RDF_RESOURCE_ATTRIBUTE) in self.dropped_class_iris
+                for values in element.iter_elements(OWL_SOME_VALUES_FROM_ELEMENT))
+
+    def filter_element(self, element):
+        if element.name == OWL_CLASS_ELEMENT and self.drop_class(element):
+            self.dropped_class_iris.add(element.attributes.get(RDF_ABOUT_ATTRIBUTE))
+            return None
+        element.remove_children(
+            lambda child: child.name == RDFS_SUBCLASS_OF_ELEMENT and self.references_dropped_class(child))
+        return element
+
+
+class RestrictDisciplinesFilter(DropClassesFilter):
+
+    def __init__(self, discipline_iris):
+        """ Filter restricting the ontology to a set of disciplines, dropping the other disciplines
+        together with their branches and the roles of those branches. Skills are kept.
+
+        Args:
+            discipline_iris (list): IRIs of the discipline classes to keep.
+        """
+
+        super().__init__()
+        self.discipline_iris = set(discipline_iris)
+
+    def drop_class(self, element):
+        entity_type = element.find_text(ENTITY_TYPE_ELEMENT)
+        if entity_type == ENTITY_TYPE_DISCIPLINE:
+            return element.attributes.get(RDF_ABOUT_ATTRIBUTE) not in self.discipline_iris
+        if entity_type in (ENTITY_TYPE_BRANCH, ENTITY_TYPE_ROLE):
+            return any(parent.attributes.get(RDF_RESOURCE_ATTRIBUTE) in self.dropped_class_iris
+                       for parent in element.iter_elements(RDFS_SUBCLASS_OF_ELEMENT))
+        return False
+
+
+class DropAnnotationPropertiesFilter(OwlFilter):
+
+    def __init__(self, property_iris, property_names):
+        """ Filter dropping annotation properties, both their declarations and their values on classes.
+
+        Args:
+            property_iris (list): IRIs of the annotation properties to drop.
+            property_names (list): Element names of the annotation property values to drop.
+        """
+
+        self.property_iris = set(property_iris)
+        self.property_names = set(property_names)
+
+    def filter_element(self, element):
+        if element.name == OWL_ANNOTATION_PROPERTY_ELEMENT and \
+                element.attributes.get(RDF_ABOUT_ATTRIBUTE) in self.property_iris:
+            return None
+        if element.name == OWL_CLASS_ELEMENT:
+            element.remove_children(lambda child: child.name in self.property_names)
+        return element
+
+
+class CollapseSkillLevelsFilter(OwlFilter):
+
+    def __init__(self, skill_level_property_iris, property_iri, property_label):
+        """ Filter collapsing the skill level object properties into a single object property, so that
+        each role links to each of its skills with a single edge regardless of the skill level.
+
+        Args:
+            skill_level_property_iris (list): IRIs of the skill level object properties.
+            property_iri (string): IRI of the object property replacing the skill level object properties.
+            property_label (string): Label of the object property replacing the skill level object properties.
+        """
+
+        self.skill_level_property_iris = set(skill_level_property_iris)
+        self.property_iri = property_iri
+        self.property_label = property_label
+        self.property_declared = False
+
+    def filter_element(self, element):
+
+        # Replace the first skill level object property declaration and drop the others.
+        if element.name == OWL_OBJECT_PROPERTY_ELEMENT and \
+                element.attributes.get(RDF_ABOUT_ATTRIBUTE) in self.skill_level_property_iris:
+            if self.property_declared:
+                return None
+            self.property_declared = True
+            element.set_attribute(RDF_ABOUT_ATTRIBUTE, self.property_iri)
+            for label in element.iter_elements(RDFS_LABEL_ELEMENT):
+                label.set_text(self.property_label)
+            return element
+
+        # Restrict classes on the collapsed object property instead.
+        if element.name == OWL_CLASS_ELEMENT:
+            for on_property in element.iter_elements(OWL_ON_PROPERTY_ELEMENT):
+                if on_property.attributes.get(RDF_RESOURCE_ATTRIBUTE) in self.skill_level_property_iris:
+                    on_property.set_attribute(RDF_RESOURCE_ATTRIBUTE, self.property_iri)
+        return element
+
+
+def create_filter(filter_config, ontology_iri, skill_level_property_ids):
+    """ Create a visualisation filter from its configuration. Classes, disciplines and properties
+    are identified by their IDs in the ontology namespace.
+
+    Args:
+        filter_config (dict): Filter configuration, holding the filter type and its options.
+        ontology_iri (string): Ontology IRI.
+        skill_level_property_ids (list): IDs of the skill level object properties.
+
+    Returns:
+        OwlFilter object.
+
+    """
+
+    filter_type = filter_config['type']
+    if filter_type == FILTER_TYPE_DROP_CLASSES:
+        return DropClassesFilter(class_iris=[f'{ontology_iri}#{class_id}' for class_id in filter_config['classes']])
+    if filter_type == FILTER_TYPE_DROP_ENTITY_TYPES:
+        return DropClassesFilter(entity_types=filter_config['entity_types'])
+    if filter_type == FILTER_TYPE_DROP_ANNOTATION_PROPERTIES:
+        return DropAnnotationPropertiesFilter(
+            property_iris=[f'{ontology_iri}#{property_id}' for property_id in filter_config['properties']],
+            property_names=filter_config['properties'])
+    if filter_type == FILTER_TYPE_COLLAPSE_SKILL_LEVELS:
+        return CollapseSkillLevelsFilter(
+            skill_level_property_iris=[f'{ontology_iri}#{property_id}' for property_id in skill_level_property_ids],
+            property_iri=f'{ontology_iri}#{filter_config["property"]}',
+            property_label=filter_config['label'])
+    if filter_type == FILTER_TYPE_RESTRICT_DISCIPLINES:
+        return RestrictDisciplinesFilter(
+            discipline_iris=[f'{ontology_iri}#{discipline_id}' for discipline_id in filter_config['disciplines']])
+    raise ValueError(f'Unsupported visualisation filter type: {filter_type}')
+
+
+def create_filter_chain(filter_configs, ontology_iri, skill_level_property_ids):
+    """ Create a chain of visualisation filters from their configuration.
+
+    Args:
+        filter_configs (list): Filter configurations, in the order in which to apply the filters.
+        ontology_iri (string): Ontology IRI.
+        skill_level_property_ids (list): IDs of the skill level object properties.
+
+    Returns:
+        List of OwlFilter objects.
+
+    """
+
+    return [create_filter(filter_config, ontology_iri, skill_level_property_ids) for filter_config in filter_configs]
 
 
 def filter_ontology(skill_iri, modelled_ddat_ontology_owl_file_path, filtered_ddat_ontology_owl_file_path):
@@ -16,34 +404,161 @@ def filter_ontology(skill_iri, modelled_ddat_ontology_owl_file_path, filtered_dd
 
     """
 
-    # Class and subclass relationships to remove from the ontology
-    skill_owl_class_line_number_start = None
-    skill_owl_class_line_number_end = None
-    skill_owl_class_to_filter = f'<owl:Class rdf:about="{skill_iri}">'
-    skill_rdfs_subclass_to_filter = f'<rdfs:subClassOf rdf:resource="{skill_iri}"/>'
-
-    # Open and read the post-modelled DDaT ontology OWL file
-    with open(modelled_ddat_ontology_owl_file_path, 'r') as f:
-        modelled_ddat_ontology_lines = f.readlines()
-
-    # Open and write to the filtered DDaT ontology OWL file
-    with (open(filtered_ddat_ontology_owl_file_path, 'w') as f):
-        counter = -1
-        for modelled_ddat_ontology_line in modelled_ddat_ontology_lines:
-            counter += 1
-
-            # Identify the line numbers containing the skill class to filter
-            if skill_owl_class_to_filter in modelled_ddat_ontology_line:
-                skill_owl_class_line_number_start = counter
-                skill_owl_class_line_number_end = counter + CLASS_THING_SKILL_LINE_COUNT
+    filter_owl_file(modelled_ddat_ontology_owl_file_path, {
+        filtered_ddat_ontology_owl_file_path: [DropClassesFilter(class_iris=[skill_iri])]})
+
+
+def filter_owl_file(owl_file_path, filter_chains):
+    """ Stream an OWL RDF/XML file to one or more filtered copies in a single pass, applying a chain
+    of filters to each top-level element for each copy. Only one top-level element is held in memory
+    at a time, and everything the filters leave unchanged is written byte for byte as it is.
+
+    Args:
+        owl_file_path (string): Path to the OWL RDF/XML file.
+        filter_chains (dict): Lists of OwlFilter objects keyed by the path to which to save each filtered copy.
+
+    """
+
+    files = []
+    try:
+        writers = []
+        for filtered_owl_file_path, filter_chain in filter_chains.items():
+            files.append(open(filtered_owl_file_path, 'w', buffering=FILTER_BUFFER_SIZE))
+            writers.append((FilteredXmlWriter(files[-1]), filter_chain))
+
+        with open(owl_file_path, 'r', buffering=FILTER_BUFFER_SIZE) as f:
+            for node in iter_top_level_nodes(iter_xml_events(f)):
+                for writer, filter_chain in writers:
+                    if isinstance(node, str):
+                        writer.write_text(node)
+                        continue
+
+                    # Each filter chain edits its own copy of the element.
+                    element = copy.deepcopy(node) if len(writers) > 1 else node
+                    for owl_filter in filter_chain:
+                        element = owl_filter.filter_element(element)
+                        if element is None:
+                            break
+                    if element is None:
+                        writer.drop_element()
+                    else:
+                        writer.write_element(element)
+
+        for writer, _ in writers:
+            writer.close()
+    finally:
+        for f in files:
+            f.close()
+
+
+def iter_top_level_nodes(xml_events):
+    """ Lazily group a stream of XML events into the top-level nodes of a document: the child elements
+    of the root element, each as an XmlElement object, and everything else (including the root element
+    start and end tags) as raw strings.
+
+    Args:
+        xml_events (iterable): XML events as yielded by iter_xml_events.
+
+    Yields:
+        XmlElement object or raw string.
+
+    """
+
+    root_open = False
+    stack = []
+    for event_type, raw, name, attributes in xml_events:
+        if not root_open:
+            root_open = event_type == XML_EVENT_START
+            yield raw
+        elif event_type in (XML_EVENT_START, XML_EVENT_EMPTY):
+            element = XmlElement(raw, name, attributes, empty=event_type == XML_EVENT_EMPTY)
+            if stack:
+                stack[-1].children.append(element)
+            if event_type == XML_EVENT_START:
+                stack.append(element)
+            elif not stack:
+                yield element
+        elif event_type == XML_EVENT_END:
+            if not stack:
+                root_open = False
+                yield raw
                 continue
+            element = stack.pop()
+            element.end_tag = raw
+            if not stack:
+                yield element
+        elif stack:
+            stack[-1].children.append(raw)
+        else:
+            yield raw
+
+
+def iter_xml_events(f, read_size=FILTER_BUFFER_SIZE):
+    """ Lazily tokenize an XML document into markup and text events, reading it a block at a time.
+    The raw text of every event is preserved, so that concatenating the events reproduces the document,
+    and markup or text split across blocks is only tokenized once read in full, so that the events do
+    not depend on the read size.
+
+    Args:
+        f (file): XML file handle opened in text mode.
+        read_size (int): Number of characters to read at a time.
+
+    Yields:
+        Tuple of event type, raw event text, element name and dictionary of element attributes
+        (the element name and attributes are None for text and other markup events).
+
+    """
+
+    buffer = ''
+    while True:
+        block = f.read(read_size)
+        eof = not block
+        buffer += block
+        position = 0
+        while position < len(buffer):
+            markup_start = buffer.find('<', position)
+            if markup_start == -1:
 
-            # Filter out the skill class definition
-            if (skill_owl_class_line_number_start is not None and
-                    skill_owl_class_line_number_end is not None and
-                    skill_owl_class_line_number_start <= counter <= skill_owl_class_line_number_end):
+                # Read the next block if the text may continue in it.
+                if not eof:
+                    break
+                markup_start = len(buffer)
+            if markup_start > position:
+                yield XML_EVENT_TEXT, buffer[position:markup_start], None, None
+                position = markup_start
                 continue
 
-            # Filter out the subclass relationships to the skill class
-            if skill_rdfs_subclass_to_filter not in modelled_ddat_ontology_line:
-                f.write(modelled_ddat_ontology_line)
+            # Read the next block if the markup is split across blocks.
+            markup = XML_MARKUP_PATTERN.match(buffer, position)
+            if markup is None:
+                if eof:
+                    yield XML_EVENT_TEXT, buffer[position:], None, None
+                    position = len(buffer)
+                break
+            yield xml_markup_event(markup.group())
+            position = markup.end()
+        buffer = buffer[position:]
+        if eof:
+            return
+
+
+def xml_markup_event(markup):
+    """ Classify a raw XML markup string as an XML event.
+
+    Args:
+        markup (string): Raw XML markup, from '<' to '>'.
+
+    Returns:
+        Tuple of event type, raw markup, element name and dictionary of element attributes.
+
+    """
+
+    if markup.startswith(('<!', '<?')):
+        return XML_EVENT_OTHER, markup, None, None
+    name = XML_TAG_NAME_PATTERN.match(markup).group(1)
+    if markup.startswith('</'):
+        return XML_EVENT_END, markup, name, None
+    attributes = {attribute.group(1): attribute.group(2) if attribute.group(2) is not None else attribute.group(3)
+                  for attribute in XML_ATTRIBUTE_PATTERN.finditer(markup, len(name) + 1)}
+    event_type = XML_EVENT_EMPTY if markup.rstrip('> \t\r\n').endswith('/') else XML_EVENT_START
+    return event_type, markup, name, attributes
@@ -1,31 +1,49 @@
 #!/usr/bin/env python3
 """
 DDaT profession capability framework website parser and modeller main program.
-Usage: main.py
+Usage: main.py [--resume]
 """
 
+import argparse
 import ddat.utils.yaml_utils as yaml_utils
 import ddat.pipeline.setup as setup
 import ddat.pipeline.parsers.skills_parser as skills_parser
 import ddat.pipeline.parsers.roles_parser as roles_parser
 import ddat.pipeline.models.ontology.ontology_modeller as ontology_modeller
 import ddat.pipeline.models.semantic_similarity.duplicate_skills_detector as duplicate_skills_detector
+import ddat.transports.session_manager as session_manager
 
 from ddat.config.logging_config import logger
 
 
+# Command line arguments.
+parser = argparse.ArgumentParser(description='DDaT profession capability framework website parser and modeller.')
+parser.add_argument('--resume', action='store_true',
+                    help='resume the roles parser from the branches completed by the previous run')
+args = parser.parse_args()
+
+
 # Application configuration.
 config = yaml_utils.read_yaml('./ddat/config/config.yaml')
 config_base_working_dir = config['app']['base_working_dir']
 config_ddat = config['ddat']
 config_pipeline = config['app']['pipeline']
 config_webdriver_path = config['app']['webdriver_paths']['chromedriver']
+config_transport = config['app']['transport']
 
 
 # Ontology model.
 ontology_model_dir_path = './ddat/model/ontology/'
 
 
+# Transport sessions shared by the parser pipeline modules (opened lazily).
+shared_session_manager = session_manager.SessionManager(
+    transport=config_transport['backend'],
+    driver_path=config_webdriver_path,
+    transport_options=config_transport,
+    base_working_dir=config_base_working_dir)
+
+
 # Start the application.
 logger.info('Started DDaT Ontology Modeller.')
 try:
@@ -42,7 +60,11 @@ try:
             driver_path=config_webdriver_path,
             ddat_base_url=config_ddat['base_url'],
             ddat_skills_resource=config_ddat['resources']['skills'],
-            base_working_dir=config_base_working_dir)
+            base_working_dir=config_base_working_dir,
+            transport=config_transport['backend'],
+            transport_options=config_transport,
+            bulk_extraction=config_pipeline['parsers']['skills']['bulk_extraction'],
+            shared_session_manager=shared_session_manager)
         logger.info(f'Finished running the {skills_parser.MODULE_NAME} module.')
 
     # Run the roles parser pipeline module
@@ -52,7 +74,12 @@ try:
             ontology_model_dir_path=ontology_model_dir_path,
             driver_path=config_webdriver_path,
             ddat_base_url=config_ddat['base_url'],
-            base_working_dir=config_base_working_dir)
+            base_working_dir=config_base_working_dir,
+            transport=config_transport['backend'],
+            transport_options=config_transport,
+            workers=config_pipeline['parsers']['roles']['workers'],
+            shared_session_manager=shared_session_manager,
+            resume=args.resume)
         logger.info(f'Finished running the {roles_parser.MODULE_NAME} module.')
 
     # Run the ontology modeller pipeline module.
@@ -63,7 +90,13 @@ try:
             base_working_dir=config_base_working_dir,
             ddat_base_url=config_ddat['base_url'],
             ddat_skills_resource=config_ddat['resources']['skills'],
-            visualisation_apply_filters=config_pipeline['models']['ontology']['visualisation_apply_filters'])
+            visualisation_apply_filters=config_pipeline['models']['ontology']['visualisation_apply_filters'],
+            fragment_cache_enabled=config_pipeline['models']['ontology']['fragment_cache'],
+            rdf_serializations=config_pipeline['models']['ontology']['rdf_serializations'],
+            render_workers=config_pipeline['models']['ontology']['render_workers'],
+            visualisation_variants=config_pipeline['models']['ontology']['visualisation_variants'],
+            graph_enabled=config_pipeline['models']['ontology']['graph']['enabled'],
+            graph_layout=config_pipeline['models']['ontology']['graph']['layout'])
         logger.info(f'Finished running the {ontology_modeller.MODULE_NAME} module.')
 
     # Run the duplicate skills detector pipeline module.
@@ -80,4 +113,6 @@ except Exception as e:
 
 finally:
 
+    # Close the transport sessions shared by the parser pipeline modules.
+    shared_session_manager.close()
     logger.info('Stopped DDaT Ontology Modeller.\n')
@@ -0,0 +1,45 @@
+""" Tests of the resumable crawl checkpoints. """
+
+import pickle
+
+import ddat.utils.checkpoint_utils as checkpoint_utils
+from ddat.classes.role import Role
+
+
+def build_role(name):
+    """ Build a fixture role requiring a skill. """
+
+    role = Role(name, 'dataArchitecture', f'A {name.lower()}.', f'https://ddat.example.org/data#{name}',
+                ['Design data.'], ['G7'])
+    role.set_skills({'DataModellingAndDesign': 'EXPERT'})
+    return role
+
+
+def test_save_and_resume(tmp_path):
+    roles = [build_role('Architect'), build_role('Lead architect')]
+    checkpoint_utils.CrawlCheckpoint(str(tmp_path), Role).save('dataArchitecture', roles)
+
+    resumed_checkpoint = checkpoint_utils.CrawlCheckpoint(str(tmp_path), Role, resume=True)
+    assert [role.to_dict() for role in resumed_checkpoint.load('dataArchitecture')] == \
+        [role.to_dict() for role in roles]
+    assert resumed_checkpoint.load('networkArchitecture') is None
+
+
+def test_checkpoints_are_cleared_unless_resuming(tmp_path):
+    checkpoint_utils.CrawlCheckpoint(str(tmp_path), Role).save('dataArchitecture', [build_role('Architect')])
+    assert checkpoint_utils.CrawlCheckpoint(str(tmp_path), Role).load('dataArchitecture') is None
+
+
+def test_unreadable_checkpoint_is_not_resumed(tmp_path):
+    checkpoint = checkpoint_utils.CrawlCheckpoint(str(tmp_path), Role)
+    with open(checkpoint._path('dataArchitecture'), 'wb') as f:
+        pickle.dump([build_role('Architect')], f)
+    assert checkpoint.load('dataArchitecture') is None
+
+
+def test_clear(tmp_path):
+    checkpoint_dir = tmp_path / 'checkpoints'
+    checkpoint = checkpoint_utils.CrawlCheckpoint(str(checkpoint_dir), Role)
+    checkpoint.save('dataArchitecture', [build_role('Architect')])
+    checkpoint.clear()
+    assert not checkpoint_dir.exists()
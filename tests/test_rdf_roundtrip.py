@@ -0,0 +1,86 @@
+""" Round-trip tests of the OWL RDF/XML, N-Triples and Turtle serializations of the modelled ontology. """
+
+import pytest
+import rdflib
+import rdflib.compare
+
+import ddat.pipeline.models.ontology.ontology_modeller as ontology_modeller
+import ddat.utils.artifact_utils as artifact_utils
+import ddat.utils.rdf_utils as rdf_utils
+from ddat.classes.role import Role
+from ddat.classes.skill import Skill
+
+# Pre-defined ontology data model shipped with the repository.
+ONTOLOGY_MODEL_DIR_PATH = './ddat/model/ontology'
+
+# DDaT profession capability framework base URL and skills resource of the fixture.
+DDAT_BASE_URL = 'https://ddat.example.org'
+DDAT_SKILLS_RESOURCE = 'skills.html'
+
+# rdflib parser format of every serialization written by the ontology modeller, keyed by output file path.
+OUTPUT_RDFLIB_FORMATS = {
+    ontology_modeller.OUTPUT_OWL_FILE_PATH: 'xml',
+    ontology_modeller.OUTPUT_RDF_FILE_PATHS[rdf_utils.FORMAT_NTRIPLES]: 'nt',
+    ontology_modeller.OUTPUT_RDF_FILE_PATHS[rdf_utils.FORMAT_TURTLE]: 'turtle'
+}
+
+
+def build_skill(anchor_id, name, description):
+    """ Build a fixture skill with capabilities at every skill level. """
+
+    return Skill(anchor_id, name, description, {
+        'Awareness': [f'Know about {name.lower()}.'],
+        'Working': [f'Work with {name.lower()}.'],
+        'Practitioner': [f'Practise {name.lower()}.'],
+        'Expert': [f'Lead {name.lower()}.']
+    })
+
+
+def build_role(name, branch_id, skills):
+    """ Build a fixture role of a branch requiring the given skills. """
+
+    anchor_id = name.lower().replace(' ', '-')
+    role = Role(name, branch_id, f'A {name.lower()} role.', f'{DDAT_BASE_URL}/{branch_id}#{anchor_id}',
+                [f'Do {name.lower()} work.', 'Explain it to others.'], ['SEO', 'G7'])
+    role.set_skills(skills)
+    return role
+
+
+@pytest.fixture
+def base_working_dir(tmp_path):
+    """ Base working directory holding a small set of parsed skills and roles. """
+
+    skills = [
+        build_skill('skill-data-analysis', 'Data analysis', 'You can analyse data.'),
+        build_skill('skill-data-modelling', 'Data modelling and design', 'You can model data.'),
+        build_skill('skill-network-design', 'Network design', 'You can design networks.')
+    ]
+    roles = [
+        build_role('Data architect', 'dataArchitecture',
+                   {'DataAnalysis': 'WORKING', 'DataModellingAndDesign': 'EXPERT'}),
+        build_role('Lead data architect', 'dataArchitecture', {'DataModellingAndDesign': 'EXPERT'}),
+        build_role('Network architect', 'networkArchitecture', {'NetworkDesign': 'PRACTITIONER'})
+    ]
+    artifact_utils.write_artifact(
+        str(tmp_path / ontology_modeller.INPUT_SKILLS_ARTIFACT_FILE_PATH), Skill, artifact_utils.chunk(skills, 2))
+    artifact_utils.write_artifact(
+        str(tmp_path / ontology_modeller.INPUT_ROLES_ARTIFACT_FILE_PATH), Role,
+        artifact_utils.group(roles, lambda role: role.branch_id))
+    (tmp_path / 'models/ontology').mkdir(parents=True)
+    return str(tmp_path)
+
+
+def test_rdf_serializations_are_isomorphic(base_working_dir):
+    ontology_modeller.run(ONTOLOGY_MODEL_DIR_PATH, base_working_dir, DDAT_BASE_URL, DDAT_SKILLS_RESOURCE, True,
+                          rdf_serializations=[rdf_utils.FORMAT_NTRIPLES, rdf_utils.FORMAT_TURTLE])
+
+    graphs = {}
+    for output_file_path, rdflib_format in OUTPUT_RDFLIB_FORMATS.items():
+        graphs[output_file_path] = rdflib.Graph().parse(f'{base_working_dir}/{output_file_path}', format=rdflib_format)
+
+    owl_graph = graphs[ontology_modeller.OUTPUT_OWL_FILE_PATH]
+    assert len(owl_graph) > 0
+    assert any(name.value == 'Network architect' for name in owl_graph.objects(None, rdflib.RDFS.label))
+    for output_file_path, graph in graphs.items():
+        assert len(graph) == len(owl_graph), output_file_path
+        assert rdflib.compare.isomorphic(graph, owl_graph), output_file_path
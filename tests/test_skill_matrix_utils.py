@@ -0,0 +1,112 @@
+""" Tests of the role by skill level matrix. """
+
+import numpy as np
+import pytest
+
+import ddat.pipeline.models.ontology.ontology_modeller as ontology_modeller
+import ddat.utils.skill_matrix_utils as skill_matrix_utils
+from ddat.classes.ontology import Ontology
+from ddat.classes.role import Role
+from ddat.classes.skill import Skill
+
+# Skill levels required by each fixture role, keyed by role ID. The second occurrence of the
+# analyst role and the unknown skill are dropped from the matrix built on the fixture skills.
+ROLE_SKILLS = [
+    ('analyst', {'analysis': 'PRACTITIONER', 'modelling': 'WORKING'}),
+    ('architect', {'modelling': 'EXPERT', 'networks': 'WORKING', 'unknown': 'EXPERT'}),
+    ('engineer', {'networks': 'EXPERT'}),
+    ('analyst', {'networks': 'EXPERT'}),
+    ('trainee', {})
+]
+
+# Skill IDs of the fixture, indexing the matrix columns.
+SKILL_IDS = ['analysis', 'modelling', 'networks']
+
+
+@pytest.fixture
+def skill_matrix():
+    """ Skill matrix of the fixture roles on the fixture skills. """
+
+    return skill_matrix_utils.SkillMatrix.from_role_skills(ROLE_SKILLS, skill_ids=SKILL_IDS)
+
+
+def test_from_role_skills_keeps_first_occurrence_of_role(skill_matrix):
+    assert skill_matrix.role_ids == ['analyst', 'architect', 'engineer', 'trainee']
+    assert skill_matrix.levels.toarray().tolist() == [[3, 2, 0], [0, 4, 2], [0, 0, 4], [0, 0, 0]]
+
+
+def test_from_role_skills_drops_skills_not_in_skill_ids(skill_matrix):
+    assert skill_matrix.skill_ids == SKILL_IDS
+    assert skill_matrix.levels.shape == (4, 3)
+    assert skill_matrix.levels.dtype == skill_matrix_utils.SKILL_LEVEL_DTYPE
+
+
+def test_from_role_skills_without_skill_ids_keeps_all_skills_in_order_of_first_occurrence():
+    skill_matrix = skill_matrix_utils.SkillMatrix.from_role_skills(ROLE_SKILLS)
+    assert skill_matrix.skill_ids == ['analysis', 'modelling', 'networks', 'unknown']
+    assert skill_matrix.levels.toarray()[1].tolist() == [0, 4, 2, 4]
+
+
+def test_skill_gaps(skill_matrix):
+    skill_gaps = skill_matrix.skill_gaps(['analyst', 'engineer', 'trainee'], ['architect', 'analyst', 'engineer'])
+    assert skill_gaps.tolist() == [[0, 2, 2], [3, 2, 0], [0, 0, 4]]
+
+
+def test_skill_gaps_of_unknown_role(skill_matrix):
+    with pytest.raises(KeyError):
+        skill_matrix.skill_gaps(['analyst'], ['unknown'])
+
+
+def test_similarities(skill_matrix):
+    similarities = skill_matrix.similarities()
+    assert similarities.shape == (4, 4)
+    assert np.allclose(np.diag(similarities), [1, 1, 1, 0])
+    assert np.allclose(similarities, similarities.T)
+    assert similarities[0, 2] == 0
+    assert similarities[1, 2] == pytest.approx(2 / np.sqrt(20))
+
+
+def test_closest_roles_ranks_most_similar_first(skill_matrix):
+    closest_roles = skill_matrix.closest_roles([{'modelling': 'EXPERT', 'networks': 'EXPERT'}], top_n=3)
+    assert [role_id for role_id, _ in closest_roles[0]] == ['architect', 'engineer', 'analyst']
+    similarities = [similarity for _, similarity in closest_roles[0]]
+    assert similarities == sorted(similarities, reverse=True)
+
+
+def test_closest_roles_breaks_ties_by_role_order(skill_matrix):
+    closest_roles = skill_matrix.closest_roles([{'unknown': 'EXPERT'}, {}], top_n=2)
+    assert closest_roles == [[('analyst', 0.0), ('architect', 0.0)], [('analyst', 0.0), ('architect', 0.0)]]
+
+
+def test_closest_roles_caps_top_n_at_number_of_roles(skill_matrix):
+    closest_roles = skill_matrix.closest_roles([{'analysis': 'AWARENESS'}], top_n=10)
+    assert len(closest_roles[0]) == 4
+    assert closest_roles[0][0] == ('analyst', pytest.approx(3 / np.sqrt(13)))
+
+
+def test_write_and_load_skill_matrix(skill_matrix, tmp_path):
+    skill_matrix_file_path = str(tmp_path / 'skill-matrix.npz')
+    skill_matrix_utils.write_skill_matrix(skill_matrix_file_path, skill_matrix)
+    loaded_skill_matrix = skill_matrix_utils.load_skill_matrix(skill_matrix_file_path)
+    assert loaded_skill_matrix.role_ids == skill_matrix.role_ids
+    assert loaded_skill_matrix.skill_ids == skill_matrix.skill_ids
+    assert (loaded_skill_matrix.levels != skill_matrix.levels).nnz == 0
+
+
+def test_load_missing_skill_matrix(tmp_path):
+    assert skill_matrix_utils.load_skill_matrix(str(tmp_path / 'skill-matrix.npz')) is None
+
+
+def test_model_skill_matrix_drops_duplicate_roles_and_skills_not_in_class_skills():
+    ontology = Ontology('DDaT', 'http://example.org/ddat', 'DDaT ontology', '1.0', [])
+    ontology.set_class_skills([Skill('skill-data-analysis', 'Data analysis', 'You can analyse data.', {})])
+    roles = [Role('Data analyst', 'dataAnalysis', 'A data analyst.', 'http://example.org/data#analyst', [], []),
+             Role('Data analyst', 'dataScience', 'A data analyst.', 'http://example.org/science#analyst', [], [])]
+    roles[0].set_skills({'DataAnalysis': 'EXPERT', 'NetworkDesign': 'WORKING'})
+    roles[1].set_skills({'DataAnalysis': 'AWARENESS'})
+    ontology.set_class_roles(roles)
+
+    skill_matrix = ontology_modeller.model_skill_matrix(ontology)
+    assert skill_matrix.role_ids == ['http://example.org/ddat#dataAnalyst']
+    assert skill_matrix.skill_ids == [f'http://example.org/ddat#{ontology_modeller.OWL_SKILL_CLASS_ID}DataAnalysis']
+    assert skill_matrix.levels.toarray().tolist() == [[4]]
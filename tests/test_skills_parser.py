@@ -0,0 +1,68 @@
+""" Tests of the skills parser on a saved skills resource page. """
+
+import ddat.pipeline.parsers.skills_parser as skills_parser
+import ddat.transports.http_transport as http_transport
+
+# URL of the saved skills resource page.
+SKILLS_RESOURCE_URL = 'https://ddat.example.org/skills.html'
+
+# Saved skills resource page, with the accordion sections expanded as after pressing 'Show all sections'.
+SKILLS_RESOURCE_PAGE_SOURCE = '''<html><body><h1 class="govuk-heading-xl">Skills</h1>
+<div class="govuk-accordion">
+<div class="govuk-accordion__section govuk-accordion__section--expanded">
+ <div class="govuk-accordion__section-header"><h2 class="govuk-accordion__section-heading">
+  <span class="govuk-accordion__section-button" id="skill-data-analysis">
+   Data   analysis
+  </span></h2></div>
+ <div class="govuk-accordion__section-content"><p class="govuk-body">You can
+  analyse data.</p><p>Second paragraph.</p>
+ <table class="govuk-table"><tbody class="govuk-table__body">
+  <tr class="govuk-table__row"><td class="govuk-table__cell"><p>Awareness</p></td>
+   <td class="govuk-table__cell"><ul><li>Know <strong>about</strong> data.</li><li>Know more.</li></ul></td></tr>
+  <tr class="govuk-table__row"><td class="govuk-table__cell" colspan="2">Spacer</td></tr>
+  <tr class="govuk-table__row"><td class="govuk-table__cell"><p> Working </p></td>
+   <td class="govuk-table__cell"><ul><li>Work with data.</li></ul></td></tr>
+ </tbody></table></div></div>
+<div class="govuk-accordion__section govuk-accordion__section--expanded">
+ <div class="govuk-accordion__section-header"><h2 class="govuk-accordion__section-heading">
+  <span class="govuk-accordion__section-button" id="skill-data-modelling">Data modelling &amp; design</span></h2></div>
+ <div class="govuk-accordion__section-content"><p class="govuk-body">You can model data.</p>
+ <table class="govuk-table"><tbody class="govuk-table__body">
+  <tr class="govuk-table__row"><td class="govuk-table__cell"><p>Expert</p></td>
+   <td class="govuk-table__cell"><ul><li>Lead data modelling.</li></ul></td></tr>
+ </tbody></table></div></div>
+</div></body></html>'''
+
+# Skills expected to be parsed from the saved skills resource page.
+EXPECTED_SKILLS = [
+    {'anchor_id': 'skill-data-analysis', 'name': 'Data analysis', 'description': 'You can analyse data.',
+     'skill_levels': {'Awareness': ['Know about data.', 'Know more.'], 'Working': ['Work with data.']},
+     'iri_id': 'dataAnalysis'},
+    {'anchor_id': 'skill-data-modelling', 'name': 'Data modelling & design', 'description': 'You can model data.',
+     'skill_levels': {'Expert': ['Lead data modelling.']}, 'iri_id': 'dataModellingDesign'}
+]
+
+
+class SavedPageDriver:
+
+    def __init__(self, page_source, current_url):
+        """ Stand-in for a Selenium driver whose current page is a saved page.
+
+        Args:
+            page_source (string): Page source of the current page.
+            current_url (string): URL of the current page.
+        """
+
+        self.page_source = page_source
+        self.current_url = current_url
+
+
+def test_browserless_transport_parses_skills():
+    transport = http_transport.HttpTransport()
+    transport.load(SKILLS_RESOURCE_URL, SKILLS_RESOURCE_PAGE_SOURCE)
+    assert [skill.to_dict() for skill in skills_parser.parse_all_skills(transport)] == EXPECTED_SKILLS
+
+
+def test_selenium_bulk_extraction_parses_same_skills_as_browserless_transport():
+    driver = SavedPageDriver(SKILLS_RESOURCE_PAGE_SOURCE, SKILLS_RESOURCE_URL)
+    assert [skill.to_dict() for skill in skills_parser.parse_all_skills_from_page_source(driver)] == EXPECTED_SKILLS
@@ -0,0 +1,55 @@
+""" Tests of the streaming XML tokenizer of the visualisation filters. """
+
+import io
+
+import pytest
+
+import ddat.utils.visualisation_utils as visualisation_utils
+
+# XML document holding every kind of markup, with '>' inside comments, CDATA sections, processing
+# instructions and attribute values, and text split across lines.
+XML_DOCUMENT = '''<?xml version="1.0"?>
+<!DOCTYPE rdf:RDF>
+<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#">
+    <!-- Things > disciplines > branches -->
+    <owl:Class rdf:about="http://example.org/ddat#a&gt;b" label='x > y'>
+        <rdfs:label>Data
+            analysis</rdfs:label>
+        <rdfs:comment><![CDATA[a > b <c> ]] d]]></rdfs:comment>
+        <?render width > 0 ?>
+        <rdfs:subClassOf
+            rdf:resource="http://example.org/ddat#Skill"/>
+    </owl:Class>
+</rdf:RDF>
+'''
+
+
+def tokenize(document, read_size):
+    """ Tokenize an XML document read a given number of characters at a time. """
+
+    return list(visualisation_utils.iter_xml_events(io.StringIO(document), read_size))
+
+
+@pytest.mark.parametrize('read_size', [1, 2, 3, 5, 6, 7, 16, 64, 256])
+def test_xml_events_do_not_depend_on_read_size(read_size):
+    assert tokenize(XML_DOCUMENT, read_size) == tokenize(XML_DOCUMENT, len(XML_DOCUMENT))
+
+
+def test_xml_events_reproduce_document():
+    events = tokenize(XML_DOCUMENT, 7)
+    assert ''.join(raw for _, raw, _, _ in events) == XML_DOCUMENT
+    assert ('other', '<!-- Things > disciplines > branches -->', None, None) in events
+    assert ('other', '<![CDATA[a > b <c> ]] d]]>', None, None) in events
+    assert ('other', '<?render width > 0 ?>', None, None) in events
+    assert ('text', 'Data\n            analysis', None, None) in events
+
+
+def test_xml_events_of_comment_split_across_blocks():
+    events = tokenize('<a><!-- x > y --><b/></a>', 6)
+    assert [(event_type, raw) for event_type, raw, _, _ in events] == [
+        ('start', '<a>'), ('other', '<!-- x > y -->'), ('empty', '<b/>'), ('end', '</a>')]
+
+
+def test_xml_element_attributes():
+    start_events = [event for event in tokenize(XML_DOCUMENT, 5) if event[0] == 'start' and event[2] == 'owl:Class']
+    assert start_events[0][3] == {'rdf:about': 'http://example.org/ddat#a&gt;b', 'label': 'x > y'}